@@ -14,6 +14,34 @@ from http import client as http_client
 API_HOST = "127.0.0.1"
 API_PORT = 8001
 
+# Response headers not passed back to Apache
+EXCLUDED_HEADERS = ['server', 'date', 'connection', 'transfer-encoding']
+
+# Stream the body in chunks instead of buffering the whole response
+CHUNK_SIZE = 64 * 1024
+
+
+def write_response(status, headers, body_stream):
+    """Write CGI status, headers and (streamed) body to stdout"""
+    print(f"Status: {status}", flush=True)
+    for header, value in headers:
+        if header.lower() not in EXCLUDED_HEADERS:
+            print(f"{header}: {value}", flush=True)
+    print(flush=True)  # End headers
+
+    # Flush text stdout before binary write
+    sys.stdout.flush()
+
+    # 304 Not Modified and 204 No Content never carry a body
+    if body_stream is not None and status not in (204, 304):
+        while True:
+            chunk = body_stream.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            sys.stdout.buffer.write(chunk)
+    sys.stdout.buffer.flush()
+
+
 def main():
     # Get the path after /iz/xcri/api/
     path_info = os.environ.get('PATH_INFO', '')
@@ -43,32 +71,22 @@ def main():
         for key, value in os.environ.items():
             if key.startswith('HTTP_'):
                 header_name = key[5:].replace('_', '-').title()
-                if header_name not in ['Host', 'Connection']:
+                if header_name not in ['Host', 'Connection', 'X-Real-Ip']:
                     req.add_header(header_name, value)
+
+        # Visitor address for the API's per-client rate limits (replaces any
+        # X-Real-IP sent by the client)
+        remote_addr = os.environ.get('REMOTE_ADDR')
+        if remote_addr:
+            req.add_header('X-Real-IP', remote_addr)
         
         # Make request
         with urllib.request.urlopen(req) as response:
-            # Output headers (with immediate flush)
-            print(f"Status: {response.status}", flush=True)
-            for header, value in response.getheaders():
-                if header.lower() not in ['server', 'date', 'connection']:
-                    print(f"{header}: {value}", flush=True)
-            print(flush=True)  # End headers
-            
-            # Flush text stdout before binary write
-            sys.stdout.flush()
-            
-            # Output body
-            sys.stdout.buffer.write(response.read())
-            sys.stdout.buffer.flush()
-            
+            write_response(response.status, response.getheaders(), response)
+
     except urllib.error.HTTPError as e:
-        print(f"Status: {e.code}", flush=True)
-        print("Content-Type: application/json", flush=True)
-        print(flush=True)
-        sys.stdout.flush()
-        sys.stdout.buffer.write(e.read())
-        sys.stdout.buffer.flush()
+        # HTTPError covers 304 Not Modified as well as 4xx/5xx; pass headers through
+        write_response(e.code, e.headers.items(), e)
     except Exception as e:
         print("Status: 500", flush=True)
         print("Content-Type: application/json", flush=True)
@@ -0,0 +1,154 @@
+"""
+XCRI Rankings API - Database Circuit Breaker
+
+Stops sending queries to a database that keeps failing (maintenance,
+restarts, overload) so requests fail fast instead of each waiting out
+connect and query timeouts against a struggling server:
+
+- Closed: queries run normally. Connection errors and other operational
+  failures are counted; any success resets the count.
+- Open: after CIRCUIT_BREAKER_FAILURE_THRESHOLD consecutive failures,
+  get_db_cursor() raises DatabaseUnavailable (503 + Retry-After) without
+  touching the pool. The response store serves its last good copy of a
+  response instead, marked X-Response-Store: stale.
+- Recovery: while open, a background probe runs SELECT 1 every
+  CIRCUIT_BREAKER_PROBE_INTERVAL_SECONDS on a pooled connection; the first
+  success closes the breaker.
+
+Query errors (bad SQL, missing rows) are not failures of the database and
+do not count. Neither do endpoint query timeouts (QueryTimeout): they
+mean one expensive query, which a single client can repeat at will, not
+an unreachable server. One breaker per worker.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import pymysql
+from fastapi import HTTPException, status
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Errors that mean the database (not the query) is in trouble
+FAILURES = (
+    pymysql.err.OperationalError,
+    pymysql.err.InterfaceError,
+    OSError,
+    asyncio.TimeoutError,
+)
+
+
+class DatabaseUnavailable(HTTPException):
+    """503 raised while the circuit breaker is open"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database temporarily unavailable",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a background recovery probe"""
+
+    def __init__(self):
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._last_probe: float = 0.0
+        self._last_error: Optional[str] = None
+        self._trips = 0
+        self._rejected = 0
+        self._probe: Optional[Callable[[], Awaitable[Any]]] = None
+        self._probe_task: Optional[asyncio.Task] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def set_probe(self, probe: Callable[[], Awaitable[Any]]) -> None:
+        """Coroutine function checking the database without the breaker"""
+        self._probe = probe
+
+    def _retry_after(self) -> int:
+        next_probe = self._last_probe + settings.circuit_breaker_probe_interval_seconds
+        return max(1, math.ceil(next_probe - time.monotonic()))
+
+    def check(self) -> None:
+        """Raise DatabaseUnavailable while the breaker is open"""
+        if self._opened_at is not None:
+            self._rejected += 1
+            raise DatabaseUnavailable(self._retry_after())
+
+    def record_success(self) -> None:
+        self._failures = 0
+
+    def record_failure(self, error: BaseException) -> None:
+        """Count an error; trips the breaker on the threshold-th database failure"""
+        if not isinstance(error, FAILURES) or settings.circuit_breaker_failure_threshold == 0:
+            return
+
+        self._failures += 1
+        self._last_error = f"{type(error).__name__}: {error}"
+        if self._opened_at is None and self._failures >= settings.circuit_breaker_failure_threshold:
+            self._open()
+
+    def _open(self) -> None:
+        self._opened_at = time.monotonic()
+        self._last_probe = self._opened_at
+        self._trips += 1
+        logger.error(
+            f"Circuit breaker OPEN after {self._failures} consecutive database failures "
+            f"(last: {self._last_error}); serving stale responses, probing every "
+            f"{settings.circuit_breaker_probe_interval_seconds}s"
+        )
+        if self._probe is not None and (self._probe_task is None or self._probe_task.done()):
+            self._probe_task = asyncio.create_task(self._probe_until_recovered())
+
+    def _close(self) -> None:
+        outage = time.monotonic() - self._opened_at
+        self._opened_at = None
+        self._failures = 0
+        logger.info(f"Circuit breaker CLOSED: database recovered after {outage:.0f}s")
+
+    async def _probe_until_recovered(self) -> None:
+        while self._opened_at is not None:
+            await asyncio.sleep(settings.circuit_breaker_probe_interval_seconds)
+            self._last_probe = time.monotonic()
+            try:
+                await asyncio.wait_for(self._probe(), settings.circuit_breaker_probe_interval_seconds)
+            except Exception as e:
+                self._last_error = f"{type(e).__name__}: {e}"
+                logger.warning(f"Circuit breaker probe failed: {self._last_error}")
+                continue
+            self._close()
+
+    async def stop(self) -> None:
+        if self._probe_task is None:
+            return
+        self._probe_task.cancel()
+        try:
+            await self._probe_task
+        except asyncio.CancelledError:
+            pass
+        self._probe_task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "state": "open" if self.is_open else "closed",
+            "consecutive_failures": self._failures,
+            "failure_threshold": settings.circuit_breaker_failure_threshold,
+            "open_seconds": round(time.monotonic() - self._opened_at, 1) if self.is_open else None,
+            "trips": self._trips,
+            "rejected": self._rejected,
+            "last_error": self._last_error,
+        }
+
+
+# Global breaker (one per worker)
+circuit_breaker = CircuitBreaker()
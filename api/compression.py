@@ -0,0 +1,149 @@
+"""
+XCRI Rankings API - Pre-compressed Response Bodies
+
+Helpers for serving a body that was compressed once, ahead of time, instead
+of by GZipMiddleware on every request:
+
+- encode_body() compresses a body with gzip and, when the optional brotli
+  package is installed, brotli, and derives a content-addressed ETag
+  (identity_body() for bodies too small to compress).
+- encoded_response() picks the representation the client accepts
+  (Accept-Encoding), answers If-None-Match with 304, and sets
+  Content-Encoding, ETag and Vary.
+
+GZipMiddleware leaves responses that already carry Content-Encoding alone,
+so these bodies are not compressed twice.
+"""
+
+import gzip
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+# Preferred first when the client accepts several
+ENCODINGS = ("br", "gzip")
+
+
+@dataclass
+class EncodedBody:
+    """One body in identity, gzip and (optionally) brotli form"""
+    etag: str
+    media_type: str
+    identity: bytes
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        """Bytes held by all representations"""
+        return len(self.identity) + sum(len(b) for b in self.encoded.values())
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        """ETag of one representation (each content-coding gets its own)"""
+        return self.etag if encoding is None else f'{self.etag[:-1]}-{encoding}"'
+
+
+def encode_body(
+    body: bytes,
+    media_type: str = "application/json",
+    gzip_level: int = GZIP_LEVEL,
+    brotli_quality: int = BROTLI_QUALITY
+) -> EncodedBody:
+    """
+    Compress a body with every available encoding.
+
+    CPU-bound (brotli at quality 11 especially): call through
+    asyncio.to_thread() from request handlers. Lower the levels for
+    multi-megabyte bodies.
+    """
+    encoded = {"gzip": gzip.compress(body, compresslevel=gzip_level, mtime=0)}
+    if brotli is not None:
+        encoded["br"] = brotli.compress(body, quality=brotli_quality)
+    return EncodedBody(etag=_etag(body), media_type=media_type, identity=body, encoded=encoded)
+
+
+def identity_body(body: bytes, media_type: str = "application/json") -> EncodedBody:
+    """A body too small to be worth compressing, with its ETag"""
+    return EncodedBody(etag=_etag(body), media_type=media_type, identity=body)
+
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: qvalue}"""
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def choose_encoding(accept_encoding: str, available) -> Optional[str]:
+    """Best available encoding the client accepts, or None for identity"""
+    accepted = accepted_encodings(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in ENCODINGS:
+        if encoding not in available:
+            continue
+        q = accepted.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def etag_matches(if_none_match: str, body: EncodedBody) -> bool:
+    """True when If-None-Match names any representation of the body"""
+    if if_none_match.strip() == "*":
+        return True
+    base = body.etag[1:-1]
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        tag = tag.strip('"')
+        if tag == base or tag.startswith(f"{base}-"):
+            return True
+    return False
+
+
+def encoded_response(
+    request: Request,
+    body: EncodedBody,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """Serve the representation of a pre-compressed body the client accepts"""
+    encoding = choose_encoding(request.headers.get("accept-encoding", ""), body.encoded)
+    response_headers = {"ETag": body.etag_for(encoding), "Vary": "Accept-Encoding", **(headers or {})}
+
+    if etag_matches(request.headers.get("if-none-match", ""), body):
+        return Response(status_code=304, headers=response_headers)
+
+    if encoding is None:
+        return Response(content=body.identity, media_type=body.media_type, headers=response_headers)
+
+    response_headers["Content-Encoding"] = encoding
+    return Response(content=body.encoded[encoding], media_type=body.media_type, headers=response_headers)
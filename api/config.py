@@ -5,9 +5,29 @@ Loads configuration from environment variables or .env file.
 """
 
 import os
-from typing import List, Optional
+from functools import cached_property
+from typing import Dict, List, Optional, Set, Tuple
 from pydantic_settings import BaseSettings
-from pydantic import Field
+from pydantic import Field, field_validator, model_validator
+
+
+def parse_route_costs(value: Optional[str]) -> Dict[str, float]:
+    """Parse route=cost pairs (RATE_LIMIT_ROUTE_COSTS) into {route path: cost}"""
+    costs = {}
+    for entry in (value or "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        path, _, cost = entry.rpartition("=")
+        path = path.strip()
+        try:
+            parsed = float(cost)
+        except ValueError:
+            parsed = None
+        if not path.startswith("/") or parsed is None or parsed < 0:
+            raise ValueError(f"Invalid route cost {entry!r} (expected /route/path=cost with cost >= 0)")
+        costs[path] = parsed
+    return costs
 
 
 class Settings(BaseSettings):
@@ -23,6 +43,48 @@ class Settings(BaseSettings):
     database_user: str = Field(default="web4ustfccca_public", description="Database username")
     database_password: str = Field(description="Database password")
 
+    # Connection pool sizing (per uvicorn worker)
+    database_pool_minsize: int = Field(default=5, ge=0, description="Connections kept open per worker")
+    database_pool_maxsize: int = Field(default=10, ge=1, description="Maximum connections per worker")
+    database_connection_budget: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Hard cap on total API connections (api_workers x pool max); startup fails if exceeded"
+    )
+
+    # Connection pool admission (per uvicorn worker)
+    database_pool_acquire_timeout_ms: int = Field(
+        default=2000,
+        ge=1,
+        description="Longest a request waits for a connection before getting 503 with Retry-After"
+    )
+    database_pool_max_queue: int = Field(
+        default=50,
+        ge=0,
+        description="Requests allowed to wait for a connection; further requests get 503 immediately"
+    )
+    database_pool_shrink_interval_seconds: int = Field(
+        default=60,
+        ge=0,
+        description="Seconds between closing idle connections above peak demand (0 disables)"
+    )
+
+    # Read replicas (optional; same credentials, database and pool sizing as the primary)
+    database_replica_hosts: Optional[str] = Field(
+        default=None,
+        description="Comma-separated read replica host[:port] list (port defaults to database_port)"
+    )
+    database_replica_max_lag_seconds: int = Field(
+        default=0,
+        ge=0,
+        description="How long a replica may miss the primary's latest calculation before it is bypassed"
+    )
+    database_replica_check_interval_seconds: int = Field(
+        default=10,
+        ge=1,
+        description="Seconds between replica health and calculation lag checks"
+    )
+
     # ===================================================================
     # API Configuration
     # ===================================================================
@@ -36,6 +98,11 @@ class Settings(BaseSettings):
 
     api_host: str = Field(default="127.0.0.1", description="API host to bind")
     api_port: int = Field(default=8001, description="API port")
+    api_uds: Optional[str] = Field(
+        default=None,
+        description="Unix domain socket path to bind instead of host/port (optional)"
+    )
+    api_workers: int = Field(default=2, ge=1, description="Number of uvicorn worker processes")
     api_cors_origins: str = Field(
         default="https://web4.ustfccca.org",
         description="Comma-separated list of allowed CORS origins"
@@ -53,6 +120,11 @@ class Settings(BaseSettings):
         default="/home/web4ustfccca/izzypy_xcri/data/exports",
         description="Directory containing historical snapshot Excel files"
     )
+    snapshot_catalogue_refresh_seconds: int = Field(
+        default=60,
+        ge=0,
+        description="Minimum seconds between checks for new snapshot checkpoints"
+    )
 
     # ===================================================================
     # Query Defaults
@@ -62,12 +134,317 @@ class Settings(BaseSettings):
     default_limit: int = Field(default=100, description="Default pagination limit")
     max_limit: int = Field(default=50000, description="Maximum pagination limit")
 
+    # ===================================================================
+    # Query Timeouts
+    # ===================================================================
+
+    query_timeout_list_ms: int = Field(
+        default=10000,
+        ge=0,
+        description="Per-query time limit for list endpoints (0 disables)"
+    )
+    query_timeout_detail_ms: int = Field(
+        default=5000,
+        ge=0,
+        description="Per-query time limit for single-entity endpoints (0 disables)"
+    )
+    query_timeout_analytics_ms: int = Field(
+        default=30000,
+        ge=0,
+        description="Per-query time limit for matchup and SCS analytics endpoints (0 disables)"
+    )
+    cancel_on_disconnect: bool = Field(
+        default=True,
+        description="Cancel GET requests (and kill their queries) when the client disconnects"
+    )
+
+    # ===================================================================
+    # Circuit Breaker
+    # ===================================================================
+
+    circuit_breaker_failure_threshold: int = Field(
+        default=5,
+        ge=0,
+        description="Consecutive database failures that open the circuit breaker (0 disables)"
+    )
+    circuit_breaker_probe_interval_seconds: int = Field(
+        default=5,
+        ge=1,
+        description="Seconds between recovery probes while the breaker is open"
+    )
+
+    # ===================================================================
+    # Batch and Bulk Endpoints
+    # ===================================================================
+
+    batch_max_requests: int = Field(default=20, ge=1, description="Maximum sub-requests per /batch call")
+    batch_max_concurrency: int = Field(
+        default=4,
+        ge=1,
+        description="Sub-requests executed concurrently per /batch call (keep below pool size)"
+    )
+    bulk_max_handles: int = Field(
+        default=500,
+        ge=1,
+        description="Maximum athlete handles per bulk lookup (/athletes/bulk, /scs/percentiles)"
+    )
+
+    # ===================================================================
+    # Team Knockout Opponent Index
+    # ===================================================================
+
+    knockout_index_refresh_seconds: int = Field(
+        default=60,
+        ge=0,
+        description="Seconds between checks for a new calculation (drops opponent indexes)"
+    )
+    knockout_index_max_contexts: int = Field(
+        default=64,
+        ge=1,
+        description="Team Knockout contexts kept in the opponent index (least recently used evicted)"
+    )
+
+    # ===================================================================
+    # SCS Score Arrays
+    # ===================================================================
+
+    scs_cache_refresh_seconds: int = Field(
+        default=60,
+        ge=0,
+        description="Seconds between checks for SCS table changes (drops cached score arrays)"
+    )
+    scs_cache_max_slices: int = Field(
+        default=64,
+        ge=1,
+        description="Season/division/gender slices kept as score arrays (least recently used evicted)"
+    )
+
+    # ===================================================================
+    # Season Resume Cache
+    # ===================================================================
+
+    resume_cache_max_bytes: int = Field(
+        default=32 * 1024 * 1024,
+        ge=0,
+        description="Memory budget for pre-compressed resume bodies (least recently used evicted)"
+    )
+    resume_team_map_ttl_seconds: int = Field(
+        default=3600,
+        ge=0,
+        description="Seconds a cached anet_team_hnd -> group_fk mapping is reused"
+    )
+    resume_team_map_max_entries: int = Field(
+        default=20000,
+        ge=1,
+        description="Teams kept in the anet_team_hnd -> group_fk mapping"
+    )
+
+    # ===================================================================
+    # Pre-compressed Response Store
+    # ===================================================================
+
+    response_store_enabled: bool = Field(
+        default=True,
+        description="Keep hot GET responses pre-compressed (cleared on each new calculation)"
+    )
+    response_store_paths: str = Field(
+        default="/athletes,/teams,/team-five,/team-knockout,/scs,/components",
+        description="Comma-separated path prefixes whose GET responses are stored"
+    )
+    response_store_max_bytes: int = Field(
+        default=256 * 1024 * 1024,
+        ge=0,
+        description="Memory budget per worker for stored responses, all encodings (least recently used evicted)"
+    )
+    response_store_min_bytes: int = Field(
+        default=1000,
+        ge=0,
+        description="Smallest response body worth compressing; smaller ones are stored uncompressed (matches the GZip minimum size)"
+    )
+    response_store_refresh_seconds: int = Field(
+        default=60,
+        ge=0,
+        description="Seconds between checks for a new calculation (clears the store)"
+    )
+    response_store_ttl_seconds: int = Field(
+        default=900,
+        ge=0,
+        description="Maximum age of a stored response"
+    )
+    response_store_gzip_level: int = Field(default=6, ge=1, le=9, description="gzip level for stored responses")
+    response_store_brotli_quality: int = Field(
+        default=5,
+        ge=0,
+        le=11,
+        description="Brotli quality for stored responses (when brotli is installed)"
+    )
+
+    # ===================================================================
+    # Event Loop Monitoring
+    # ===================================================================
+
+    loop_monitor_enabled: bool = Field(
+        default=False,
+        description="Measure event-loop lag and log stack traces of blocking calls"
+    )
+    loop_monitor_interval_ms: int = Field(default=50, ge=5, description="Lag sampling interval")
+    loop_block_threshold_ms: int = Field(
+        default=100,
+        ge=10,
+        description="Log the loop thread's stack when the loop is blocked longer than this"
+    )
+    loop_monitor_window: int = Field(
+        default=1200,
+        ge=10,
+        description="Lag samples kept for percentiles (1200 x 50ms = last minute)"
+    )
+
+    # ===================================================================
+    # Request Profiling
+    # ===================================================================
+
+    profiling_token: Optional[str] = Field(
+        default=None,
+        description="Admin token enabling per-request profiling (X-Profile-Token header); unset disables profiling"
+    )
+    profiling_engine: str = Field(
+        default="cprofile",
+        description="Profiler: cprofile, or pyinstrument when installed"
+    )
+    profiling_dir: Optional[str] = Field(
+        default=None,
+        description="Directory for stored profile reports (optional)"
+    )
+    profiling_top: int = Field(default=40, ge=1, description="Functions listed in cProfile reports")
+
     # ===================================================================
     # GitHub Integration (for feedback form)
     # ===================================================================
 
     github_token: Optional[str] = Field(default=None, description="GitHub Personal Access Token")
     github_repo: str = Field(default="lewistv/iz-apps-xcri", description="GitHub repository (owner/repo)")
+    github_api_url: str = Field(
+        default="https://api.github.com",
+        description="GitHub API base URL (point at a local mock server for testing)"
+    )
+
+    # Feedback queue (submissions are stored locally and sent to GitHub in the background)
+    feedback_queue_path: str = Field(
+        default="feedback_queue.sqlite3",
+        description="SQLite file holding queued feedback submissions (shared by all workers)"
+    )
+    feedback_max_attempts: int = Field(default=8, ge=1, description="GitHub attempts per submission before giving up")
+    feedback_retry_base_seconds: float = Field(
+        default=5.0,
+        gt=0,
+        description="First retry delay; doubles per attempt (with jitter)"
+    )
+    feedback_retry_max_seconds: float = Field(default=3600.0, gt=0, description="Longest retry delay")
+
+    # ===================================================================
+    # Rate Limiting
+    # ===================================================================
+
+    rate_limit_store_path: str = Field(
+        default="rate_limits.sqlite3",
+        description="SQLite file holding rate limit buckets (shared by all workers)"
+    )
+    rate_limit_purge_interval_seconds: float = Field(
+        default=60.0,
+        gt=0,
+        description="How often buckets that have refilled completely are deleted"
+    )
+
+    # Per-client request budget (cost units), charged for requests that reach a route
+    rate_limit_enabled: bool = Field(default=True, description="Enforce per-client budgets on API routes")
+    rate_limit_client_header: str = Field(
+        default="X-Real-IP",
+        description="Header carrying the visitor address (set by api-proxy.cgi and deployment/api_proxy_server.py)"
+    )
+    rate_limit_trusted_proxies: str = Field(
+        default="127.0.0.1,::1",
+        description="Comma-separated peers whose client header is trusted (requests over API_UDS always are)"
+    )
+    rate_limit_client_budget: float = Field(
+        default=300.0,
+        gt=0,
+        description="Cost units a client may spend per RATE_LIMIT_CLIENT_PERIOD_SECONDS"
+    )
+    rate_limit_client_period_seconds: float = Field(
+        default=60.0,
+        gt=0,
+        description="Period over which the client budget refills"
+    )
+    rate_limit_cost_list: float = Field(default=1.0, ge=0, description="Cost of a list request")
+    rate_limit_cost_detail: float = Field(default=1.0, ge=0, description="Cost of a detail request")
+    rate_limit_cost_analytics: float = Field(default=10.0, ge=0, description="Cost of an analytics request")
+    rate_limit_rows_per_unit: int = Field(
+        default=10000,
+        ge=1,
+        description="The cost is multiplied by one for every started block of this many rows requested (limit)"
+    )
+    rate_limit_route_costs: Optional[str] = Field(
+        default=None,
+        description="Per-route cost overrides, comma-separated route=cost (e.g. /team-knockout/matchups/common-opponents=20)"
+    )
+
+    # Concurrency cap for analytics routes
+    analytics_pool_fraction: float = Field(
+        default=0.3,
+        gt=0,
+        le=1,
+        description="Share of DATABASE_POOL_MAXSIZE that concurrent analytics requests may use (at least one)"
+    )
+
+    @model_validator(mode="after")
+    def check_pool_sizing(self) -> "Settings":
+        """Validate pool bounds and the total connection budget"""
+        if self.database_pool_minsize > self.database_pool_maxsize:
+            raise ValueError(
+                f"database_pool_minsize ({self.database_pool_minsize}) must not exceed "
+                f"database_pool_maxsize ({self.database_pool_maxsize})"
+            )
+        if self.database_connection_budget is not None and \
+                self.total_pool_connections > self.database_connection_budget:
+            raise ValueError(
+                f"api_workers x database_pool_maxsize = {self.total_pool_connections} exceeds "
+                f"database_connection_budget ({self.database_connection_budget})"
+            )
+        return self
+
+    @property
+    def total_pool_connections(self) -> int:
+        """Maximum connections held by all workers together"""
+        return self.api_workers * self.database_pool_maxsize
+
+    @property
+    def replica_hosts_list(self) -> List[Tuple[str, int]]:
+        """Parse read replica hosts into (host, port) pairs"""
+        if not self.database_replica_hosts:
+            return []
+        replicas = []
+        for entry in self.database_replica_hosts.split(","):
+            host, _, port = entry.strip().partition(":")
+            if host:
+                replicas.append((host, int(port) if port else self.database_port))
+        return replicas
+
+    @field_validator("rate_limit_route_costs")
+    @classmethod
+    def check_route_costs(cls, value: Optional[str]) -> Optional[str]:
+        """Fail at startup on malformed per-route cost overrides"""
+        parse_route_costs(value)
+        return value
+
+    @cached_property
+    def route_costs_map(self) -> Dict[str, float]:
+        """Per-route cost overrides as {route path: cost} (parsed once)"""
+        return parse_route_costs(self.rate_limit_route_costs)
+
+    @cached_property
+    def trusted_proxies_set(self) -> Set[str]:
+        """Peers allowed to name the visitor in RATE_LIMIT_CLIENT_HEADER"""
+        return {peer.strip() for peer in self.rate_limit_trusted_proxies.split(",") if peer.strip()}
 
     @property
     def cors_origins_list(self) -> List[str]:
@@ -5,7 +5,11 @@ This module provides async database operations using aiomysql with connection po
 for improved performance and scalability. Designed for multi-worker uvicorn deployment.
 
 Key Features:
-- Connection pooling (5-10 connections per worker)
+- Connection pooling (DATABASE_POOL_MINSIZE-MAXSIZE connections per worker)
+- Acquire deadline and load shedding (503 + Retry-After) via pool_admission
+- Per-endpoint-class query timeouts and KILL QUERY on cancellation via query_timeouts
+- Fail-fast circuit breaker while the database is down via circuit_breaker
+- Optional read replicas (own pools, health- and lag-aware routing) via replicas
 - Async/await support for non-blocking I/O
 - Automatic connection recycling
 - Graceful startup/shutdown lifecycle management
@@ -23,10 +27,19 @@ Usage:
     await close_pool()
 """
 
+import asyncio
 import logging
+import time
 import aiomysql
 from contextlib import asynccontextmanager
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Sequence, Tuple
+
+from circuit_breaker import circuit_breaker
+from pool_admission import pool_admission
+from replicas import Replica, replica_router
+from profiling import ProfiledCursor, current_profile
+from query_timeouts import TimedCursor, current_timeout_ms
+from request_limits import analytics_gate
 
 logger = logging.getLogger(__name__)
 
@@ -38,7 +51,7 @@ pool: Optional[aiomysql.Pool] = None
 # Connection Pool Management
 # ===================================================================
 
-async def create_pool(config: Dict[str, Any], pool_size: int = 10) -> None:
+async def create_pool(config: Dict[str, Any], pool_size: int = 10, min_size: int = 5) -> None:
     """
     Create async MySQL connection pool at application startup.
 
@@ -49,7 +62,8 @@ async def create_pool(config: Dict[str, Any], pool_size: int = 10) -> None:
             - user: Database username
             - password: Database password
             - database: Database name
-        pool_size: Number of connections in pool (default: 10 per worker)
+        pool_size: Maximum connections in pool (default: 10 per worker)
+        min_size: Connections kept ready (default: 5 per worker)
 
     Raises:
         Exception: If pool creation fails
@@ -57,26 +71,13 @@ async def create_pool(config: Dict[str, Any], pool_size: int = 10) -> None:
     global pool
 
     try:
-        logger.info(f"Creating async connection pool (size: {pool_size})...")
-
-        pool = await aiomysql.create_pool(
-            host=config['host'],
-            port=config['port'],
-            user=config['user'],
-            password=config['password'],
-            db=config['database'],
-            minsize=5,              # Keep 5 connections ready
-            maxsize=pool_size,      # Maximum connections per worker
-            autocommit=True,        # Auto-commit for read operations
-            charset='utf8mb4',
-            connect_timeout=5,      # 5 second connection timeout
-            pool_recycle=3600,      # Recycle connections after 1 hour
-            echo=False,             # Disable SQL echo (can enable for debugging)
-        )
+        logger.info(f"Creating async connection pool (size: {min_size}-{pool_size})...")
+
+        pool = await _connect_pool(config, config['host'], config['port'], pool_size, min_size)
 
         logger.info(f"✓ Async connection pool initialized successfully")
         logger.info(f"  - Pool size: {pool_size} connections")
-        logger.info(f"  - Min ready: 5 connections")
+        logger.info(f"  - Min ready: {min_size} connections")
         logger.info(f"  - Recycle: 3600 seconds (1 hour)")
 
     except Exception as e:
@@ -84,14 +85,74 @@ async def create_pool(config: Dict[str, Any], pool_size: int = 10) -> None:
         raise Exception(f"Database pool initialization failed: {e}")
 
 
+async def _connect_pool(
+    config: Dict[str, Any],
+    host: str,
+    port: int,
+    pool_size: int,
+    min_size: int
+) -> aiomysql.Pool:
+    """aiomysql pool for one server (primary or read replica)"""
+    return await aiomysql.create_pool(
+        host=host,
+        port=port,
+        user=config['user'],
+        password=config['password'],
+        db=config['database'],
+        minsize=min_size,       # Connections kept ready
+        maxsize=pool_size,      # Maximum connections per worker
+        autocommit=True,        # Auto-commit for read operations
+        charset='utf8mb4',
+        connect_timeout=5,      # 5 second connection timeout
+        pool_recycle=3600,      # Recycle connections after 1 hour
+        echo=False,             # Disable SQL echo (can enable for debugging)
+    )
+
+
+async def create_replica_pools(
+    config: Dict[str, Any],
+    replicas: Sequence[Tuple[str, int]],
+    pool_size: int = 10,
+    min_size: int = 5
+) -> None:
+    """
+    Create one pool per read replica and run the first health check.
+
+    Call after create_pool(). Credentials and database come from config; a
+    replica that cannot be reached is logged and left out (the primary
+    serves its share).
+
+    Args:
+        config: Database configuration dictionary (see create_pool)
+        replicas: (host, port) of each read replica
+        pool_size: Maximum connections per replica pool
+        min_size: Connections kept ready per replica pool
+    """
+    for host, port in replicas:
+        try:
+            replica_pool = await _connect_pool(config, host, port, pool_size, min_size)
+        except Exception as e:
+            logger.error(f"✗ Read replica {host}:{port} unavailable, not used: {e}")
+            continue
+        replica_router.add(Replica(host, port, replica_pool))
+        logger.info(f"✓ Read replica pool initialized: {host}:{port} (size: {min_size}-{pool_size})")
+
+    await replica_router.check(pool)
+    for replica in replica_router.replicas:
+        state = "in rotation" if replica.healthy else f"bypassed ({replica.last_error or 'lagging'})"
+        logger.info(f"  - {replica.name}: calculation {replica.calculated_at}, {state}")
+
+
 async def close_pool() -> None:
     """
     Close connection pool at application shutdown.
 
-    Gracefully closes all connections in the pool.
+    Gracefully closes all connections in the pool and the read replica pools.
     """
     global pool
 
+    await replica_router.close()
+
     if pool:
         logger.info("Closing async connection pool...")
         pool.close()
@@ -101,6 +162,11 @@ async def close_pool() -> None:
         logger.warning("No connection pool to close")
 
 
+def get_pool() -> Optional[aiomysql.Pool]:
+    """Current connection pool (None before startup)"""
+    return pool
+
+
 def get_pool_status() -> Dict[str, Any]:
     """
     Get current pool status for monitoring.
@@ -117,20 +183,97 @@ def get_pool_status() -> Dict[str, Any]:
         "free": pool.freesize,
         "min_size": pool.minsize,
         "max_size": pool.maxsize,
+        "admission": pool_admission.get_stats(),
+        "circuit_breaker": circuit_breaker.get_stats(),
+        "analytics": analytics_gate.get_stats(),
+        "primary_reads": replica_router.primary_reads,
+        "replicas": replica_router.get_stats(),
     }
 
 
+async def get_connection_limits() -> Dict[str, int]:
+    """
+    Read MySQL connection limits for pool sizing validation.
+
+    Returns:
+        Dictionary with max_connections, max_user_connections (0 = unlimited)
+        and threads_connected
+    """
+    async with get_db_cursor(primary=True) as cursor:
+        await cursor.execute(
+            "SELECT @@max_connections AS max_connections, "
+            "@@max_user_connections AS max_user_connections"
+        )
+        limits = await cursor.fetchone()
+        await cursor.execute("SHOW STATUS LIKE 'Threads_connected'")
+        threads = await cursor.fetchone()
+
+    return {
+        "max_connections": int(limits['max_connections']),
+        "max_user_connections": int(limits['max_user_connections']),
+        "threads_connected": int(threads['Value']) if threads else 0,
+    }
+
+
+async def log_concurrency_budget(workers: int, pool_min: int, pool_max: int) -> None:
+    """
+    Log the effective concurrency budget and check it against MySQL limits.
+
+    Every worker has its own pool, so the API can hold up to
+    workers x pool_max connections. A warning is logged if that exceeds the
+    per-user limit (shared hosting) or the server-wide max_connections.
+    """
+    total_max = workers * pool_max
+    logger.info("Concurrency budget:")
+    logger.info(f"  - Workers: {workers}")
+    logger.info(f"  - Pool per worker: {pool_min}-{pool_max} connections")
+    logger.info(f"  - Total API connections: {workers * pool_min}-{total_max}")
+    logger.info(f"  - Concurrent queries: {total_max} ({pool_max} per worker)")
+
+    try:
+        limits = await get_connection_limits()
+    except Exception as e:
+        logger.warning(f"Could not read MySQL connection limits: {e}")
+        return
+
+    user_limit = limits['max_user_connections']
+    effective_limit = min(user_limit, limits['max_connections']) if user_limit else limits['max_connections']
+
+    logger.info(
+        f"  - MySQL limit: {effective_limit} connections "
+        f"(max_connections={limits['max_connections']}, "
+        f"max_user_connections={user_limit or 'unlimited'}, "
+        f"currently connected={limits['threads_connected']})"
+    )
+
+    if total_max > effective_limit:
+        logger.warning(
+            f"WARNING: api workers x pool max ({total_max}) exceeds the MySQL connection "
+            f"limit ({effective_limit}); lower API_WORKERS or DATABASE_POOL_MAXSIZE"
+        )
+    elif total_max > effective_limit * 0.8:
+        logger.warning(
+            f"WARNING: api workers x pool max ({total_max}) uses more than 80% of the "
+            f"MySQL connection limit ({effective_limit})"
+        )
+
+
 # ===================================================================
 # Connection Context Managers
 # ===================================================================
 
 @asynccontextmanager
-async def get_db():
+async def get_db(primary: bool = False):
     """
     Async context manager for database connections from pool.
 
     Acquires a connection from the pool and yields it for use.
     Connection is automatically returned to pool after use.
+    Waits at most DATABASE_POOL_ACQUIRE_TIMEOUT_MS for a connection.
+
+    Args:
+        primary: Always use the primary (default: any healthy read replica
+            or the primary, whichever is least busy)
 
     Usage:
         async with get_db() as conn:
@@ -143,27 +286,48 @@ async def get_db():
 
     Raises:
         RuntimeError: If pool not initialized
+        PoolExhausted: 503 with Retry-After when no connection is available
+            within the acquire deadline (or the wait queue is full)
     """
+    async with _acquire(primary) as (conn, _):
+        yield conn
+
+
+@asynccontextmanager
+async def _acquire(primary: bool):
+    """Connection and the pool it came from, routed between primary and replicas"""
     if not pool:
         raise RuntimeError(
             "Connection pool not initialized. "
             "Call create_pool() in application startup."
         )
 
-    async with pool.acquire() as conn:
-        yield conn
+    replica = None if primary else replica_router.choose()
+    if replica is None:
+        async with pool_admission.acquire(pool) as conn:
+            yield conn, pool
+        return
+
+    try:
+        async with replica.admission.acquire(replica.pool) as conn:
+            yield conn, replica.pool
+    except Exception as e:
+        replica_router.mark_failed(replica, e)
+        raise
 
 
 @asynccontextmanager
-async def get_db_cursor(cursor_class=aiomysql.DictCursor):
+async def get_db_cursor(cursor_class=aiomysql.DictCursor, primary: bool = False):
     """
     Async context manager for database cursor (simplified).
 
     Automatically handles connection acquisition and cursor creation.
     Cursor is automatically closed after use, connection returned to pool.
+    Database failures are reported to the circuit breaker.
 
     Args:
         cursor_class: Cursor class to use (default: DictCursor for dict results)
+        primary: Always query the primary instead of a read replica
 
     Usage:
         async with get_db_cursor() as cursor:
@@ -171,14 +335,88 @@ async def get_db_cursor(cursor_class=aiomysql.DictCursor):
             results = await cursor.fetchall()
 
     Yields:
-        aiomysql.Cursor: Database cursor (DictCursor by default)
+        aiomysql.Cursor: Database cursor (DictCursor by default); wrapped in
+        a TimedCursor enforcing the endpoint class timeout inside requests,
+        and a ProfiledCursor recording SQL timings when the request is profiled
 
     Raises:
         RuntimeError: If pool not initialized
+        QueryTimeout: 504 when a query exceeds the endpoint class timeout
+        DatabaseUnavailable: 503 with Retry-After while the circuit breaker is open
     """
-    async with get_db() as conn:
-        async with conn.cursor(cursor_class) as cursor:
+    circuit_breaker.check()
+    try:
+        async with _open_cursor(cursor_class, primary) as cursor:
             yield cursor
+    except Exception as e:
+        circuit_breaker.record_failure(e)
+        raise
+    circuit_breaker.record_success()
+
+
+@asynccontextmanager
+async def _open_cursor(cursor_class, primary: bool):
+    """Pooled connection and cursor with the request's timeout and profiling"""
+    profile = current_profile()
+    timeout_ms = current_timeout_ms()
+    if profile is None and timeout_ms is None:
+        async with _acquire(primary) as (conn, _):
+            async with conn.cursor(cursor_class) as cursor:
+                yield cursor
+        return
+
+    acquire_start = time.perf_counter()
+    async with _acquire(primary) as (conn, conn_pool):
+        if profile is not None:
+            profile.pool_wait += time.perf_counter() - acquire_start
+        async with conn.cursor(cursor_class) as cursor:
+            if timeout_ms is not None:
+                thread_id = conn.thread_id() if hasattr(conn, "thread_id") else None
+                cursor = TimedCursor(cursor, timeout_ms, lambda: kill_query(thread_id, conn_pool))
+            yield cursor if profile is None else ProfiledCursor(cursor, profile)
+
+
+async def ping() -> None:
+    """
+    SELECT 1 on a pooled connection, bypassing admission and the circuit
+    breaker (the breaker's recovery probe).
+    """
+    if not pool:
+        raise RuntimeError("Connection pool not initialized")
+    conn = await pool.acquire()
+    try:
+        async with conn.cursor() as cursor:
+            await cursor.execute("SELECT 1")
+            await cursor.fetchone()
+    finally:
+        pool.release(conn)
+
+
+circuit_breaker.set_probe(ping)
+
+
+async def kill_query(thread_id: Optional[int], server_pool) -> None:
+    """
+    Abort the statement running on a server thread (KILL QUERY).
+
+    Sent on a separate connection from the same server's pool when a query
+    is cancelled or times out client-side; the thread's own connection is
+    closed by aiomysql, but the server would otherwise keep executing the
+    statement.
+    """
+    if thread_id is None or server_pool is None:
+        return
+    try:
+        conn = await asyncio.wait_for(server_pool.acquire(), 2)
+        try:
+            async with conn.cursor() as cursor:
+                await cursor.execute("KILL QUERY %s", [thread_id])
+        finally:
+            server_pool.release(conn)
+        logger.info(f"Killed query on MySQL thread {thread_id}")
+    except Exception as e:
+        # Unknown thread: the statement finished before the KILL arrived
+        logger.warning(f"KILL QUERY {thread_id} failed: {e}")
 
 
 # ===================================================================
@@ -193,7 +431,7 @@ async def test_connection() -> bool:
         True if connection test passed, False otherwise
     """
     try:
-        async with get_db_cursor() as cursor:
+        async with get_db_cursor(primary=True) as cursor:
             await cursor.execute("SELECT 1 as test")
             result = await cursor.fetchone()
 
@@ -216,7 +454,7 @@ async def get_table_counts() -> Dict[str, int]:
     Returns:
         Dictionary with table names and record counts
     """
-    async with get_db_cursor() as cursor:
+    async with get_db_cursor(primary=True) as cursor:
         counts = {}
 
         tables = [
@@ -248,7 +486,8 @@ def build_where_clause(
     gender: Optional[str] = None,
     scoring_group: str = "division",
     checkpoint_date: Optional[str] = None,
-    algorithm_type: str = "light"
+    algorithm_type: str = "light",
+    alias: Optional[str] = None
 ) -> Tuple[str, List[Any]]:
     """
     Build WHERE clause for common XCRI queries.
@@ -262,35 +501,38 @@ def build_where_clause(
         scoring_group: Scoring scope (default: 'division')
         checkpoint_date: Checkpoint date or None for full season (optional)
         algorithm_type: Algorithm type (default: 'light')
+        alias: Table alias to qualify columns with, for JOIN queries (optional)
 
     Returns:
         Tuple of (where_sql, params) for parameterized queries
     """
-    where_clauses = ["season_year = %s"]
+    col = f"{alias}." if alias else ""
+
+    where_clauses = [f"{col}season_year = %s"]
     params = [season_year]
 
     # Always filter by scoring group
-    where_clauses.append("scoring_group = %s")
+    where_clauses.append(f"{col}scoring_group = %s")
     params.append(scoring_group)
 
     # Always filter by algorithm type
-    where_clauses.append("algorithm_type = %s")
+    where_clauses.append(f"{col}algorithm_type = %s")
     params.append(algorithm_type)
 
     # Checkpoint date (NULL for full season)
     if checkpoint_date:
-        where_clauses.append("checkpoint_date = %s")
+        where_clauses.append(f"{col}checkpoint_date = %s")
         params.append(checkpoint_date)
     else:
-        where_clauses.append("checkpoint_date IS NULL")
+        where_clauses.append(f"{col}checkpoint_date IS NULL")
 
     # Optional filters
     if division:
-        where_clauses.append("division_code = %s")
+        where_clauses.append(f"{col}division_code = %s")
         params.append(division)
 
     if gender:
-        where_clauses.append("gender_code = %s")
+        where_clauses.append(f"{col}gender_code = %s")
         params.append(gender.upper())
 
     where_sql = " AND ".join(where_clauses)
@@ -0,0 +1,203 @@
+"""
+XCRI Rankings API - Event Loop Monitor
+
+Watchdog for blocking calls on the asyncio event loop. Two cheap parts:
+
+- A sampler task sleeps for a fixed interval and records how late it woke
+  up (event-loop lag). Samples go into a bounded ring buffer from which
+  /health/loop reports percentiles.
+- A daemon thread watches the sampler's heartbeat. When the loop has not
+  run for longer than the block threshold, it captures the loop thread's
+  current stack (the code that is blocking) and logs it once per stall,
+  followed by the total stall duration when the loop recovers.
+
+Costs one timer wake-up per interval on the loop and one thread wake-up per
+half threshold, so it can stay enabled in production (LOOP_MONITOR_ENABLED).
+
+Usage (main.py lifespan):
+    loop_monitor.start()
+    ...
+    await loop_monitor.stop()
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _percentile(ordered: List[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class LoopMonitor:
+    """Event-loop lag sampler and blocking-call watchdog"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+
+        self._interval = settings.loop_monitor_interval_ms / 1000
+        self._threshold = settings.loop_block_threshold_ms / 1000
+        self._samples: Deque[float] = deque(maxlen=settings.loop_monitor_window)
+
+        self._heartbeat = time.monotonic()
+        self._started_at: Optional[float] = None
+        self._total_samples = 0
+        self._max_lag = 0.0
+
+        # Stall bookkeeping (written by the watchdog thread)
+        self._stall_started: Optional[float] = None
+        self._blocks = 0
+        self._last_block: Optional[Dict[str, Any]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start sampling on the running loop and launch the watchdog thread"""
+        if self.running:
+            return
+
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._started_at = self._heartbeat
+        self._stop_event.clear()
+        self._task = asyncio.get_running_loop().create_task(self._sample())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+        logger.info(
+            f"✓ Event loop monitor started (interval {settings.loop_monitor_interval_ms}ms, "
+            f"block threshold {settings.loop_block_threshold_ms}ms)"
+        )
+
+    async def stop(self) -> None:
+        """Stop the sampler task and the watchdog thread"""
+        self._stop_event.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    # ---------------------------------------------------------------
+    # Loop side
+    # ---------------------------------------------------------------
+
+    async def _sample(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self._interval)
+            lag = max(0.0, loop.time() - start - self._interval)
+            self._heartbeat = time.monotonic()
+            self._samples.append(lag)
+            self._total_samples += 1
+            if lag > self._max_lag:
+                self._max_lag = lag
+
+    # ---------------------------------------------------------------
+    # Watchdog thread
+    # ---------------------------------------------------------------
+
+    def _watch(self) -> None:
+        poll = max(self._threshold / 2, 0.005)
+        # The sampler legitimately sleeps for one interval between heartbeats
+        limit = self._interval + self._threshold
+
+        while not self._stop_event.wait(poll):
+            age = time.monotonic() - self._heartbeat
+
+            if age > limit and self._stall_started is None:
+                self._stall_started = self._heartbeat
+                self._blocks += 1
+                stack = self._loop_stack()
+                self._last_block = {
+                    "detected_at": time.time(),
+                    "duration_ms": None,
+                    "stack": stack,
+                }
+                logger.warning(
+                    f"Event loop blocked for >{age * 1000:.0f}ms "
+                    f"(threshold {settings.loop_block_threshold_ms}ms); loop thread stack:\n"
+                    + "".join(stack)
+                )
+
+            elif age <= limit and self._stall_started is not None:
+                duration = self._heartbeat - self._stall_started - self._interval
+                if self._last_block is not None:
+                    self._last_block["duration_ms"] = round(duration * 1000, 1)
+                logger.warning(f"Event loop unblocked after {duration * 1000:.0f}ms")
+                self._stall_started = None
+
+    def _loop_stack(self) -> List[str]:
+        """Stack of the event loop thread at this moment"""
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return ["<loop thread not found>\n"]
+        return traceback.format_stack(frame)
+
+    # ---------------------------------------------------------------
+    # Reporting
+    # ---------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Lag percentiles over the sample window and blocking counters"""
+        if self._started_at is None:
+            return {"status": "disabled" if not settings.loop_monitor_enabled else "not_started"}
+
+        ordered = sorted(self._samples)
+        last_block = None
+        if self._last_block is not None:
+            last_block = {
+                "detected_at": datetime.fromtimestamp(self._last_block["detected_at"]),
+                "duration_ms": self._last_block["duration_ms"],
+                # Innermost frames are the interesting ones
+                "stack": [line.rstrip() for line in self._last_block["stack"][-8:]],
+            }
+
+        return {
+            "status": "blocked" if self._stall_started is not None else "running",
+            "pid": os.getpid(),
+            "uptime_seconds": round(time.monotonic() - self._started_at, 1),
+            "interval_ms": settings.loop_monitor_interval_ms,
+            "block_threshold_ms": settings.loop_block_threshold_ms,
+            "window_samples": len(ordered),
+            "total_samples": self._total_samples,
+            "lag_ms": {
+                "p50": round(_percentile(ordered, 50) * 1000, 2),
+                "p95": round(_percentile(ordered, 95) * 1000, 2),
+                "p99": round(_percentile(ordered, 99) * 1000, 2),
+                "max_window": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+                "max_total": round(self._max_lag * 1000, 2),
+            },
+            "blocks": self._blocks,
+            "last_block": last_block,
+        }
+
+
+# Global instance (one per worker process)
+loop_monitor = LoopMonitor()
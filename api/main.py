@@ -7,6 +7,9 @@ Provides REST API access to athlete and team five rankings from web4 database.
 Run with:
     uvicorn main:app --reload --host 0.0.0.0 --port 8000
 
+Production (bind, workers and pool sizing from settings):
+    python main.py
+
 Documentation:
     - Swagger UI: http://localhost:8000/docs
     - ReDoc: http://localhost:8000/redoc
@@ -14,6 +17,7 @@ Documentation:
 """
 
 import logging
+import os
 from datetime import datetime
 from contextlib import asynccontextmanager
 
@@ -26,13 +30,27 @@ from config import settings
 from database import validate_database_connection as validate_database_connection_sync
 from database_async import (
     create_pool,
+    create_replica_pools,
     close_pool,
     validate_database_connection as validate_database_connection_async,
+    get_pool,
     get_pool_status,
-    get_table_counts
+    get_table_counts,
+    log_concurrency_budget
 )
-from models import HealthCheckResponse, ErrorResponse
-from routes import athletes, teams, team_five, team_knockout, metadata, snapshots, scs, components, feedback
+from circuit_breaker import circuit_breaker
+from loop_monitor import loop_monitor
+from pool_admission import pool_admission
+from profiling import ProfilingMiddleware
+from query_timeouts import CancelOnDisconnectMiddleware
+from rate_limiter import rate_limit_store
+from replicas import replica_router
+from request_limits import RequestLimitMiddleware
+from services.feedback_queue_service import feedback_queue
+from response_store import ResponseStoreMiddleware
+from models import HealthCheckResponse, ErrorResponse, LoopMonitorResponse, PoolStatusResponse, QueryShapesResponse
+from query_shapes import query_registry
+from routes import athletes, teams, team_five, team_knockout, metadata, snapshots, scs, components, feedback, batch
 
 # Configure logging
 logging.basicConfig(
@@ -52,10 +70,13 @@ async def lifespan(app: FastAPI):
     Application lifespan handler with async connection pooling.
 
     Startup:
-    - Create async database connection pool
+    - Create async database connection pool (and read replica pools)
     - Validate database connection
     - Check table record counts
     - Log configuration
+    - Start idle-connection shrinking
+    - Start the event loop monitor (if enabled)
+    - Start the feedback queue delivery worker
 
     Shutdown:
     - Close connection pool gracefully
@@ -66,7 +87,10 @@ async def lifespan(app: FastAPI):
     logger.info("XCRI Rankings API - Starting Up (Async Mode)")
     logger.info("=" * 60)
     logger.info(f"API Version: {settings.api_version}")
-    logger.info(f"API Host: {settings.api_host}:{settings.api_port}")
+    if settings.api_uds:
+        logger.info(f"API Socket: {settings.api_uds}")
+    else:
+        logger.info(f"API Host: {settings.api_host}:{settings.api_port}")
     logger.info(f"CORS Origins: {settings.cors_origins_list}")
 
     try:
@@ -78,7 +102,20 @@ async def lifespan(app: FastAPI):
             'password': settings.database_password,
             'database': settings.database_name,
         }
-        await create_pool(config, pool_size=10)
+        await create_pool(
+            config,
+            pool_size=settings.database_pool_maxsize,
+            min_size=settings.database_pool_minsize
+        )
+
+        # Read replicas: pools and first lag check (primary serves reads alone without)
+        if settings.replica_hosts_list:
+            await create_replica_pools(
+                config,
+                settings.replica_hosts_list,
+                pool_size=settings.database_pool_maxsize,
+                min_size=settings.database_pool_minsize
+            )
 
         # Validate database connection
         await validate_database_connection_async()
@@ -88,10 +125,33 @@ async def lifespan(app: FastAPI):
         pool_status = get_pool_status()
         logger.info(f"✓ Pool initialized: {pool_status['free']}/{pool_status['max_size']} connections ready")
 
+        # Log workers x pool size against MySQL connection limits
+        await log_concurrency_budget(
+            workers=settings.api_workers,
+            pool_min=settings.database_pool_minsize,
+            pool_max=settings.database_pool_maxsize
+        )
+
     except Exception as e:
         logger.error(f"✗ Startup failed: {e}")
         raise
 
+    # Close idle connections above observed demand
+    pool_admission.start(get_pool)
+
+    # Replica health and calculation lag checks
+    replica_router.start(get_pool)
+
+    # Event-loop lag sampling and blocking-call watchdog
+    if settings.loop_monitor_enabled:
+        loop_monitor.start()
+
+    # Feedback submissions -> GitHub issues, off the request path
+    await feedback_queue.start()
+
+    # Delete rate limit buckets that have refilled
+    rate_limit_store.start()
+
     logger.info("=" * 60)
     logger.info("XCRI Rankings API - Ready (Async + Connection Pooling)")
     logger.info("=" * 60)
@@ -103,6 +163,11 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("XCRI Rankings API - Shutting Down")
+    await loop_monitor.stop()
+    await feedback_queue.stop()
+    await rate_limit_store.stop()
+    await pool_admission.stop()
+    await circuit_breaker.stop()
     await close_pool()
     logger.info("✓ Async connection pool closed")
 
@@ -126,6 +191,14 @@ app = FastAPI(
 # Middleware Configuration
 # ===================================================================
 
+# Per-client budgets and the analytics concurrency cap (innermost: stored
+# responses are served without charging the client)
+app.add_middleware(RequestLimitMiddleware)
+
+# Pre-compressed response store (CORS headers stay per request and GZip
+# passes the already-encoded bodies through)
+app.add_middleware(ResponseStoreMiddleware)
+
 # CORS - Allow cross-origin requests
 app.add_middleware(
     CORSMiddleware,
@@ -141,6 +214,14 @@ app.add_middleware(
     minimum_size=1000  # Only compress responses > 1KB
 )
 
+# Per-request profiling for requests carrying PROFILING_TOKEN (outermost, so
+# Server-Timing covers compression too)
+app.add_middleware(ProfilingMiddleware)
+
+# Cancel GET requests whose client has gone away, killing their queries and
+# freeing their pooled connections (outermost, so the whole chain is cancelled)
+app.add_middleware(CancelOnDisconnectMiddleware)
+
 
 # ===================================================================
 # Exception Handlers
@@ -240,6 +321,58 @@ async def health_check():
     }
 
 
+@app.get(
+    "/health/loop",
+    response_model=LoopMonitorResponse,
+    summary="Event loop lag and blocking calls",
+    description="""
+    Event-loop lag percentiles and blocking-call counters for the worker
+    process that answers (see pid). Enable with LOOP_MONITOR_ENABLED=true.
+
+    Stack traces of each stall are written to the log; the innermost frames
+    of the most recent stall are included here.
+    """,
+    tags=["system"]
+)
+async def loop_health():
+    """Event loop monitor statistics"""
+    return loop_monitor.get_stats()
+
+
+@app.get(
+    "/health/pool",
+    response_model=PoolStatusResponse,
+    summary="Connection pool and admission queue",
+    description="""
+    Open and idle connections, wait queue depth, wait-time percentiles,
+    503 counters (acquire timeouts and shed requests), the database
+    circuit breaker state and read replica health for the worker process
+    that answers.
+    """,
+    tags=["system"]
+)
+async def pool_health():
+    """Connection pool statistics"""
+    return {"pid": os.getpid(), **get_pool_status()}
+
+
+@app.get(
+    "/health/queries",
+    response_model=QueryShapesResponse,
+    summary="Per-query-shape statistics",
+    description="""
+    Call counts, rows and execute + fetch timings per query shape (one
+    statement text per query and filter combination) for the worker process
+    that answers, most total time first.
+    """,
+    tags=["system"]
+)
+async def query_health():
+    """Query shape registry statistics"""
+    shapes = query_registry.get_stats()
+    return {"pid": os.getpid(), "total": len(shapes), "results": shapes}
+
+
 # ===================================================================
 # Include Routers
 # ===================================================================
@@ -253,6 +386,7 @@ app.include_router(snapshots.router)
 app.include_router(scs.router)  # Frontend Session 004: SCS component endpoints
 app.include_router(components.router)  # Backend Session 003: Component score API
 app.include_router(feedback.router)  # User feedback submission (creates GitHub issues)
+app.include_router(batch.router)  # Multiple GET queries in one round trip
 
 
 # ===================================================================
@@ -263,10 +397,14 @@ if __name__ == "__main__":
     import uvicorn
 
     logger.info("Starting XCRI Rankings API...")
+    # Binds API_UDS when set (host/port ignored); reload is development only
+    # and cannot be combined with multiple workers
     uvicorn.run(
         "main:app",
         host=settings.api_host,
         port=settings.api_port,
-        reload=True,
+        uds=settings.api_uds,
+        workers=1 if settings.debug else settings.api_workers,
+        reload=settings.debug,
         log_level="info"
     )
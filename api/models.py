@@ -6,7 +6,7 @@ Models match the database schema from iz_rankings_xcri_* tables.
 """
 
 from datetime import datetime, date
-from typing import Optional, List
+from typing import Any, Dict, List, Literal, Optional
 from pydantic import BaseModel, Field, field_validator
 
 
@@ -338,6 +338,13 @@ class AthleteListResponse(BaseModel):
     results: List[AthleteRanking] = Field(description="List of athlete rankings")
 
 
+class AthleteBulkResponse(BaseModel):
+    """Athlete rankings for a list of athlete handles"""
+    total: int = Field(description="Number of athletes found")
+    results: List[AthleteRanking] = Field(description="Athlete rankings in request order")
+    not_found: List[int] = Field(description="Requested handles without a ranking in this context")
+
+
 class TeamListResponse(BaseModel):
     """Paginated list of team rankings"""
     total: int = Field(description="Total number of results")
@@ -352,6 +359,105 @@ class MetadataListResponse(BaseModel):
     results: List[CalculationMetadata] = Field(description="List of metadata records")
 
 
+# ===================================================================
+# Timeline Models (rank history across checkpoints)
+# ===================================================================
+
+class AthleteTimelinePoint(BaseModel):
+    """Athlete ranking at a single checkpoint"""
+    checkpoint_date: Optional[date] = Field(default=None, description="Checkpoint date (null = full season)")
+    athlete_rank: int = Field(description="Athlete rank at this checkpoint")
+    xcri_score: Optional[float] = Field(default=None, description="XCRI score")
+    races_count: Optional[int] = Field(default=None, description="Number of races")
+    scs_score: Optional[float] = Field(default=None, description="Season Composite Score")
+    saga_score: Optional[float] = Field(default=None, description="SAGA component score")
+    sewr_score: Optional[float] = Field(default=None, description="SEWR component score")
+    osma_score: Optional[float] = Field(default=None, description="OSMA component score")
+
+
+class AthleteTimelineResponse(BaseModel):
+    """Rank history for one athlete across all checkpoints of a season"""
+    anet_athlete_hnd: int = Field(description="AthleticNet athlete handle")
+    athlete_name_first: Optional[str] = Field(default=None, description="Athlete first name")
+    athlete_name_last: Optional[str] = Field(default=None, description="Athlete last name")
+    anet_team_hnd: Optional[int] = Field(default=None, description="AthleticNet team handle")
+    team_name: Optional[str] = Field(default=None, description="Team/school name")
+    season_year: int = Field(description="Season year")
+    division_code: Optional[int] = Field(default=None, description="Division code")
+    gender_code: Optional[str] = Field(default=None, description="Gender: M or F")
+    total: int = Field(description="Number of timeline points")
+    points: List[AthleteTimelinePoint] = Field(description="Timeline points, oldest first")
+
+
+class TeamTimelinePoint(BaseModel):
+    """Team ranking at a single checkpoint"""
+    checkpoint_date: Optional[date] = Field(default=None, description="Checkpoint date (null = full season)")
+    team_rank: int = Field(description="Team rank at this checkpoint")
+    team_xcri_score: Optional[float] = Field(default=None, description="Team XCRI score")
+    athletes_count: Optional[int] = Field(default=None, description="Total athletes on roster")
+    top5_average: Optional[float] = Field(default=None, description="Average XCRI of top 5")
+    top7_average: Optional[float] = Field(default=None, description="Average XCRI of top 7")
+    squad_depth_score: Optional[float] = Field(default=None, description="Squad depth metric")
+
+
+class TeamTimelineResponse(BaseModel):
+    """Rank history for one team across all checkpoints of a season"""
+    anet_team_hnd: int = Field(description="AthleticNet team handle")
+    team_name: Optional[str] = Field(default=None, description="Team/school name")
+    season_year: int = Field(description="Season year")
+    division_code: Optional[int] = Field(default=None, description="Division code")
+    gender_code: Optional[str] = Field(default=None, description="Gender: M or F")
+    total: int = Field(description="Number of timeline points")
+    points: List[TeamTimelinePoint] = Field(description="Timeline points, oldest first")
+
+
+# ===================================================================
+# Batch Models (multiple API calls in one round trip)
+# ===================================================================
+
+class BatchRequestItem(BaseModel):
+    """Single sub-request inside a batch"""
+    id: Optional[str] = Field(default=None, max_length=64, description="Client-supplied identifier echoed in the result")
+    method: Literal["GET"] = Field(default="GET", description="HTTP method (only GET is supported)")
+    path: str = Field(
+        description="API path, e.g. /athletes/ or /teams/123/resume",
+        pattern=r"^/[A-Za-z0-9_\-./]*$",
+        max_length=256
+    )
+    params: Optional[Dict[str, Any]] = Field(default=None, description="Query parameters")
+
+    @field_validator("path")
+    @classmethod
+    def no_dot_segments(cls, path: str) -> str:
+        """Reject . and .. segments (resolved only after the batch's path checks)"""
+        if any(segment in (".", "..") for segment in path.split("/")):
+            raise ValueError("path must not contain '.' or '..' segments")
+        return path
+
+
+class BatchRequest(BaseModel):
+    """Batch of sub-requests executed concurrently"""
+    requests: List[BatchRequestItem] = Field(min_length=1, description="Sub-requests to execute")
+
+
+class BatchResponseItem(BaseModel):
+    """Result of a single sub-request"""
+    id: Optional[str] = Field(default=None, description="Identifier from the sub-request")
+    path: str = Field(description="Requested path")
+    status: int = Field(description="HTTP status code of the sub-request")
+    body: Optional[Any] = Field(default=None, description="JSON response body (null on error)")
+    error: Optional[str] = Field(default=None, description="Error detail when status >= 400")
+    elapsed_ms: float = Field(description="Time taken by the sub-request in milliseconds")
+
+
+class BatchResponse(BaseModel):
+    """Results of a batch, in request order"""
+    total: int = Field(description="Number of sub-requests")
+    succeeded: int = Field(description="Number of sub-requests with status < 400")
+    failed: int = Field(description="Number of sub-requests with status >= 400")
+    results: List[BatchResponseItem] = Field(description="Sub-request results in request order")
+
+
 # ===================================================================
 # Utility Response Models
 # ===================================================================
@@ -365,6 +471,131 @@ class HealthCheckResponse(BaseModel):
     timestamp: datetime = Field(description="Current server time")
 
 
+class LoopLagPercentiles(BaseModel):
+    """Event-loop lag percentiles in milliseconds"""
+    p50: float = Field(description="Median lag over the sample window")
+    p95: float = Field(description="95th percentile lag over the sample window")
+    p99: float = Field(description="99th percentile lag over the sample window")
+    max_window: float = Field(description="Maximum lag over the sample window")
+    max_total: float = Field(description="Maximum lag since startup")
+
+
+class LoopBlockInfo(BaseModel):
+    """Most recent blocking call detected by the watchdog"""
+    detected_at: datetime = Field(description="When the stall was detected")
+    duration_ms: Optional[float] = Field(default=None, description="Stall duration (null while still blocked)")
+    stack: List[str] = Field(description="Innermost frames of the loop thread's stack")
+
+
+class LoopMonitorResponse(BaseModel):
+    """Event-loop monitor status for this worker process"""
+    status: str = Field(description="running, blocked, disabled or not_started")
+    pid: Optional[int] = Field(default=None, description="Worker process ID that answered")
+    uptime_seconds: Optional[float] = Field(default=None, description="Seconds since the monitor started")
+    interval_ms: Optional[int] = Field(default=None, description="Lag sampling interval")
+    block_threshold_ms: Optional[int] = Field(default=None, description="Blocking-call threshold")
+    window_samples: Optional[int] = Field(default=None, description="Samples in the percentile window")
+    total_samples: Optional[int] = Field(default=None, description="Samples since startup")
+    lag_ms: Optional[LoopLagPercentiles] = Field(default=None, description="Lag percentiles")
+    blocks: int = Field(default=0, description="Stalls longer than the threshold since startup")
+    last_block: Optional[LoopBlockInfo] = Field(default=None, description="Most recent stall")
+
+
+class QueryShapeStats(BaseModel):
+    """Execution statistics for one query shape (statement text)"""
+    name: str = Field(description="Query name (e.g. athletes.list)")
+    variant: str = Field(description="Filter combination: the WHERE clause with placeholders")
+    calls: int = Field(description="Executions since startup")
+    errors: int = Field(description="Failed executions")
+    rows: int = Field(description="Rows fetched")
+    total_ms: float = Field(description="Total execute + fetch time")
+    avg_ms: float = Field(description="Average execute + fetch time")
+    max_ms: float = Field(description="Slowest execution")
+
+
+class QueryShapesResponse(BaseModel):
+    """Query shape statistics for this worker process"""
+    pid: int = Field(description="Worker process ID that answered")
+    total: int = Field(description="Number of shapes")
+    results: List[QueryShapeStats] = Field(description="Shapes, most total time first")
+
+
+class PoolWaitPercentiles(BaseModel):
+    """Connection wait-time percentiles (ms) over the last 1000 acquires"""
+    p50: float
+    p95: float
+    p99: float
+    max: float
+
+
+class PoolAdmissionStats(BaseModel):
+    """Connection admission queue counters"""
+    in_use: int = Field(description="Connections currently held by requests")
+    waiting: int = Field(description="Requests currently waiting for a connection")
+    max_waiting: int = Field(description="Deepest wait queue since startup")
+    acquired: int = Field(description="Connections handed out since startup")
+    queued: int = Field(description="Acquires that had to wait")
+    timeouts: int = Field(description="Requests that hit the acquire deadline (503)")
+    shed: int = Field(description="Requests rejected without waiting (503)")
+    shrinks: int = Field(description="Times idle connections above peak demand were closed")
+    acquire_timeout_ms: int = Field(description="Acquire deadline")
+    max_queue: int = Field(description="Wait queue limit")
+    avg_hold_ms: float = Field(description="Running average of how long a connection is held")
+    wait_ms: PoolWaitPercentiles = Field(description="Wait-time percentiles")
+
+
+class CircuitBreakerStats(BaseModel):
+    """Database circuit breaker state"""
+    state: str = Field(description="closed (queries run) or open (queries rejected with 503)")
+    consecutive_failures: int = Field(description="Database failures since the last success")
+    failure_threshold: int = Field(description="Consecutive failures that open the breaker (0: disabled)")
+    open_seconds: Optional[float] = Field(default=None, description="Seconds the breaker has been open")
+    trips: int = Field(description="Times the breaker opened since startup")
+    rejected: int = Field(description="Queries rejected while open")
+    last_error: Optional[str] = Field(default=None, description="Most recent database failure")
+
+
+class AnalyticsGateStats(BaseModel):
+    """Concurrency cap on analytics requests"""
+    limit: int = Field(description="Analytics requests allowed to run at once (ANALYTICS_POOL_FRACTION of the pool)")
+    in_use: int = Field(description="Analytics requests running")
+    waiting: int = Field(description="Analytics requests waiting for a slot")
+    admitted: int = Field(description="Analytics requests run since startup")
+    rejected: int = Field(description="Analytics requests that found no slot in time (503)")
+
+
+class ReplicaStats(BaseModel):
+    """Read replica health and load"""
+    name: str = Field(description="host:port")
+    healthy: bool = Field(description="In rotation for reads")
+    calculated_at: Optional[datetime] = Field(default=None, description="Latest calculation on the replica")
+    behind_seconds: Optional[float] = Field(
+        default=None,
+        description="Seconds the replica has lacked the primary's latest calculation"
+    )
+    reads: int = Field(description="Reads routed to the replica since startup")
+    size: int = Field(description="Open connections")
+    free: int = Field(description="Idle connections")
+    in_use: int = Field(description="Connections currently held by requests")
+    waiting: int = Field(description="Requests waiting for a connection")
+    last_error: Optional[str] = Field(default=None, description="Most recent failure")
+
+
+class PoolStatusResponse(BaseModel):
+    """Connection pool status for this worker process"""
+    pid: int = Field(description="Worker process ID that answered")
+    status: str = Field(description="active or not_initialized")
+    size: Optional[int] = Field(default=None, description="Open connections")
+    free: Optional[int] = Field(default=None, description="Idle connections")
+    min_size: Optional[int] = Field(default=None, description="Connections kept ready")
+    max_size: Optional[int] = Field(default=None, description="Maximum connections")
+    admission: Optional[PoolAdmissionStats] = Field(default=None, description="Admission queue")
+    circuit_breaker: Optional[CircuitBreakerStats] = Field(default=None, description="Circuit breaker")
+    analytics: Optional[AnalyticsGateStats] = Field(default=None, description="Analytics concurrency cap")
+    primary_reads: Optional[int] = Field(default=None, description="Reads routed to the primary since startup")
+    replicas: List[ReplicaStats] = Field(default_factory=list, description="Read replicas (DATABASE_REPLICA_HOSTS)")
+
+
 class ErrorResponse(BaseModel):
     """Error response"""
     error: str = Field(description="Error type")
@@ -455,11 +686,64 @@ class SCSComponentComparison(BaseModel):
     context: dict = Field(description="Division totals and context")
 
 
+class SCSBulkPercentiles(BaseModel):
+    """SCS component scores, ranks and percentiles for a list of athletes"""
+    season_year: int = Field(description="Season year")
+    division_code: int = Field(description="Division code")
+    gender_code: str = Field(description="Gender (M/F)")
+    total_athletes: int = Field(description="Athletes in the division")
+    scored_athletes: dict = Field(description="Athletes with a score, per component")
+    results: List[dict] = Field(description="Per athlete: score, rank and percentile for each component")
+    not_found: List[int] = Field(description="Requested handles without SCS components in the division")
+
+
+class SCSRankDiscrepancy(BaseModel):
+    """
+    XCRI Light rank vs SCS rank for one athlete.
+
+    discrepancy = xcri_rank - athlete_rank: positive when XCRI Light ranks
+    the athlete better (tactical racer), negative when SCS does
+    (statistical star).
+    """
+    athlete_hnd: int = Field(description="AthleticNet athlete handle")
+    athlete_name_first: Optional[str] = Field(default=None, description="First name")
+    athlete_name_last: Optional[str] = Field(default=None, description="Last name")
+    team_name: Optional[str] = Field(default=None, description="Team/school name")
+    athlete_rank: int = Field(description="XCRI Light rank")
+    xcri_rank: int = Field(description="SCS rank")
+    discrepancy: int = Field(description="SCS rank minus XCRI Light rank")
+    abs_discrepancy: int = Field(description="Absolute discrepancy")
+    component_discrepancies: Optional[dict] = Field(
+        default=None,
+        description="SAGA/SEWR/OSMA rank and its difference from the XCRI Light rank"
+    )
+    discrepancy_position: Optional[int] = Field(
+        default=None,
+        description="Position by absolute discrepancy within the division (1 = biggest)"
+    )
+    context: Optional[dict] = Field(default=None, description="Athletes compared and division context")
+
+
+class SCSRankDiscrepancyList(BaseModel):
+    """Athletes with the biggest XCRI Light vs SCS rank discrepancies"""
+    season_year: int = Field(description="Season year")
+    division_code: int = Field(description="Division code")
+    gender_code: str = Field(description="Gender (M/F)")
+    direction: str = Field(description="any, light (Light rank better) or scs (SCS rank better)")
+    athletes_compared: int = Field(description="Athletes with both an XCRI Light and an SCS rank")
+    limit: int = Field(description="Maximum results")
+    results: List[SCSRankDiscrepancy] = Field(description="Athletes by discrepancy size, biggest first")
+
+
 class SCSComponentDistribution(BaseModel):
     """Distribution statistics for an SCS component"""
     component: str = Field(description="Component name (SAGA, SEWR, OSMA, XCRI)")
     statistics: dict = Field(description="Min, max, mean, std, count")
-    percentiles: dict = Field(description="25th, 50th, 75th percentiles")
+    percentiles: dict = Field(description="Requested percentiles (default 25th, 50th, 75th)")
+    histogram: List[dict] = Field(
+        default_factory=list,
+        description="Histogram bins: lower and upper bound and athlete count"
+    )
     context: dict = Field(description="Season, division, gender context")
 
 
@@ -912,3 +1196,32 @@ class CommonOpponentsResponse(BaseModel):
     team_b_record_vs_common: str = Field(description="Team B record vs common opponents (e.g., '4-3')")
 
     common_opponents: List[CommonOpponent] = Field(description="List of common opponents with records")
+
+
+# ===================================================================
+# Team Profile Models
+# ===================================================================
+
+class TeamProfileResume(SeasonResume):
+    """Season resume within a team profile (HTML only when requested)"""
+    season_html: Optional[str] = Field(
+        default=None,
+        description="Season resume HTML content (only with include_resume_html=true)"
+    )
+
+
+class TeamProfileResponse(BaseModel):
+    """
+    Everything the team profile page shows, in one document.
+
+    Combines the team ranking, roster, season resume and Team Knockout
+    ranking; resume and knockout are null when the team has none.
+    """
+    team: TeamRanking = Field(description="Team ranking")
+    roster: List[AthleteRanking] = Field(description="Roster sorted by athlete rank")
+    roster_total: int = Field(description="Number of athletes on the roster")
+    resume: Optional[TeamProfileResume] = Field(default=None, description="Season resume")
+    knockout: Optional[TeamKnockoutRanking] = Field(
+        default=None,
+        description="Team Knockout ranking in the team's division"
+    )
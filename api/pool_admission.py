@@ -0,0 +1,277 @@
+"""
+XCRI Rankings API - Connection Pool Admission
+
+Wraps connection acquisition from the per-worker aiomysql pool with an
+admission queue so a burst degrades into fast 503s instead of a pile-up of
+requests waiting on the pool for as long as their clients will wait:
+
+- Acquire deadline: a request waits at most DATABASE_POOL_ACQUIRE_TIMEOUT_MS
+  for a connection, then gets 503 with Retry-After.
+- Load shedding: a request that would queue behind
+  DATABASE_POOL_MAX_QUEUE others, or whose expected wait (queue position x
+  average connection hold time / connections) already exceeds the deadline,
+  is rejected immediately with 503 and Retry-After.
+- Queue depth, wait-time percentiles, timeouts and sheds are reported by
+  GET /health/pool.
+- Sizing: the pool opens connections on demand up to DATABASE_POOL_MAXSIZE.
+  Every DATABASE_POOL_SHRINK_INTERVAL_SECONDS the peak number of connections
+  in use is compared with the open connections; idle connections above
+  the peak (and above DATABASE_POOL_MINSIZE) are closed, so a worker holds
+  connections only while there is demand for them and keeps the rest warm.
+
+Waiters are served first come, first served.
+
+Usage (database_async.get_db):
+    async with pool_admission.acquire(pool) as conn:
+        ...
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from fastapi import HTTPException, status
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest connection hold time in the running average
+HOLD_EWMA_ALPHA = 0.1
+
+
+class PoolExhausted(HTTPException):
+    """503 raised when no connection can be had within the wait budget"""
+
+    def __init__(self, detail: str, retry_after: int):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
+def _percentile(ordered: List[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class PoolAdmission:
+    """FIFO admission queue with a deadline in front of a connection pool"""
+
+    def __init__(self):
+        self._in_use = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._wait_ms: Deque[float] = deque(maxlen=1000)
+        self._hold_avg = 0.0
+
+        self._acquired = 0
+        self._queued = 0
+        self._timeouts = 0
+        self._shed = 0
+        self._max_waiting = 0
+        self._peak_in_use = 0
+        self._shrinks = 0
+
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def in_use(self) -> int:
+        return self._in_use
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def _limit(self, pool) -> int:
+        return pool.maxsize
+
+    def _retry_after(self, pool) -> int:
+        """Seconds until the current queue has likely drained"""
+        expected = (len(self._waiters) + 1) * self._hold_avg / self._limit(pool)
+        return max(1, math.ceil(expected))
+
+    def _wake(self, pool) -> None:
+        """Hand free slots to waiters in arrival order"""
+        while self._waiters and self._in_use < self._limit(pool):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_use += 1
+                waiter.set_result(None)
+
+    def _release(self, pool) -> None:
+        self._in_use -= 1
+        self._wake(pool)
+
+    async def _admit(self, pool, timeout: float) -> None:
+        """Take a slot, queueing until timeout when all slots are in use"""
+        limit = self._limit(pool)
+        if self._in_use < limit and not self._waiters:
+            self._in_use += 1
+            return
+
+        waiting = len(self._waiters)
+        expected = (waiting + 1) * self._hold_avg / limit
+        if waiting >= settings.database_pool_max_queue or expected > timeout:
+            self._shed += 1
+            raise PoolExhausted(
+                f"Database busy: {waiting} request(s) already waiting for a connection",
+                self._retry_after(pool)
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._queued += 1
+        self._max_waiting = max(self._max_waiting, len(self._waiters))
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except BaseException as e:
+            # A slot may have been handed over just as the wait ended
+            if waiter.done() and not waiter.cancelled():
+                self._release(pool)
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if not isinstance(e, asyncio.TimeoutError):
+                raise
+            self._timeouts += 1
+            raise PoolExhausted(
+                f"Database busy: no connection available within {timeout * 1000:.0f}ms",
+                self._retry_after(pool)
+            )
+
+    @asynccontextmanager
+    async def acquire(self, pool):
+        """
+        Connection from pool, admitted within the acquire deadline.
+
+        Raises:
+            PoolExhausted: When the request is shed or the deadline passes
+        """
+        timeout = settings.database_pool_acquire_timeout_ms / 1000
+        started = time.perf_counter()
+        await self._admit(pool, timeout)
+
+        try:
+            remaining = max(0.001, timeout - (time.perf_counter() - started))
+            try:
+                conn = await asyncio.wait_for(pool.acquire(), remaining)
+            except asyncio.TimeoutError:
+                self._timeouts += 1
+                raise PoolExhausted(
+                    f"Database busy: no connection available within {timeout * 1000:.0f}ms",
+                    self._retry_after(pool)
+                )
+
+            acquired = time.perf_counter()
+            self._acquired += 1
+            self._wait_ms.append((acquired - started) * 1000)
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+            try:
+                yield conn
+            finally:
+                pool.release(conn)
+                held = time.perf_counter() - acquired
+                self._hold_avg += HOLD_EWMA_ALPHA * (held - self._hold_avg)
+        finally:
+            self._release(pool)
+
+    # ---------------------------------------------------------------
+    # Pool sizing
+    # ---------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, get_pool: Callable[[], Any]) -> None:
+        """Start the periodic shrink check for the pool returned by get_pool"""
+        if self.running or settings.database_pool_shrink_interval_seconds <= 0:
+            return
+        self._task = asyncio.create_task(self._run(get_pool))
+        logger.info(
+            f"Pool sizing started (shrink check every "
+            f"{settings.database_pool_shrink_interval_seconds}s)"
+        )
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self, get_pool: Callable[[], Any]) -> None:
+        self._peak_in_use = self._in_use
+        while True:
+            await asyncio.sleep(settings.database_pool_shrink_interval_seconds)
+            pool = get_pool()
+            if pool is None:
+                continue
+            try:
+                await self._shrink(pool)
+            except Exception as e:
+                logger.warning(f"Pool shrink check failed: {e}")
+
+    async def _shrink(self, pool) -> None:
+        """Close idle connections above the interval's peak demand"""
+        peak = self._peak_in_use
+        self._peak_in_use = self._in_use
+        target = max(pool.minsize, peak)
+        if pool.size <= target or pool.freesize == 0 or self._waiters:
+            return
+
+        before = pool.size
+        closed = 0
+        # Take surplus idle connections out of the pool and close them;
+        # a closed connection is dropped on release
+        for _ in range(min(pool.freesize, pool.size - target)):
+            if pool.freesize == 0:
+                break
+            conn = await pool.acquire()
+            conn.close()
+            pool.release(conn)
+            closed += 1
+        if not closed:
+            return
+
+        self._shrinks += 1
+        logger.info(
+            f"Pool shrunk: {before} -> {pool.size} open connections "
+            f"(peak in use {peak} over the last interval)"
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        ordered = sorted(self._wait_ms)
+        return {
+            "in_use": self._in_use,
+            "waiting": len(self._waiters),
+            "max_waiting": self._max_waiting,
+            "acquired": self._acquired,
+            "queued": self._queued,
+            "timeouts": self._timeouts,
+            "shed": self._shed,
+            "shrinks": self._shrinks,
+            "acquire_timeout_ms": settings.database_pool_acquire_timeout_ms,
+            "max_queue": settings.database_pool_max_queue,
+            "avg_hold_ms": round(self._hold_avg * 1000, 2),
+            "wait_ms": {
+                "p50": round(_percentile(ordered, 50), 2),
+                "p95": round(_percentile(ordered, 95), 2),
+                "p99": round(_percentile(ordered, 99), 2),
+                "max": round(ordered[-1], 2) if ordered else 0.0,
+            },
+        }
+
+
+# Global admission queue (one per worker)
+pool_admission = PoolAdmission()
@@ -0,0 +1,372 @@
+"""
+XCRI Rankings API - Per-Request Profiling
+
+Profiles a single request in place when it carries the admin token
+(PROFILING_TOKEN) in the X-Profile-Token header or the profile_token query
+parameter. Requests without the token pay one header lookup.
+
+For a profiled request:
+- The configured profiler (cProfile, or pyinstrument if installed) runs
+  around the request.
+- get_db_cursor() hands out a ProfiledCursor that times every execute and
+  fetch, plus the wait for a pool connection.
+- The response gets a Server-Timing header splitting the total into SQL,
+  pool wait, row-dict construction, Pydantic validation and JSON encoding
+  (phases other than SQL need cProfile), and an X-Profile-Id header.
+- With X-Profile-Output: report (or profile_output=report) the body is
+  replaced by the text report; otherwise the original response is returned.
+- With PROFILING_DIR set, the report (and raw .prof stats for cProfile) is
+  written there.
+
+The profiler sees the whole thread, so concurrent requests handled by the
+same worker while the profiled one is waiting on MySQL show up in its
+function table. Only one request per worker is profiled at a time.
+"""
+
+import cProfile
+import hmac
+import io
+import logging
+import os
+import pstats
+import re
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from config import settings
+
+try:
+    import pyinstrument
+except ImportError:  # optional: pip install pyinstrument
+    pyinstrument = None
+
+logger = logging.getLogger(__name__)
+
+# Function-name fragments (pstats "file:line(function)") for each phase
+PHASE_FUNCTIONS = {
+    "rows": ("aiomysql/cursors.py", "_conv_row"),
+    "validate": ("fastapi/routing.py", "serialize_response"),
+    "encode": ("starlette/responses.py", "render"),
+}
+
+
+# ===================================================================
+# Request Profile and SQL Timing
+# ===================================================================
+
+class RequestProfile:
+    """SQL timings and profiler output for one request"""
+
+    def __init__(self, method: str, path: str, query: str):
+        self.id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{int(time.perf_counter() * 1000) % 100000:05d}"
+        self.method = method
+        self.path = path
+        self.query = query
+        self.queries: List[Dict[str, Any]] = []
+        self.pool_wait = 0.0
+        self.total = 0.0
+        self.status: Optional[int] = None
+        self.phases: Dict[str, float] = {}
+        self.function_table = ""
+        self.raw_stats: Optional[pstats.Stats] = None
+
+    @property
+    def sql_time(self) -> float:
+        return sum(q["execute"] + q["fetch"] for q in self.queries)
+
+    @property
+    def unaccounted(self) -> float:
+        """Time outside SQL, pool wait, validation and encoding"""
+        # Row dicts are built by DictCursor inside execute, so already part of sql
+        accounted = self.sql_time + self.pool_wait + self.phases.get("validate", 0.0) + self.phases.get("encode", 0.0)
+        return max(0.0, self.total - accounted)
+
+    def record_query(self, sql: str, execute: float) -> Dict[str, Any]:
+        entry = {"sql": " ".join(sql.split())[:300], "execute": execute, "fetch": 0.0, "rows": None}
+        self.queries.append(entry)
+        return entry
+
+    def server_timing(self) -> str:
+        """Server-Timing header value (durations in ms)"""
+        parts = [
+            ("total", self.total),
+            ("sql", self.sql_time),
+            ("db-wait", self.pool_wait),
+        ]
+        parts += [(name, self.phases[name]) for name in ("rows", "validate", "encode") if name in self.phases]
+        if self.phases:
+            parts.append(("app", self.unaccounted))
+        return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in parts)
+
+    def report(self) -> str:
+        """Plain-text profile report"""
+        target = f"{self.path}?{self.query}" if self.query else self.path
+        rows = sum(q["rows"] or 0 for q in self.queries)
+        lines = [
+            f"Profile {self.id}: {self.method} {target}",
+            f"Status {self.status}, total {self.total * 1000:.1f} ms, engine {engine_name()}",
+            "",
+            "Phases (ms):",
+            f"  sql          {self.sql_time * 1000:10.1f}  ({len(self.queries)} queries, {rows} rows)",
+            f"  pool wait    {self.pool_wait * 1000:10.1f}",
+        ]
+        labels = {"rows": "  row dicts", "validate": "validation", "encode": "json encode"}
+        for name, label in labels.items():
+            if name in self.phases:
+                lines.append(f"  {label:<12} {self.phases[name] * 1000:10.1f}")
+        if self.phases:
+            lines.append(f"  {'other':<12} {self.unaccounted * 1000:10.1f}")
+
+        lines += ["", "SQL:"]
+        for i, q in enumerate(self.queries, 1):
+            lines.append(
+                f"  #{i:<3} execute {q['execute'] * 1000:8.1f} ms  fetch {q['fetch'] * 1000:7.1f} ms  "
+                f"rows {q['rows'] if q['rows'] is not None else '-':>6}  {q['sql']}"
+            )
+        if not self.queries:
+            lines.append("  (no queries)")
+
+        lines += ["", self.function_table]
+        return "\n".join(lines)
+
+
+_current: ContextVar[Optional[RequestProfile]] = ContextVar("xcri_request_profile", default=None)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    """Profile of the request being handled, or None when not profiling"""
+    return _current.get()
+
+
+class ProfiledCursor:
+    """Cursor proxy that records execute/fetch timings on a RequestProfile"""
+
+    def __init__(self, cursor, profile: RequestProfile):
+        self._cursor = cursor
+        self._profile = profile
+        self._entry: Optional[Dict[str, Any]] = None
+
+    async def execute(self, query, args=None):
+        start = time.perf_counter()
+        try:
+            return await self._cursor.execute(query, args)
+        finally:
+            self._entry = self._profile.record_query(query, time.perf_counter() - start)
+
+    async def fetchone(self):
+        row = await self._fetch(self._cursor.fetchone())
+        self._count(0 if row is None else 1)
+        return row
+
+    async def fetchmany(self, size=None):
+        rows = await self._fetch(self._cursor.fetchmany(size))
+        self._count(len(rows))
+        return rows
+
+    async def fetchall(self):
+        rows = await self._fetch(self._cursor.fetchall())
+        self._count(len(rows))
+        return rows
+
+    async def _fetch(self, pending):
+        start = time.perf_counter()
+        result = await pending
+        if self._entry is not None:
+            self._entry["fetch"] += time.perf_counter() - start
+        return result
+
+    def _count(self, rows: int) -> None:
+        if self._entry is not None:
+            self._entry["rows"] = (self._entry["rows"] or 0) + rows
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+# ===================================================================
+# Profilers
+# ===================================================================
+
+def engine_name() -> str:
+    if settings.profiling_engine == "pyinstrument" and pyinstrument is not None:
+        return "pyinstrument"
+    return "cprofile"
+
+
+def _phase_times(stats: pstats.Stats) -> Dict[str, float]:
+    """Cumulative time of the functions that mark each phase"""
+    phases = {name: 0.0 for name in PHASE_FUNCTIONS}
+    for (filename, _line, function), (_cc, _nc, _tt, cumtime, _callers) in stats.stats.items():
+        normalized = filename.replace(os.sep, "/")
+        for name, (file_fragment, function_name) in PHASE_FUNCTIONS.items():
+            if function == function_name and normalized.endswith(file_fragment):
+                # Overrides calling super() are nested: keep the outermost
+                phases[name] = max(phases[name], cumtime)
+    return phases
+
+
+class _CProfileRunner:
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+
+    def start(self) -> None:
+        self.profiler.enable()
+
+    def stop(self, profile: RequestProfile) -> None:
+        self.profiler.disable()
+        stats = pstats.Stats(self.profiler)
+        profile.raw_stats = stats
+        profile.phases = _phase_times(stats)
+
+        out = io.StringIO()
+        stats.stream = out
+        stats.sort_stats("cumulative").print_stats(settings.profiling_top)
+        # Drop pstats' banner lines, keep the table
+        table = out.getvalue()
+        profile.function_table = table[table.find("   ncalls"):] if "   ncalls" in table else table
+
+
+class _PyinstrumentRunner:
+    def __init__(self):
+        self.profiler = pyinstrument.Profiler(async_mode="enabled")
+
+    def start(self) -> None:
+        self.profiler.start()
+
+    def stop(self, profile: RequestProfile) -> None:
+        self.profiler.stop()
+        profile.function_table = self.profiler.output_text(unicode=True, color=False)
+
+
+# ===================================================================
+# Middleware
+# ===================================================================
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles requests carrying the admin token.
+
+    The profiled response is buffered so the Server-Timing header can
+    include the time spent rendering and sending the body.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.busy = False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.profiling_token:
+            await self.app(scope, receive, send)
+            return
+
+        headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope.get("headers", [])}
+        query_string = scope.get("query_string", b"").decode("latin-1")
+        token, output = self._requested(headers, query_string)
+
+        if token is None:
+            await self.app(scope, receive, send)
+            return
+        if not hmac.compare_digest(token, settings.profiling_token):
+            logger.warning(f"Profiling requested with an invalid token for {scope.get('path')}")
+            await self.app(scope, receive, send)
+            return
+        if self.busy:
+            await self.app(scope, receive, self._with_headers(send, [(b"x-profile-skipped", b"busy")]))
+            return
+
+        await self._profile(scope, receive, send, query_string, output)
+
+    @staticmethod
+    def _requested(headers: Dict[str, str], query_string: str) -> Tuple[Optional[str], str]:
+        query = parse_qs(query_string)
+        token = headers.get("x-profile-token") or (query.get("profile_token") or [None])[0]
+        output = headers.get("x-profile-output") or (query.get("profile_output") or ["headers"])[0]
+        return token, output
+
+    @staticmethod
+    def _with_headers(send, extra: List[Tuple[bytes, bytes]]):
+        async def wrapped(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": list(message.get("headers", [])) + extra}
+            await send(message)
+        return wrapped
+
+    async def _profile(self, scope, receive, send, query_string: str, output: str) -> None:
+        # Keep the token out of reports and stored file names
+        shown_query = re.sub(r"(^|&)profile_(token|output)=[^&]*", "", query_string).lstrip("&")
+        profile = RequestProfile(scope.get("method", "GET"), scope.get("path", ""), shown_query)
+        runner = _PyinstrumentRunner() if engine_name() == "pyinstrument" else _CProfileRunner()
+
+        start_message: Optional[Dict[str, Any]] = None
+        body: List[bytes] = []
+
+        async def buffer(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+            elif message["type"] == "http.response.body":
+                body.append(message.get("body", b""))
+
+        self.busy = True
+        token = _current.set(profile)
+        started = time.perf_counter()
+        runner.start()
+        try:
+            await self.app(scope, receive, buffer)
+        finally:
+            runner.stop(profile)
+            profile.total = time.perf_counter() - started
+            _current.reset(token)
+            self.busy = False
+
+        profile.status = start_message["status"] if start_message else None
+        report = profile.report()
+        logger.info(
+            f"Profiled {profile.method} {profile.path}: {profile.total * 1000:.1f}ms "
+            f"({len(profile.queries)} queries, sql {profile.sql_time * 1000:.1f}ms) [{profile.id}]"
+        )
+
+        extra = [
+            (b"server-timing", profile.server_timing().encode("latin-1")),
+            (b"x-profile-id", profile.id.encode("latin-1")),
+        ]
+        stored = self._store(profile, report)
+        if stored:
+            extra.append((b"x-profile-file", stored.encode("latin-1")))
+
+        if output == "report" or start_message is None:
+            payload = report.encode("utf-8")
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/plain; charset=utf-8"),
+                    (b"content-length", str(len(payload)).encode("latin-1")),
+                ] + extra,
+            })
+            await send({"type": "http.response.body", "body": payload})
+            return
+
+        await send({**start_message, "headers": list(start_message.get("headers", [])) + extra})
+        await send({"type": "http.response.body", "body": b"".join(body)})
+
+    @staticmethod
+    def _store(profile: RequestProfile, report: str) -> Optional[str]:
+        """Write the report (and cProfile stats) to PROFILING_DIR"""
+        if not settings.profiling_dir:
+            return None
+        try:
+            os.makedirs(settings.profiling_dir, exist_ok=True)
+            slug = re.sub(r"[^A-Za-z0-9]+", "-", profile.path).strip("-") or "root"
+            base = os.path.join(settings.profiling_dir, f"{profile.id}-{slug}")
+            with open(f"{base}.txt", "w") as f:
+                f.write(report)
+            if profile.raw_stats is not None:
+                profile.raw_stats.dump_stats(f"{base}.prof")
+            return f"{base}.txt"
+        except OSError as e:
+            logger.warning(f"Could not store profile {profile.id}: {e}")
+            return None
@@ -0,0 +1,124 @@
+"""
+XCRI Rankings API - Query Shape Registry
+
+A query shape is one parameterized statement text: a service query with a
+given combination of optional filters. Services build the WHERE clause for a
+request (placeholders only, no values) and ask the registry for the shape
+keyed by that text; the full statement is built the first time the
+combination is seen and reused afterwards, so every request with the same
+filters sends byte-identical SQL.
+
+Each shape keeps call counts, rows and execute+fetch timings, served by
+GET /health/queries to show which query variants cost the most.
+
+aiomysql only speaks MySQL's text protocol, so statements are not prepared
+server-side; the registry removes the per-request statement building and
+gives one stable statement per filter combination (one digest in
+performance_schema).
+"""
+
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Shapes are keyed by code-built WHERE texts, so the set is small; the cap
+# only guards against a caller accidentally keying on values
+MAX_SHAPES = 1000
+
+
+class QueryShape:
+    """One statement text with its execution statistics"""
+
+    def __init__(self, name: str, variant: str, sql: str):
+        self.name = name
+        self.variant = variant
+        self.sql = sql
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    async def fetchall(self, cursor, params: Sequence[Any]) -> List[Dict[str, Any]]:
+        """Execute with params and fetch all rows"""
+        started = time.perf_counter()
+        try:
+            await cursor.execute(self.sql, params)
+            rows = await cursor.fetchall()
+        except Exception:
+            self.errors += 1
+            raise
+        self._record(started, len(rows))
+        return rows
+
+    async def fetchone(self, cursor, params: Sequence[Any]) -> Optional[Dict[str, Any]]:
+        """Execute with params and fetch the first row"""
+        started = time.perf_counter()
+        try:
+            await cursor.execute(self.sql, params)
+            row = await cursor.fetchone()
+        except Exception:
+            self.errors += 1
+            raise
+        self._record(started, 1 if row else 0)
+        return row
+
+    def _record(self, started: float, rows: int) -> None:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.calls += 1
+        self.rows += rows
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "variant": self.variant,
+            "calls": self.calls,
+            "errors": self.errors,
+            "rows": self.rows,
+            "total_ms": round(self.total_ms, 2),
+            "avg_ms": round(self.total_ms / self.calls, 2) if self.calls else 0.0,
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+class QueryRegistry:
+    """Statement texts per (query name, filter combination)"""
+
+    def __init__(self):
+        self._shapes: Dict[Tuple[str, str], QueryShape] = {}
+
+    def shape(self, name: str, variant: str, build: Callable[[], str]) -> QueryShape:
+        """
+        Shape for a query name and filter combination, built on first use.
+
+        Args:
+            name: Query name (e.g. 'athletes.list')
+            variant: Text identifying the filter combination, normally the
+                WHERE clause with placeholders (never request values)
+            build: Returns the full statement text for this variant
+        """
+        key = (name, variant)
+        shape = self._shapes.get(key)
+        if shape is None:
+            shape = QueryShape(name, variant, build())
+            if len(self._shapes) < MAX_SHAPES:
+                self._shapes[key] = shape
+            else:
+                logger.warning(f"Query shape registry full; not caching {name}: {variant}")
+        return shape
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Per-shape statistics, most total time first"""
+        return sorted(
+            (shape.get_stats() for shape in self._shapes.values()),
+            key=lambda s: s["total_ms"],
+            reverse=True
+        )
+
+
+# Global registry (one per worker)
+query_registry = QueryRegistry()
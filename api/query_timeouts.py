@@ -0,0 +1,192 @@
+"""
+XCRI Rankings API - Query Timeouts and Cancellation
+
+Bounds how long a request's queries may hold a pooled connection:
+
+- Endpoint classes: each route declares its class (list, detail or
+  analytics) with a router- or route-level dependency,
+  dependencies=[query_timeout("detail")]. The class selects the timeout
+  (QUERY_TIMEOUT_LIST_MS, QUERY_TIMEOUT_DETAIL_MS,
+  QUERY_TIMEOUT_ANALYTICS_MS; 0 disables).
+- Server side: SELECT statements get a MAX_EXECUTION_TIME optimizer hint, so
+  MySQL aborts them itself (MariaDB ignores the hint as a comment).
+- Client side: an execute still running one second after the timeout is
+  cancelled and a KILL QUERY is sent for its server thread (covers MariaDB
+  and statements the hint does not apply to). Either way the request gets
+  504.
+- Client disconnects: CancelOnDisconnectMiddleware cancels a GET request
+  whose client went away before the response started. A query in progress
+  is killed the same way and aiomysql closes the interrupted connection, so
+  the pool slot is released at once instead of after the query completes.
+
+Queries run outside a request (startup, health checks) have no timeout.
+Background work started by a request (cache builds) inherits the
+request's class.
+"""
+
+import asyncio
+import logging
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Optional, Set
+
+import pymysql
+from fastapi import Depends, HTTPException, status
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+ENDPOINT_CLASSES = ("list", "detail", "analytics")
+
+# Client-side allowance beyond the server-side limit before cancelling
+CLIENT_GRACE_SECONDS = 1.0
+
+# MySQL ER_QUERY_TIMEOUT, MariaDB ER_STATEMENT_TIMEOUT
+TIMEOUT_ERROR_CODES = (3024, 1969)
+
+_endpoint_class: ContextVar[Optional[str]] = ContextVar("xcri_endpoint_class", default=None)
+
+# Fire-and-forget KILL QUERY tasks (referenced until done)
+_kill_tasks: Set[asyncio.Task] = set()
+
+
+class QueryTimeout(HTTPException):
+    """504 raised when a query exceeds its endpoint class timeout"""
+
+    def __init__(self, timeout_ms: int):
+        super().__init__(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=f"Query exceeded the {timeout_ms}ms time limit"
+        )
+
+
+def query_timeout(endpoint_class: str):
+    """Route dependency selecting the query timeout class for a request"""
+    if endpoint_class not in ENDPOINT_CLASSES:
+        raise ValueError(f"Unknown endpoint class: {endpoint_class} (expected one of {ENDPOINT_CLASSES})")
+
+    async def set_endpoint_class() -> None:
+        _endpoint_class.set(endpoint_class)
+
+    # Read by route_endpoint_class() before the request reaches the route
+    set_endpoint_class.endpoint_class = endpoint_class
+    return Depends(set_endpoint_class)
+
+
+def route_endpoint_class(route) -> Optional[str]:
+    """Endpoint class declared on a route (the last one wins, as at runtime)"""
+    endpoint_class = None
+    for dependency in getattr(route, "dependencies", None) or []:
+        endpoint_class = getattr(dependency.dependency, "endpoint_class", endpoint_class)
+    return endpoint_class
+
+
+def current_timeout_ms() -> Optional[int]:
+    """Query timeout of the current request's endpoint class (None: unlimited)"""
+    endpoint_class = _endpoint_class.get()
+    if endpoint_class is None:
+        return None
+    timeout_ms = getattr(settings, f"query_timeout_{endpoint_class}_ms")
+    return timeout_ms or None
+
+
+def with_execution_hint(query: str, timeout_ms: int) -> str:
+    """Add a MAX_EXECUTION_TIME hint to a SELECT statement"""
+    stripped = query.lstrip()
+    if stripped[:6].upper() != "SELECT":
+        return query
+    return f"SELECT /*+ MAX_EXECUTION_TIME({timeout_ms}) */{stripped[6:]}"
+
+
+class TimedCursor:
+    """Cursor proxy enforcing a query timeout, killing cancelled queries"""
+
+    def __init__(self, cursor, timeout_ms: int, kill: Callable[[], Awaitable[None]]):
+        self._cursor = cursor
+        self._timeout_ms = timeout_ms
+        self._kill = kill
+
+    async def execute(self, query, args=None):
+        try:
+            return await asyncio.wait_for(
+                self._cursor.execute(with_execution_hint(query, self._timeout_ms), args),
+                self._timeout_ms / 1000 + CLIENT_GRACE_SECONDS
+            )
+        except asyncio.TimeoutError:
+            self._schedule_kill()
+            raise QueryTimeout(self._timeout_ms)
+        except asyncio.CancelledError:
+            self._schedule_kill()
+            raise
+        except pymysql.err.OperationalError as e:
+            if e.args and e.args[0] in TIMEOUT_ERROR_CODES:
+                raise QueryTimeout(self._timeout_ms)
+            raise
+
+    def _schedule_kill(self) -> None:
+        task = asyncio.get_running_loop().create_task(self._kill())
+        _kill_tasks.add(task)
+        task.add_done_callback(_kill_tasks.discard)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class CancelOnDisconnectMiddleware:
+    """Cancel GET requests whose client disconnects before the response starts"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("method") != "GET" or not settings.cancel_on_disconnect:
+            await self.app(scope, receive, send)
+            return
+
+        # A GET has no body: take the request message here and replay it to
+        # the app, then keep listening for the disconnect
+        request_message = await receive()
+        if request_message["type"] == "http.disconnect":
+            return
+
+        disconnected = asyncio.Event()
+        replayed = False
+        response_started = False
+
+        async def app_receive():
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return request_message
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def app_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        async def watch_disconnect():
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    disconnected.set()
+                    return
+
+        app_task = asyncio.ensure_future(self.app(scope, app_receive, app_send))
+        watcher = asyncio.ensure_future(watch_disconnect())
+        try:
+            await asyncio.wait({app_task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+            if not app_task.done() and not response_started:
+                logger.info(f"Client disconnected, cancelling {scope['path']}")
+                app_task.cancel()
+            try:
+                await app_task
+            except asyncio.CancelledError:
+                if not disconnected.is_set():
+                    raise
+        finally:
+            watcher.cancel()
+            if not app_task.done():
+                app_task.cancel()
@@ -0,0 +1,248 @@
+"""
+XCRI Rankings API - Rate Limiting
+
+Token buckets kept in a local SQLite file (RATE_LIMIT_STORE_PATH) so every
+uvicorn worker on the host enforces the same budget:
+
+- Buckets: a Limit allows `capacity` units per `per_seconds`, refilled
+  continuously. A key (client IP, route) holds one row per limit: tokens
+  left and when they were counted; O(1) storage per active key.
+- Hits: RateLimiter.hit() refills and charges all of a key's limits in one
+  transaction, or charges none and returns the seconds until the request
+  would fit. A rejected request costs nothing.
+- Eviction: a row is due for deletion once its bucket would be full again
+  (expires_at); a full bucket and a missing row mean the same thing, so
+  eviction loses nothing. Expired rows are purged every
+  RATE_LIMIT_PURGE_INTERVAL_SECONDS, which bounds the file to the keys seen
+  within one refill period.
+- Failures: if the store cannot be read (locked, disk full), requests are
+  allowed and a warning is logged; rate limiting never takes the API down.
+  A write lock held by another worker is waited on for at most
+  BUSY_TIMEOUT_SECONDS, so contention fails open instead of queueing
+  requests (and to_thread workers) behind it.
+
+Usage:
+    feedback_limiter = RateLimiter("feedback", [Limit(3, 3600), Limit(10, 86400)])
+    await feedback_limiter.check(client_ip)   # raises RateLimited (429)
+"""
+
+import asyncio
+import logging
+import math
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException, status
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_limits (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_rate_limits_expires ON rate_limits (expires_at);
+"""
+
+# Longest wait for another worker's write lock; a charge takes well under 1ms
+BUSY_TIMEOUT_SECONDS = 0.05
+
+
+class RateLimited(HTTPException):
+    """429 raised when a key has used up one of its limits"""
+
+    def __init__(self, retry_after: float, detail: str = "Rate limit exceeded. Please try again later."):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+        )
+
+
+@dataclass(frozen=True)
+class Limit:
+    """Token bucket: capacity units per per_seconds, refilled continuously"""
+    capacity: float
+    per_seconds: float
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.per_seconds
+
+    @property
+    def name(self) -> str:
+        return f"{self.capacity:g}/{self.per_seconds:g}s"
+
+
+class RateLimitStore:
+    """SQLite bucket storage shared by all workers, with TTL eviction"""
+
+    def __init__(self):
+        self._path: Optional[str] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._purged = 0
+        self._errors = 0
+
+    # ---------------------------------------------------------------
+    # Storage (blocking; called through asyncio.to_thread)
+    # ---------------------------------------------------------------
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the store on first use (caller holds the lock)"""
+        if self._conn is None:
+            self._path = settings.rate_limit_store_path
+            conn = sqlite3.connect(self._path, timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def take(self, buckets: Dict[str, Limit], cost: float, now: float) -> Optional[float]:
+        """
+        Charge cost to every bucket, or to none.
+
+        Returns:
+            None when charged, else seconds until all buckets can pay
+        """
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                levels = {}
+                wait = 0.0
+                for key, limit in buckets.items():
+                    row = conn.execute(
+                        "SELECT tokens, updated_at FROM rate_limits WHERE key = ?", (key,)
+                    ).fetchone()
+                    tokens = limit.capacity
+                    if row is not None:
+                        tokens = min(limit.capacity, row[0] + max(0.0, now - row[1]) * limit.rate)
+                    levels[key] = tokens
+                    if tokens < cost:
+                        # A cost above capacity never fits; report a full period
+                        shortfall = min(cost, limit.capacity) - tokens
+                        wait = max(wait, limit.per_seconds if cost > limit.capacity else shortfall / limit.rate)
+
+                if wait > 0:
+                    conn.execute("ROLLBACK")
+                    return wait
+
+                conn.executemany(
+                    "INSERT OR REPLACE INTO rate_limits (key, tokens, updated_at, expires_at) VALUES (?, ?, ?, ?)",
+                    [
+                        (key, levels[key] - cost, now, now + (limit.capacity - levels[key] + cost) / limit.rate)
+                        for key, limit in buckets.items()
+                    ]
+                )
+                conn.execute("COMMIT")
+                return None
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _purge(self, now: float) -> int:
+        with self._lock:
+            cursor = self._connection().execute("DELETE FROM rate_limits WHERE expires_at < ?", (now,))
+            return cursor.rowcount
+
+    def _count(self) -> int:
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM rate_limits").fetchone()[0]
+
+    def _close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ---------------------------------------------------------------
+    # Async API
+    # ---------------------------------------------------------------
+
+    async def take_async(self, buckets: Dict[str, Limit], cost: float) -> Optional[float]:
+        """take() off the event loop; allows the request if the store fails"""
+        try:
+            return await asyncio.to_thread(self.take, buckets, cost, time.time())
+        except Exception as e:
+            self._errors += 1
+            logger.warning(f"Rate limit store unavailable, allowing request: {e}")
+            return None
+
+    def start(self) -> None:
+        """Start purging expired buckets"""
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.rate_limit_purge_interval_seconds)
+            try:
+                self._purged += await asyncio.to_thread(self._purge, time.time())
+            except Exception as e:
+                logger.warning(f"Rate limit purge failed: {e}")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.to_thread(self._close)
+
+    async def get_stats(self) -> Dict[str, Any]:
+        try:
+            keys = await asyncio.to_thread(self._count)
+        except Exception:
+            keys = None
+        return {"keys": keys, "purged": self._purged, "errors": self._errors}
+
+
+# Global store (one connection per worker, one file per host)
+rate_limit_store = RateLimitStore()
+
+
+class RateLimiter:
+    """Named set of limits applied per key (usually the client IP)"""
+
+    def __init__(self, name: str, limits: List[Limit], store: RateLimitStore = rate_limit_store):
+        self.name = name
+        self.limits = limits
+        self._store = store
+        self.allowed = 0
+        self.limited = 0
+
+    def _buckets(self, key: str) -> Dict[str, Limit]:
+        return {f"{self.name}:{limit.name}:{key}": limit for limit in self.limits}
+
+    async def hit(self, key: str, cost: float = 1) -> Optional[float]:
+        """Charge a request; None if allowed, else seconds until it would be"""
+        retry_after = await self._store.take_async(self._buckets(key), cost)
+        if retry_after is None:
+            self.allowed += 1
+        else:
+            self.limited += 1
+        return retry_after
+
+    async def check(self, key: str, cost: float = 1) -> None:
+        """
+        Charge a request or reject it.
+
+        Raises:
+            RateLimited: When any of the key's limits is used up
+        """
+        retry_after = await self.hit(key, cost)
+        if retry_after is not None:
+            raise RateLimited(retry_after)
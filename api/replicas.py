@@ -0,0 +1,222 @@
+"""
+XCRI Rankings API - Read Replica Routing
+
+Spreads read queries over the primary and the read replicas listed in
+DATABASE_REPLICA_HOSTS, each with its own connection pool and admission
+queue (same credentials, database and pool sizing as the primary):
+
+- Selection: every read goes to the healthy endpoint (primary included)
+  with the fewest connections in use, rotating between equally loaded ones.
+- Health: every DATABASE_REPLICA_CHECK_INTERVAL_SECONDS each replica's
+  MAX(calculated_at) from the calculation metadata is compared with the
+  primary's. A replica that does not have the primary's latest calculation
+  for longer than DATABASE_REPLICA_MAX_LAG_SECONDS (0 = at once) is
+  bypassed until it catches up, so pages never mix calculations for long.
+  A replica that fails the check, or whose connection fails during a
+  query, is bypassed until its next successful check.
+- With no replicas configured (the default) or none healthy, everything
+  goes to the primary.
+
+Statements that must see the primary (startup validation, health checks,
+the circuit breaker probe, calculation version checks and caches kept per
+calculation) use get_db_cursor(primary=True). The response store only
+stores responses whose replica reads saw its calculation (track_reads).
+"""
+
+import asyncio
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import aiomysql
+import pymysql
+
+from config import settings
+from pool_admission import PoolAdmission, pool_admission
+
+logger = logging.getLogger(__name__)
+
+CALCULATED_AT_SQL = "SELECT MAX(calculated_at) AS calculated_at FROM iz_rankings_xcri_calculation_metadata"
+
+# Connection-level errors that take a replica out of rotation
+CONNECTION_ERRORS = (pymysql.err.OperationalError, pymysql.err.InterfaceError, OSError)
+
+# Calculations (calculated_at) of the replicas the current request read from
+_replica_reads: ContextVar[Optional[Set[Any]]] = ContextVar("xcri_replica_reads", default=None)
+
+
+def track_reads() -> Set[Any]:
+    """Start recording the calculations seen by this request's replica reads"""
+    reads: Set[Any] = set()
+    _replica_reads.set(reads)
+    return reads
+
+
+async def _latest_calculation(pool) -> Any:
+    """MAX(calculated_at) read directly from a pool"""
+    conn = await pool.acquire()
+    try:
+        async with conn.cursor(aiomysql.DictCursor) as cursor:
+            await cursor.execute(CALCULATED_AT_SQL)
+            row = await cursor.fetchone()
+    finally:
+        pool.release(conn)
+    return row['calculated_at'] if row else None
+
+
+class Replica:
+    """One read endpoint: pool, admission queue and health"""
+
+    def __init__(self, host: str, port: int, pool):
+        self.name = f"{host}:{port}"
+        self.pool = pool
+        self.admission = PoolAdmission()
+        # Out of rotation until the first successful check
+        self.healthy = False
+        self.calculated_at: Any = None
+        self.behind_since: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.reads = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "healthy": self.healthy,
+            "calculated_at": self.calculated_at,
+            "behind_seconds": round(time.monotonic() - self.behind_since, 1) if self.behind_since else None,
+            "reads": self.reads,
+            "size": self.pool.size,
+            "free": self.pool.freesize,
+            "in_use": self.admission.in_use,
+            "waiting": self.admission.waiting,
+            "last_error": self.last_error,
+        }
+
+
+class ReplicaRouter:
+    """Health- and load-aware choice between the primary and read replicas"""
+
+    def __init__(self):
+        self.replicas: List[Replica] = []
+        self.primary_calculated_at: Any = None
+        self.primary_reads = 0
+        self._next = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def add(self, replica: Replica) -> None:
+        self.replicas.append(replica)
+
+    def choose(self) -> Optional[Replica]:
+        """Endpoint for the next read: a replica, or None for the primary"""
+        if not self.replicas:
+            self.primary_reads += 1
+            return None
+
+        candidates = [(None, pool_admission.in_use)]
+        candidates.extend((r, r.admission.in_use) for r in self.replicas if r.healthy)
+        self._next = (self._next + 1) % len(candidates)
+        rotated = candidates[self._next:] + candidates[:self._next]
+        replica = min(rotated, key=lambda c: c[1])[0]
+
+        if replica is None:
+            self.primary_reads += 1
+        else:
+            replica.reads += 1
+            reads = _replica_reads.get()
+            if reads is not None:
+                reads.add(replica.calculated_at)
+        return replica
+
+    def mark_failed(self, replica: Replica, error: BaseException) -> None:
+        """Take a replica out of rotation after a connection-level error"""
+        if not isinstance(error, CONNECTION_ERRORS):
+            return
+        replica.last_error = f"{type(error).__name__}: {error}"
+        if replica.healthy:
+            replica.healthy = False
+            logger.warning(f"Read replica {replica.name} bypassed: {replica.last_error}")
+
+    # ---------------------------------------------------------------
+    # Health checks
+    # ---------------------------------------------------------------
+
+    async def check(self, primary_pool) -> None:
+        """Compare each replica's latest calculation with the primary's"""
+        timeout = settings.database_replica_check_interval_seconds
+        try:
+            self.primary_calculated_at = await asyncio.wait_for(_latest_calculation(primary_pool), timeout)
+        except Exception as e:
+            # Without the primary's value only reachability can be checked
+            logger.warning(f"Replica check: primary calculation lookup failed: {e}")
+
+        for replica in self.replicas:
+            try:
+                replica.calculated_at = await asyncio.wait_for(_latest_calculation(replica.pool), timeout)
+            except Exception as e:
+                replica.last_error = f"{type(e).__name__}: {e}"
+                if replica.healthy:
+                    logger.warning(f"Read replica {replica.name} bypassed: {replica.last_error}")
+                replica.healthy = False
+                continue
+            self._update_lag(replica)
+
+    def _update_lag(self, replica: Replica) -> None:
+        primary = self.primary_calculated_at
+        behind = primary is not None and (replica.calculated_at is None or replica.calculated_at < primary)
+        if not behind:
+            if not replica.healthy:
+                logger.info(f"Read replica {replica.name} in rotation (calculation {replica.calculated_at})")
+            replica.healthy = True
+            replica.behind_since = None
+            replica.last_error = None
+            return
+
+        now = time.monotonic()
+        if replica.behind_since is None:
+            replica.behind_since = now
+        within_grace = now - replica.behind_since < settings.database_replica_max_lag_seconds
+        if replica.healthy and not within_grace:
+            logger.warning(
+                f"Read replica {replica.name} bypassed: lagging calculation "
+                f"{replica.calculated_at} < primary {primary}"
+            )
+        replica.healthy = within_grace
+
+    def start(self, get_primary: Callable[[], Any]) -> None:
+        """Start periodic health checks and pool shrinking (no-op without replicas)"""
+        if not self.replicas or (self._task is not None and not self._task.done()):
+            return
+        for replica in self.replicas:
+            replica.admission.start(lambda pool=replica.pool: pool)
+        self._task = asyncio.create_task(self._run(get_primary))
+
+    async def _run(self, get_primary: Callable[[], Any]) -> None:
+        while True:
+            await asyncio.sleep(settings.database_replica_check_interval_seconds)
+            try:
+                await self.check(get_primary())
+            except Exception as e:
+                logger.warning(f"Replica health check failed: {e}")
+
+    async def close(self) -> None:
+        """Stop health checks and close the replica pools"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.replicas:
+            await replica.admission.stop()
+            replica.pool.close()
+            await replica.pool.wait_closed()
+        self.replicas.clear()
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        return [replica.get_stats() for replica in self.replicas]
+
+
+# Global router (one per worker)
+replica_router = ReplicaRouter()
@@ -0,0 +1,213 @@
+"""
+XCRI Rankings API - Request Limits
+
+Keeps a single client, or a burst of expensive queries, from starving the
+connection pool for everyone else:
+
+- Per-client budget: every request that reaches a classified route (see
+  query_timeouts) is charged a cost against its client's token bucket of
+  RATE_LIMIT_CLIENT_BUDGET units per RATE_LIMIT_CLIENT_PERIOD_SECONDS,
+  shared by all workers (rate_limiter). A client over budget gets 429 with
+  Retry-After.
+- Clients: the API only sees its proxy (api-proxy.cgi or
+  deployment/api_proxy_server.py, both on 127.0.0.1, or a Unix socket).
+  The proxies pass the visitor address in RATE_LIMIT_CLIENT_HEADER
+  (X-Real-IP), which is trusted from RATE_LIMIT_TRUSTED_PROXIES and over
+  a Unix socket; from any other peer the peer address is the client.
+- Costs: RATE_LIMIT_COST_LIST, RATE_LIMIT_COST_DETAIL and
+  RATE_LIMIT_COST_ANALYTICS by endpoint class, or a per-route override from
+  RATE_LIMIT_ROUTE_COSTS. A request asking for many rows (limit) pays the
+  cost once per started block of RATE_LIMIT_ROWS_PER_UNIT rows, so
+  /athletes/?limit=50000 costs 5 units.
+- Analytics cap: at most ANALYTICS_POOL_FRACTION x DATABASE_POOL_MAXSIZE
+  analytics requests run at once per worker. Others wait up to
+  DATABASE_POOL_ACQUIRE_TIMEOUT_MS for a slot, then get 503 with
+  Retry-After, so list and detail pages always find connections.
+
+RequestLimitMiddleware sits inside the response store: requests answered
+from stored responses cost nothing. Routes without an endpoint class
+(health, docs, feedback, the batch envelope) are not charged; batch
+sub-requests are, as the batch's client.
+"""
+
+import asyncio
+import logging
+import math
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl
+
+from starlette.responses import JSONResponse
+from starlette.routing import Match
+
+from config import settings
+from query_timeouts import route_endpoint_class
+from rate_limiter import Limit, RateLimiter
+
+logger = logging.getLogger(__name__)
+
+# id(route) -> endpoint class (None: not limited); routes live as long as the app
+_route_classes: Dict[int, Optional[str]] = {}
+
+_warned_unidentified = False
+
+
+def client_key(scope) -> Optional[str]:
+    """Visitor address a request is charged to (None: unknown)"""
+    client = scope.get("client")
+    peer = client[0] if client else None
+    # No peer address: Unix socket, i.e. the local proxy
+    if peer is None or peer in settings.trusted_proxies_set:
+        header = settings.rate_limit_client_header.lower().encode("latin-1")
+        for name, value in scope.get("headers", []):
+            if name == header:
+                return value.decode("latin-1").strip() or peer
+    return peer
+
+
+def _find_route(scope):
+    """Route the router will dispatch this request to (None: no match)"""
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route
+    return None
+
+
+def _endpoint_class(route) -> Optional[str]:
+    key = id(route)
+    if key not in _route_classes:
+        _route_classes[key] = route_endpoint_class(route)
+    return _route_classes[key]
+
+
+def request_cost(route, endpoint_class: Optional[str], query_string: bytes) -> float:
+    """Budget units charged for one request"""
+    path = getattr(route, "path", None)
+    if path in settings.route_costs_map:
+        cost = settings.route_costs_map[path]
+    elif endpoint_class is not None:
+        cost = getattr(settings, f"rate_limit_cost_{endpoint_class}")
+    else:
+        return 0.0
+
+    for name, value in parse_qsl(query_string.decode("latin-1")):
+        if name == "limit" and value.isdigit():
+            cost *= max(1, math.ceil(int(value) / settings.rate_limit_rows_per_unit))
+            break
+    return cost
+
+
+class ConcurrencyGate:
+    """Semaphore capping concurrent requests of one class, with a wait deadline"""
+
+    def __init__(self, fraction_setting: str):
+        self._fraction_setting = fraction_setting
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_use = 0
+        self._waiting = 0
+        self._admitted = 0
+        self._rejected = 0
+
+    @property
+    def limit(self) -> int:
+        fraction = getattr(settings, self._fraction_setting)
+        return max(1, int(settings.database_pool_maxsize * fraction))
+
+    async def acquire(self, timeout: float) -> bool:
+        """Take a slot within timeout; False if none became free"""
+        # Created on first use so it binds to the serving event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.limit)
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout)
+        except asyncio.TimeoutError:
+            self._rejected += 1
+            return False
+        finally:
+            self._waiting -= 1
+        self._in_use += 1
+        self._admitted += 1
+        return True
+
+    def release(self) -> None:
+        self._in_use -= 1
+        self._semaphore.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "in_use": self._in_use,
+            "waiting": self._waiting,
+            "admitted": self._admitted,
+            "rejected": self._rejected,
+        }
+
+
+# Per-worker cap on concurrent analytics requests
+analytics_gate = ConcurrencyGate("analytics_pool_fraction")
+
+# Per-client budget, shared by all workers
+client_limiter = RateLimiter("client", [
+    Limit(settings.rate_limit_client_budget, settings.rate_limit_client_period_seconds)
+])
+
+
+class RequestLimitMiddleware:
+    """Charge per-client budgets and cap concurrent analytics requests"""
+
+    def __init__(self, app):
+        self.app = app
+
+    @staticmethod
+    def _warn_unidentified() -> None:
+        global _warned_unidentified
+        if not _warned_unidentified:
+            _warned_unidentified = True
+            logger.warning(
+                f"Per-client budgets not enforced: requests arrive over a Unix socket without "
+                f"a {settings.rate_limit_client_header} header (update the API proxy)"
+            )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route = _find_route(scope)
+        endpoint_class = _endpoint_class(route) if route is not None else None
+
+        if settings.rate_limit_enabled and route is not None:
+            cost = request_cost(route, endpoint_class, scope.get("query_string", b""))
+            client = client_key(scope) if cost > 0 else None
+            if cost > 0 and client is None:
+                self._warn_unidentified()
+            elif cost > 0:
+                retry_after = await client_limiter.hit(client, cost)
+                if retry_after is not None:
+                    logger.info(f"Rate limited {client}: {scope['path']} (cost {cost:g})")
+                    response = JSONResponse(
+                        {"detail": "Rate limit exceeded. Please try again later."},
+                        status_code=429,
+                        headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+                    )
+                    await response(scope, receive, send)
+                    return
+
+        if endpoint_class != "analytics":
+            await self.app(scope, receive, send)
+            return
+
+        timeout = settings.database_pool_acquire_timeout_ms / 1000
+        if not await analytics_gate.acquire(timeout):
+            response = JSONResponse(
+                {"detail": f"Analytics capacity busy: {analytics_gate.limit} queries already running"},
+                status_code=503,
+                headers={"Retry-After": "1"}
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            analytics_gate.release()
@@ -0,0 +1,287 @@
+"""
+XCRI Rankings API - Pre-compressed Response Store
+
+ASGI middleware that keeps hot GET responses in encoded form (identity,
+gzip and, with the optional brotli package, brotli) so identical payloads
+are compressed once per calculation instead of once per request. A
+50,000-row /athletes response is byte-identical for every user until the
+next calculation; with the store it costs one compression instead of one
+per request.
+
+- Only GET requests under RESPONSE_STORE_PATHS are stored, keyed by path
+  plus the sorted query string.
+- Only 200 JSON responses without Content-Encoding, ETag (routes that
+  cache themselves), Set-Cookie or Cache-Control: no-store are stored;
+  bodies under RESPONSE_STORE_MIN_BYTES are stored uncompressed.
+- Hits are served in the encoding chosen from Accept-Encoding, with an
+  ETag (If-None-Match gets 304). Responses carry X-Response-Store: hit|miss.
+- Memory is bounded by RESPONSE_STORE_MAX_BYTES (least recently used
+  evicted). The store is cleared when a new calculation is published
+  (MAX(calculated_at), checked at most every RESPONSE_STORE_REFRESH_SECONDS);
+  entries also expire after RESPONSE_STORE_TTL_SECONDS as a safety net for
+  tables loaded outside a calculation. A response that read from a read
+  replica still on an older calculation is served but not stored.
+- Stale-while-error: expired entries are kept (until evicted or a new
+  calculation) as the last good copy of a response. While the database
+  circuit breaker is open, or when a request fails with a 5xx or an
+  unhandled exception before its response has started, that copy is
+  served with X-Response-Store: stale and an Age header instead.
+
+Sits inside CORSMiddleware (CORS headers stay per request) and
+GZipMiddleware (which passes the pre-encoded responses through). Profiled
+requests bypass the store so they measure the real work.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.datastructures import Headers
+from starlette.requests import Request
+
+from circuit_breaker import circuit_breaker
+from compression import EncodedBody, encode_body, encoded_response, identity_body
+from config import settings
+from database_async import get_db_cursor
+from profiling import current_profile
+from replicas import track_reads
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseStore:
+    """LRU of encoded response bodies with a byte budget"""
+
+    def __init__(self):
+        # key -> (body, stored_at)
+        self._entries: "OrderedDict[str, Tuple[EncodedBody, float]]" = OrderedDict()
+        self._bytes = 0
+        self._calculated_at = None
+        self._last_check: float = 0.0
+        self._check_lock = asyncio.Lock()
+
+    def get(self, key: str) -> Optional[EncodedBody]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        body, stored_at = entry
+        if time.monotonic() - stored_at > settings.response_store_ttl_seconds:
+            # Kept as the last good copy until replaced or evicted
+            return None
+        self._entries.move_to_end(key)
+        return body
+
+    def get_stale(self, key: str) -> Optional[Tuple[EncodedBody, float]]:
+        """Last stored copy regardless of age, with its age in seconds"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        body, stored_at = entry
+        return body, time.monotonic() - stored_at
+
+    def put(self, key: str, body: EncodedBody) -> None:
+        if body.size > settings.response_store_max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (body, time.monotonic())
+        self._bytes += body.size
+        while self._bytes > settings.response_store_max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def is_current(self, calculations) -> bool:
+        """True when every calculation read is the one the store holds"""
+        return all(calculated_at == self._calculated_at for calculated_at in calculations)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def _remove(self, key: str) -> None:
+        body, _ = self._entries.pop(key)
+        self._bytes -= body.size
+
+    async def check_calculation(self) -> None:
+        """Clear the store when calculation metadata shows a newer run"""
+        if time.monotonic() - self._last_check < settings.response_store_refresh_seconds:
+            return
+
+        async with self._check_lock:
+            if time.monotonic() - self._last_check < settings.response_store_refresh_seconds:
+                return
+
+            # The primary: a lagging replica would flip the version back and forth
+            async with get_db_cursor(primary=True) as cursor:
+                await cursor.execute(
+                    "SELECT MAX(calculated_at) as calculated_at FROM iz_rankings_xcri_calculation_metadata"
+                )
+                row = await cursor.fetchone()
+            calculated_at = row['calculated_at'] if row else None
+            self._last_check = time.monotonic()
+
+            if calculated_at != self._calculated_at:
+                if self._entries:
+                    logger.info(
+                        f"Response store: new calculation ({calculated_at}), "
+                        f"dropping {len(self._entries)} response(s), {self._bytes / 1e6:.1f}MB"
+                    )
+                self.clear()
+                self._calculated_at = calculated_at
+
+
+# Global store (one per worker)
+response_store = ResponseStore()
+
+
+def _store_key(scope) -> str:
+    query = parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True)
+    return f"{scope['path']}?{urlencode(sorted(query))}"
+
+
+def _storable(status: int, headers: Headers) -> bool:
+    return (
+        status == 200
+        and headers.get("content-type", "").startswith("application/json")
+        and "content-encoding" not in headers
+        and "etag" not in headers
+        and "set-cookie" not in headers
+        and "no-store" not in headers.get("cache-control", "")
+    )
+
+
+class ResponseStoreMiddleware:
+    """Serve and fill the response store for cacheable GET requests"""
+
+    def __init__(self, app):
+        self.app = app
+        self.prefixes = tuple(p.strip() for p in settings.response_store_paths.split(",") if p.strip())
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not settings.response_store_enabled
+            or scope.get("method") != "GET"
+            or not scope["path"].startswith(self.prefixes)
+            or current_profile() is not None
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        key = _store_key(scope)
+
+        # Database known to be down: the last good copy beats a fast 503
+        if circuit_breaker.is_open:
+            if not await self._serve_stale(scope, receive, send, key):
+                await self.app(scope, receive, send)
+            return
+
+        try:
+            await response_store.check_calculation()
+        except Exception as e:
+            # Serving uncached beats failing the request over a version check
+            logger.warning(f"Response store version check failed: {e}")
+            await self._fill(scope, receive, send, key, store=False)
+            return
+
+        body = response_store.get(key)
+        if body is not None:
+            response = encoded_response(Request(scope), body, headers={"X-Response-Store": "hit"})
+            await response(scope, receive, send)
+            return
+
+        await self._fill(scope, receive, send, key)
+
+    async def _serve_stale(self, scope, receive, send, key: str) -> bool:
+        """Serve the last stored copy of a response, if there is one"""
+        stale = response_store.get_stale(key)
+        if stale is None:
+            return False
+        body, age = stale
+        response = encoded_response(
+            Request(scope),
+            body,
+            headers={"X-Response-Store": "stale", "Age": str(int(age))}
+        )
+        await response(scope, receive, send)
+        return True
+
+    async def _fill(self, scope, receive, send, key: str, store: bool = True) -> None:
+        """
+        Run the request; store and serve its body encoded when cacheable.
+
+        A 5xx, or an exception raised before anything was sent, is replaced
+        by the last stored copy when there is one.
+        """
+        start_message: Optional[Dict[str, Any]] = None
+        chunks: List[bytes] = []
+        passthrough = False
+        failed = False
+
+        async def capture(message):
+            nonlocal start_message, passthrough, failed
+            if passthrough:
+                await send(message)
+            elif failed:
+                return
+            elif message["type"] == "http.response.start":
+                start_message = message
+                if message["status"] >= 500 and response_store.get_stale(key) is not None:
+                    failed = True
+                elif not store or not _storable(message["status"], Headers(raw=message.get("headers", []))):
+                    passthrough = True
+                    await send(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        reads = track_reads()
+        try:
+            await self.app(scope, receive, capture)
+        except Exception as e:
+            # Nothing reached the client unless the response was passed through
+            if passthrough or not await self._serve_stale(scope, receive, send, key):
+                raise
+            logger.warning(f"Serving stale {key} after {type(e).__name__}: {e}")
+            return
+        if failed:
+            logger.warning(f"Serving stale {key} after status {start_message['status']}")
+            await self._serve_stale(scope, receive, send, key)
+            return
+        if passthrough or start_message is None:
+            return
+
+        content = b"".join(chunks)
+        if not response_store.is_current(reads):
+            # Read from a replica still on an older calculation: serve, don't store
+            await send(start_message)
+            await send({"type": "http.response.body", "body": content})
+            return
+
+        media_type = Headers(raw=start_message.get("headers", [])).get("content-type")
+        if len(content) < settings.response_store_min_bytes:
+            # Too small to be worth compressing; kept for hits and stale serving
+            response_store.put(key, identity_body(content, media_type))
+            await send(start_message)
+            await send({"type": "http.response.body", "body": content})
+            return
+
+        started = time.perf_counter()
+        # Compression is CPU-bound: keep it off the event loop
+        body = await asyncio.to_thread(
+            encode_body,
+            content,
+            media_type,
+            gzip_level=settings.response_store_gzip_level,
+            brotli_quality=settings.response_store_brotli_quality
+        )
+        response_store.put(key, body)
+        logger.info(
+            f"Response stored: {key} identity={len(content)}B, "
+            + ", ".join(f"{enc}={len(data)}B" for enc, data in body.encoded.items())
+            + f", {(time.perf_counter() - started) * 1000:.0f}ms"
+        )
+
+        response = encoded_response(Request(scope), body, headers={"X-Response-Store": "miss"})
+        await response(scope, receive, send)
@@ -9,18 +9,22 @@ from typing import Optional
 from fastapi import APIRouter, Query, HTTPException, status
 
 from models import (
+    AthleteBulkResponse,
     AthleteListResponse,
     AthleteRanking,
+    AthleteTimelineResponse,
     ErrorResponse
 )
 from services import athlete_service
 from config import settings
+from query_timeouts import query_timeout
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/athletes",
     tags=["athletes"],
+    dependencies=[query_timeout("list")],
     responses={
         404: {"model": ErrorResponse, "description": "Athlete not found"},
         500: {"model": ErrorResponse, "description": "Internal server error"}
@@ -133,6 +137,8 @@ async def list_athletes(
             "results": results
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing athletes: {e}", exc_info=True)
         raise HTTPException(
@@ -141,8 +147,100 @@ async def list_athletes(
         )
 
 
+@router.get(
+    "/bulk",
+    dependencies=[query_timeout("detail")],
+    response_model=AthleteBulkResponse,
+    summary="Get athletes by ID (bulk)",
+    description="""
+    Get many athletes' rankings by AthleticNet athlete handle in one call,
+    e.g. to resolve a team's top_athlete_1_hnd ... top_athlete_7_hnd.
+
+    Results follow the order of `athlete_hnds` (duplicates are returned
+    once); handles without a ranking in the requested context are listed
+    in `not_found`.
+
+    **Example:**
+    ```
+    GET /athletes/bulk?athlete_hnds=12345,23456,34567&season_year=2024&division=2030&gender=M
+    ```
+    """
+)
+async def get_athletes_bulk(
+    athlete_hnds: str = Query(..., description="Comma-separated athlete handles"),
+    season_year: int = Query(default=2024, description="Season year"),
+    division: Optional[int] = Query(
+        default=None,
+        description="Division code (optional, for disambiguation)"
+    ),
+    gender: Optional[str] = Query(
+        default=None,
+        description="Gender code (optional, for disambiguation)",
+        pattern="^[MFmf]$"
+    ),
+    scoring_group: str = Query(
+        default="division",
+        description="Scoring scope"
+    ),
+    checkpoint_date: Optional[str] = Query(
+        default=None,
+        description="Rankings as of date (YYYY-MM-DD)"
+    ),
+    algorithm_type: str = Query(
+        default="light",
+        description="Algorithm type"
+    )
+):
+    """Get athletes by a list of AthleticNet athlete handles"""
+    try:
+        handles = [int(h) for h in athlete_hnds.split(",") if h.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid athlete handles: {athlete_hnds}"
+        )
+
+    if not handles:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one athlete handle is required"
+        )
+    if len(handles) > settings.bulk_max_handles:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many athlete handles: {len(handles)} (maximum {settings.bulk_max_handles})"
+        )
+
+    try:
+        results, not_found = await athlete_service.get_athletes_bulk(
+            athlete_hnds=handles,
+            season_year=season_year,
+            division=division,
+            gender=gender,
+            scoring_group=scoring_group,
+            checkpoint_date=checkpoint_date,
+            algorithm_type=algorithm_type
+        )
+
+        return {
+            "total": len(results),
+            "results": results,
+            "not_found": not_found
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting athletes in bulk: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve athletes: {str(e)}"
+        )
+
+
 @router.get(
     "/{athlete_hnd}",
+    dependencies=[query_timeout("detail")],
     response_model=AthleteRanking,
     summary="Get athlete by ID",
     description="""
@@ -209,8 +307,90 @@ async def get_athlete(
         )
 
 
+@router.get(
+    "/{athlete_hnd}/timeline",
+    dependencies=[query_timeout("detail")],
+    response_model=AthleteTimelineResponse,
+    summary="Get athlete rank timeline",
+    description="""
+    Get an athlete's rank, XCRI score and component scores at every
+    checkpoint of a season in a single call.
+
+    Points are ordered oldest first; the full-season ranking (null
+    checkpoint_date) is the last point when present.
+
+    **Example:**
+    ```
+    GET /athletes/12345/timeline?season_year=2025&division=2030&gender=M
+    ```
+    """
+)
+async def get_athlete_timeline(
+    athlete_hnd: int,
+    season_year: int = Query(default=2024, description="Season year"),
+    division: Optional[int] = Query(
+        default=None,
+        description="Division code (optional, for disambiguation)"
+    ),
+    gender: Optional[str] = Query(
+        default=None,
+        description="Gender code (optional, for disambiguation)",
+        pattern="^[MFmf]$"
+    ),
+    scoring_group: str = Query(
+        default="division",
+        description="Scoring scope"
+    ),
+    algorithm_type: str = Query(
+        default="light",
+        description="Algorithm type"
+    )
+):
+    """Get athlete rank history across all checkpoints"""
+    try:
+        points = await athlete_service.get_athlete_timeline(
+            athlete_hnd=athlete_hnd,
+            season_year=season_year,
+            division=division,
+            gender=gender,
+            scoring_group=scoring_group,
+            algorithm_type=algorithm_type
+        )
+
+        if not points:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Athlete {athlete_hnd} not found for season {season_year}"
+            )
+
+        # Identity fields come from the most recent point
+        latest = points[-1]
+        return {
+            "anet_athlete_hnd": athlete_hnd,
+            "athlete_name_first": latest['athlete_name_first'],
+            "athlete_name_last": latest['athlete_name_last'],
+            "anet_team_hnd": latest['anet_team_hnd'],
+            "team_name": latest['team_name'],
+            "season_year": season_year,
+            "division_code": latest['division_code'],
+            "gender_code": latest['gender_code'],
+            "total": len(points),
+            "points": points
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting timeline for athlete {athlete_hnd}: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve athlete timeline: {str(e)}"
+        )
+
+
 @router.get(
     "/team/{team_hnd}/roster",
+    dependencies=[query_timeout("detail")],
     response_model=AthleteListResponse,
     summary="Get team roster",
     description="""
@@ -275,6 +455,8 @@ async def get_team_roster(
             "results": results
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting team roster {team_hnd}: {e}", exc_info=True)
         raise HTTPException(
@@ -0,0 +1,157 @@
+"""
+XCRI Rankings API - Batch Routes
+
+Executes several GET sub-requests against the existing routes in one HTTP
+round trip. Each sub-request is dispatched in-process through the ASGI app,
+so validation, response models and error handling are identical to calling
+the route directly. Sub-requests run concurrently (bounded so a single batch
+cannot take the whole connection pool) and per-item failures are reported
+without failing the batch.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict
+
+import httpx
+from fastapi import APIRouter, HTTPException, Request, status
+
+from models import BatchRequest, BatchRequestItem, BatchResponse, ErrorResponse
+from config import settings
+from request_limits import client_key
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/batch",
+    tags=["batch"],
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid batch"},
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    }
+)
+
+# Paths that must not be reached through a batch
+EXCLUDED_PREFIXES = ("/batch", "/feedback", "/docs", "/redoc", "/openapi.json")
+
+
+def _as_peer(app, peer):
+    """Wrap the app so sub-requests carry the batch request's peer address"""
+    async def with_peer(scope, receive, send):
+        scope["client"] = peer
+        await app(scope, receive, send)
+    return with_peer
+
+
+async def _execute_item(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    item: BatchRequestItem
+) -> Dict[str, Any]:
+    """Execute one sub-request, converting any failure into a result entry"""
+    start = time.perf_counter()
+    result: Dict[str, Any] = {"id": item.id, "path": item.path, "body": None, "error": None}
+
+    if item.path.startswith(EXCLUDED_PREFIXES):
+        result.update(
+            status=status.HTTP_400_BAD_REQUEST,
+            error=f"Path {item.path} cannot be used in a batch",
+            elapsed_ms=0.0
+        )
+        return result
+
+    try:
+        async with semaphore:
+            response = await client.request(item.method, item.path, params=item.params)
+
+        result["status"] = response.status_code
+        try:
+            payload = response.json()
+        except ValueError:
+            payload = response.text
+
+        if response.status_code >= 400:
+            detail = payload.get("detail") if isinstance(payload, dict) else payload
+            result["error"] = detail if isinstance(detail, str) else str(detail)
+        else:
+            result["body"] = payload
+
+    except Exception as e:
+        logger.error(f"Batch sub-request {item.path} failed: {e}", exc_info=True)
+        result.update(status=status.HTTP_500_INTERNAL_SERVER_ERROR, error=str(e))
+
+    result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+
+@router.post(
+    "/",
+    response_model=BatchResponse,
+    summary="Execute multiple API queries",
+    description="""
+    Execute several GET requests against existing endpoints in one round trip.
+
+    Sub-requests run concurrently and results are returned in request order.
+    A failing sub-request is reported with its status code and error detail;
+    it does not fail the batch.
+
+    **Example:**
+    ```
+    POST /batch/
+    {
+      "requests": [
+        {"id": "date", "path": "/metadata/latest/date"},
+        {"id": "snapshots", "path": "/snapshots/"},
+        {"id": "teams", "path": "/teams/", "params": {"season_year": 2025, "division": 2030, "gender": "M"}}
+      ]
+    }
+    ```
+    """
+)
+async def execute_batch(batch: BatchRequest, request: Request):
+    """Execute a batch of sub-requests concurrently"""
+    if len(batch.requests) > settings.batch_max_requests:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batch contains {len(batch.requests)} requests (max {settings.batch_max_requests})"
+        )
+
+    semaphore = asyncio.Semaphore(settings.batch_max_concurrency)
+    # Sub-requests are charged to the batch's client (per-client budgets): same
+    # peer, and the visitor address the proxy gave the batch. A batch whose
+    # client is unknown (Unix socket, no header) leaves its sub-requests
+    # unknown too, so they are not charged rather than pooled under one key
+    transport = httpx.ASGITransport(
+        app=_as_peer(request.app, request.scope.get("client")),
+        raise_app_exceptions=False
+    )
+    # identity: the batch response is compressed once as a whole, not per item
+    headers = {"Accept-Encoding": "identity"}
+    visitor = client_key(request.scope)
+    if visitor is not None:
+        headers[settings.rate_limit_client_header] = visitor
+
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://batch",
+        headers=headers,
+        follow_redirects=True
+    ) as client:
+        results = await asyncio.gather(
+            *(_execute_item(client, semaphore, item) for item in batch.requests)
+        )
+
+    failed = sum(1 for r in results if r["status"] >= 400)
+
+    logger.info(
+        f"Batch executed: requests={len(results)}, failed={failed}, "
+        f"paths={[r['path'] for r in results]}"
+    )
+
+    return {
+        "total": len(results),
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "results": results
+    }
@@ -173,6 +173,8 @@ async def get_component_leaderboard(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting component leaderboard: {e}", exc_info=True)
         raise HTTPException(
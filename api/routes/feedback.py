@@ -1,22 +1,26 @@
 """
 Feedback API Routes
 Allows users to submit feedback and bug reports which are created as GitHub issues
+(asynchronously, through the durable feedback queue)
 """
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel, Field
 from typing import Literal, Optional
-import httpx
-from datetime import datetime, timedelta
-from collections import defaultdict
 
 from config import settings
+from rate_limiter import Limit, RateLimiter
+from request_limits import client_key
+from services.feedback_queue_service import feedback_queue
 
 router = APIRouter(prefix="/feedback", tags=["feedback"])
 
-# Rate limiting: Track submissions by IP address
-submission_tracker = defaultdict(list)
+# Rate limiting: submissions per IP address, shared by all workers
 MAX_SUBMISSIONS_PER_DAY = 10
 MAX_SUBMISSIONS_PER_HOUR = 3
+feedback_limiter = RateLimiter("feedback", [
+    Limit(MAX_SUBMISSIONS_PER_HOUR, 3600),
+    Limit(MAX_SUBMISSIONS_PER_DAY, 86400)
+])
 
 
 class FeedbackSubmission(BaseModel):
@@ -27,141 +31,47 @@ class FeedbackSubmission(BaseModel):
     message: str = Field(..., min_length=10, max_length=2000, description="Feedback message")
 
 
-def check_rate_limit(ip_address: str) -> bool:
-    """
-    Check if IP address has exceeded rate limits
-    Returns True if allowed, False if rate limited
+@router.post("/", status_code=202)
+async def submit_feedback(feedback: FeedbackSubmission, request: Request):
     """
-    now = datetime.now()
-    hour_ago = now - timedelta(hours=1)
-    day_ago = now - timedelta(days=1)
-
-    # Get submissions from this IP
-    submissions = submission_tracker[ip_address]
-
-    # Remove old submissions
-    submissions = [s for s in submissions if s > day_ago]
-    submission_tracker[ip_address] = submissions
-
-    # Check limits
-    recent_submissions = [s for s in submissions if s > hour_ago]
-
-    if len(recent_submissions) >= MAX_SUBMISSIONS_PER_HOUR:
-        return False
-    if len(submissions) >= MAX_SUBMISSIONS_PER_DAY:
-        return False
+    Submit feedback which is queued for creation as a GitHub issue
 
-    return True
+    The submission is stored in the local feedback queue and the request
+    returns immediately; a background worker creates the issue (with
+    retries while GitHub is unavailable).
 
-
-def record_submission(ip_address: str):
-    """Record a submission timestamp for rate limiting"""
-    submission_tracker[ip_address].append(datetime.now())
-
-
-async def create_github_issue(feedback: FeedbackSubmission) -> dict:
-    """
-    Create a GitHub issue from feedback submission
-    Returns the created issue data
+    Rate limited to:
+    - 3 submissions per hour per IP
+    - 10 submissions per day per IP
     """
-    # Get GitHub credentials from settings
-    github_token = settings.github_token
-    github_repo = settings.github_repo
-
-    if not github_token:
+    if not settings.github_token:
         raise HTTPException(
             status_code=500,
             detail="GitHub integration not configured"
         )
 
-    # Determine issue title and labels
-    type_labels = {
-        "bug": ["bug", "user-feedback"],
-        "feedback": ["enhancement", "user-feedback"],
-        "question": ["question", "user-feedback"]
-    }
-
-    type_titles = {
-        "bug": "Bug Report",
-        "feedback": "User Feedback",
-        "question": "User Question"
-    }
-
-    # Build issue body
-    issue_body = f"""## {type_titles[feedback.feedback_type]}
-
-**Message:**
-{feedback.message}
-
----
-
-**Submitted by:** {feedback.name or 'Anonymous'}
-**Email:** {feedback.email or 'Not provided'}
-**Type:** {feedback.feedback_type}
-**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
-**Source:** XCRI Feedback Form
-"""
-
-    # Create GitHub issue via API
-    url = f"https://api.github.com/repos/{github_repo}/issues"
-    headers = {
-        "Authorization": f"Bearer {github_token}",
-        "Accept": "application/vnd.github+json",
-        "X-GitHub-Api-Version": "2022-11-28"
-    }
-
-    # Truncate message for title if needed
-    title_message = feedback.message[:80] + "..." if len(feedback.message) > 80 else feedback.message
-
-    payload = {
-        "title": f"[User {type_titles[feedback.feedback_type]}] {title_message}",
-        "body": issue_body,
-        "labels": type_labels[feedback.feedback_type]
-    }
-
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, json=payload, headers=headers, timeout=10.0)
-
-        if response.status_code == 201:
-            return response.json()
-        else:
-            raise HTTPException(
-                status_code=response.status_code,
-                detail=f"Failed to create GitHub issue: {response.text}"
-            )
-
-
-@router.post("/")
-async def submit_feedback(feedback: FeedbackSubmission, request: Request):
-    """
-    Submit feedback which creates a GitHub issue
-
-    Rate limited to:
-    - 3 submissions per hour per IP
-    - 10 submissions per day per IP
-    """
-    # Get client IP address
-    client_ip = request.client.host
-
-    # Check rate limit
-    if not check_rate_limit(client_ip):
+    # Visitor address (X-Real-IP from the local proxy, else the peer)
+    client_ip = client_key(request.scope)
+    if client_ip is None:
+        # Unix socket without a proxy-supplied address: limits cannot apply
         raise HTTPException(
-            status_code=429,
-            detail="Rate limit exceeded. Please try again later."
+            status_code=503,
+            detail="Feedback unavailable: client address unknown"
         )
 
-    try:
-        # Create GitHub issue
-        issue = await create_github_issue(feedback)
+    # Check rate limit (counts the submission; 429 with Retry-After when exceeded)
+    await feedback_limiter.check(client_ip)
 
-        # Record submission
-        record_submission(client_ip)
+    try:
+        # Queue for GitHub issue creation
+        submission_id = await feedback_queue.enqueue(feedback.model_dump())
 
         return {
             "success": True,
             "message": "Thank you for your feedback! We've received your submission.",
-            "issue_number": issue.get("number"),
-            "issue_url": issue.get("html_url")
+            "submission_id": submission_id,
+            "issue_number": None,
+            "issue_url": None
         }
 
     except HTTPException:
@@ -184,5 +94,6 @@ async def get_feedback_status():
         "rate_limits": {
             "per_hour": MAX_SUBMISSIONS_PER_HOUR,
             "per_day": MAX_SUBMISSIONS_PER_DAY
-        }
+        },
+        "queue": await feedback_queue.get_stats()
     }
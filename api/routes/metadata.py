@@ -14,12 +14,14 @@ from models import (
     ErrorResponse
 )
 from services import metadata_service
+from query_timeouts import query_timeout
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/metadata",
     tags=["metadata"],
+    dependencies=[query_timeout("list")],
     responses={
         404: {"model": ErrorResponse, "description": "Metadata not found"},
         500: {"model": ErrorResponse, "description": "Internal server error"}
@@ -89,6 +91,8 @@ async def list_metadata(
             "results": results
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing metadata: {e}", exc_info=True)
         raise HTTPException(
@@ -99,6 +103,7 @@ async def list_metadata(
 
 @router.get(
     "/latest/date",
+    dependencies=[query_timeout("detail")],
     summary="Get latest calculation date",
     description="""
     Get the most recent calculation timestamp (optimized query).
@@ -145,6 +150,7 @@ async def get_latest_calculation_date():
 
 @router.get(
     "/latest",
+    dependencies=[query_timeout("detail")],
     response_model=MetadataListResponse,
     summary="Get latest calculations",
     description="""
@@ -168,6 +174,8 @@ async def get_latest_metadata():
             "results": results
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting latest metadata: {e}", exc_info=True)
         raise HTTPException(
@@ -178,6 +186,7 @@ async def get_latest_metadata():
 
 @router.get(
     "/{metadata_id}",
+    dependencies=[query_timeout("detail")],
     response_model=CalculationMetadata,
     summary="Get metadata by ID",
     description="""
@@ -242,6 +251,8 @@ async def get_processing_summary():
 
         return result
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting processing summary: {e}", exc_info=True)
         raise HTTPException(
@@ -4,18 +4,26 @@ XCRI Rankings API - SCS Component Routes
 REST endpoints for accessing SCS component breakdowns.
 """
 
-from fastapi import APIRouter, Query, HTTPException
+from fastapi import APIRouter, Path, Query, HTTPException
 from typing import Optional
 
+from config import settings
 from services import scs_service
+from query_timeouts import query_timeout
 from models import (
+    SCSBulkPercentiles,
     SCSComponents,
     SCSComponentLeaderboard,
     SCSComponentComparison,
-    SCSComponentDistribution
+    SCSComponentDistribution,
+    SCSRankDiscrepancy,
+    SCSRankDiscrepancyList
 )
 
-router = APIRouter(prefix="/scs", tags=["SCS Components"])
+router = APIRouter(prefix="/scs", tags=["SCS Components"], dependencies=[query_timeout("analytics")])
+
+# Largest athlete handle the in-memory indexes can hold (int64 arrays)
+MAX_HANDLE = 2**63 - 1
 
 
 @router.get("/athletes/{athlete_hnd}/components", response_model=SCSComponents)
@@ -127,13 +135,19 @@ async def get_component_distribution(
     season_year: int = Query(2024, description="Season year"),
     division: int = Query(2030, description="Division code"),
     gender: str = Query("M", description="Gender (M/F)"),
-    bins: int = Query(10, description="Number of histogram bins", ge=5, le=20)
+    bins: int = Query(10, description="Number of histogram bins", ge=5, le=20),
+    percentiles: str = Query(
+        "25,50,75",
+        description="Comma-separated percentiles to report (0-100)",
+        max_length=100
+    )
 ):
     """
     Get distribution statistics for a specific SCS component.
 
-    Returns min, max, mean, median, standard deviation, and percentiles
-    for the specified component across all athletes in the division.
+    Returns min, max, mean, standard deviation, the requested percentiles
+    and a histogram with `bins` equal-width bins for the specified
+    component across all athletes in the division (NULL scores excluded).
 
     **Components available**:
     - `saga`: Season Adjusted Gap Average
@@ -141,15 +155,21 @@ async def get_component_distribution(
     - `osma`: Opponent Strength of Schedule
     - `xcri`: Final SCS
 
-    **Example**: `/scs/distribution/sewr?season_year=2024&division=2030&gender=M`
+    **Example**: `/scs/distribution/sewr?season_year=2024&division=2030&gender=M&bins=20&percentiles=10,50,90`
     """
     try:
+        try:
+            percentile_values = [float(p) for p in percentiles.split(",") if p.strip()]
+        except ValueError:
+            raise ValueError(f"Invalid percentiles: {percentiles}")
+
         result = await scs_service.get_component_distribution(
             component=component,
             season_year=season_year,
             division=division,
             gender=gender,
-            bins=bins
+            bins=bins,
+            percentiles=percentile_values
         )
 
         return result
@@ -158,11 +178,52 @@ async def get_component_distribution(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.get("/percentiles", response_model=SCSBulkPercentiles)
+async def get_component_percentiles_bulk(
+    athlete_hnds: str = Query(..., description="Comma-separated athlete handles (e.g., a team roster)"),
+    season_year: int = Query(2024, description="Season year"),
+    division: int = Query(2030, description="Division code"),
+    gender: str = Query("M", description="Gender (M/F)")
+):
+    """
+    Get SCS component scores, ranks and percentiles for many athletes in one call.
+
+    Percentiles are exact: the share of athletes in the division with a
+    strictly worse score on that component (athletes without a score are
+    excluded; tied athletes share a percentile). Results follow the order
+    of `athlete_hnds`; handles without SCS components in the division are
+    listed in `not_found`.
+
+    **Example**: `/scs/percentiles?athlete_hnds=12345678,23456789&season_year=2024&division=2030&gender=M`
+    """
+    try:
+        handles = [int(h) for h in athlete_hnds.split(",") if h.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid athlete handles: {athlete_hnds}")
+    if any(abs(h) > MAX_HANDLE for h in handles):
+        raise HTTPException(status_code=400, detail=f"Invalid athlete handles: {athlete_hnds}")
+
+    if not handles:
+        raise HTTPException(status_code=400, detail="At least one athlete handle is required")
+    if len(handles) > settings.bulk_max_handles:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many athlete handles: {len(handles)} (maximum {settings.bulk_max_handles})"
+        )
+
+    return await scs_service.get_component_percentiles_bulk(
+        athlete_hnds=handles,
+        season_year=season_year,
+        division=division,
+        gender=gender
+    )
+
+
 # Additional convenience endpoints
 
-@router.get("/athletes/{athlete_hnd}/discrepancy")
+@router.get("/athletes/{athlete_hnd}/discrepancy", response_model=SCSRankDiscrepancy)
 async def get_athlete_rank_discrepancy(
-    athlete_hnd: int,
+    athlete_hnd: int = Path(..., ge=-MAX_HANDLE, le=MAX_HANDLE, description="AthleticNet athlete handle"),
     season_year: int = Query(2024, description="Season year"),
     division: int = Query(2030, description="Division code"),
     gender: str = Query("M", description="Gender (M/F)")
@@ -171,25 +232,38 @@ async def get_athlete_rank_discrepancy(
     Get athlete's rank discrepancies between XCRI Light and SCS components.
 
     Useful for identifying athletes who perform differently in competitive
-    rankings vs. statistical metrics.
+    rankings vs. statistical metrics. Compares the LIVE XCRI Light rank with
+    the SCS rank (and SAGA/SEWR/OSMA ranks); a positive discrepancy means
+    XCRI Light ranks the athlete better.
 
     **Example**: `/scs/athletes/12345678/discrepancy?season_year=2024&division=2030&gender=M`
     """
-    # This endpoint would join with main athlete_rankings table
-    # to compare XCRI Light rank vs SCS component ranks
-    # Implementation left as future enhancement
-    raise HTTPException(
-        status_code=501,
-        detail="Endpoint not yet implemented - coming soon"
+    result = await scs_service.get_rank_discrepancy(
+        athlete_hnd=athlete_hnd,
+        season_year=season_year,
+        division=division,
+        gender=gender
     )
 
+    if not result:
+        raise HTTPException(
+            status_code=404,
+            detail=f"XCRI Light and SCS ranks not found for athlete {athlete_hnd}"
+        )
+
+    return result
+
 
-@router.get("/biggest-discrepancies")
+@router.get("/biggest-discrepancies", response_model=SCSRankDiscrepancyList)
 async def get_biggest_rank_discrepancies(
     season_year: int = Query(2024, description="Season year"),
     division: int = Query(2030, description="Division code"),
     gender: str = Query("M", description="Gender (M/F)"),
-    limit: int = Query(25, description="Number of results", le=100)
+    limit: int = Query(25, description="Number of results", ge=1, le=100),
+    direction: str = Query(
+        "any",
+        description="any, light (XCRI Light rank better) or scs (SCS rank better)"
+    )
 ):
     """
     Get athletes with the biggest discrepancies between XCRI Light rank
@@ -200,9 +274,14 @@ async def get_biggest_rank_discrepancies(
 
     **Example**: `/scs/biggest-discrepancies?season_year=2024&division=2030&gender=M&limit=25`
     """
-    # This endpoint would join with main athlete_rankings table
-    # Implementation left as future enhancement
-    raise HTTPException(
-        status_code=501,
-        detail="Endpoint not yet implemented - coming soon"
-    )
+    try:
+        return await scs_service.get_biggest_rank_discrepancies(
+            season_year=season_year,
+            division=division,
+            gender=gender,
+            limit=limit,
+            direction=direction
+        )
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
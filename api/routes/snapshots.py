@@ -12,12 +12,14 @@ from fastapi import APIRouter, Query, HTTPException, status
 from models import ErrorResponse
 from services.snapshot_service import snapshot_service
 from config import settings
+from query_timeouts import query_timeout
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/snapshots",
     tags=["snapshots"],
+    dependencies=[query_timeout("list")],
     responses={
         404: {"model": ErrorResponse, "description": "Snapshot not found"},
         500: {"model": ErrorResponse, "description": "Internal server error"}
@@ -49,6 +51,8 @@ async def list_snapshots():
             "total": len(snapshots),
             "snapshots": snapshots
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing snapshots: {e}", exc_info=True)
         raise HTTPException(
@@ -137,6 +141,8 @@ async def get_snapshot_athletes(
             "results": results
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting snapshot athletes for {snapshot_date}: {e}", exc_info=True)
         raise HTTPException(
@@ -225,6 +231,8 @@ async def get_snapshot_teams(
             "results": results
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting snapshot teams for {snapshot_date}: {e}", exc_info=True)
         raise HTTPException(
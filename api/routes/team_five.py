@@ -16,12 +16,14 @@ from models import (
 )
 from services import team_service, resume_service
 from config import settings
+from query_timeouts import query_timeout
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/team-five",
     tags=["team-five"],
+    dependencies=[query_timeout("list")],
     responses={
         404: {"model": ErrorResponse, "description": "Team not found"},
         500: {"model": ErrorResponse, "description": "Internal server error"}
@@ -127,6 +129,8 @@ async def list_teams(
             "results": results
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing teams: {e}", exc_info=True)
         raise HTTPException(
@@ -137,6 +141,7 @@ async def list_teams(
 
 @router.get(
     "/{team_hnd}",
+    dependencies=[query_timeout("detail")],
     response_model=TeamRanking,
     summary="Get team by ID",
     description="""
@@ -206,6 +211,7 @@ async def get_team(
 # Session 004: Season Resume Endpoint (Issue #15)
 @router.get(
     "/{team_hnd}/resume",
+    dependencies=[query_timeout("detail")],
     response_model=SeasonResume,
     summary="Get team season resume",
     description="""
@@ -22,12 +22,14 @@ from models import (
 )
 from services import team_knockout_service
 from config import settings
+from query_timeouts import query_timeout
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/team-knockout",
     tags=["team-knockout"],
+    dependencies=[query_timeout("list")],
     responses={
         404: {"model": ErrorResponse, "description": "Not found"},
         500: {"model": ErrorResponse, "description": "Internal server error"}
@@ -136,6 +138,8 @@ async def list_team_knockout_rankings(
             "results": results
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing Team Knockout rankings: {e}", exc_info=True)
         raise HTTPException(
@@ -150,6 +154,7 @@ async def list_team_knockout_rankings(
 
 @router.get(
     "/matchups",
+    dependencies=[query_timeout("analytics")],
     response_model=MatchupListResponse,
     summary="Get team matchups",
     description="""
@@ -231,6 +236,8 @@ async def get_team_matchups(
             "matchups": matchups
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting matchups for team_id={team_id}: {e}", exc_info=True)
         raise HTTPException(
@@ -241,6 +248,7 @@ async def get_team_matchups(
 
 @router.get(
     "/matchups/head-to-head",
+    dependencies=[query_timeout("analytics")],
     response_model=HeadToHeadResponse,
     summary="Get head-to-head record between two teams",
     description="""
@@ -329,6 +337,7 @@ async def get_head_to_head(
 
 @router.get(
     "/matchups/meet/{race_hnd}",
+    dependencies=[query_timeout("analytics")],
     response_model=MeetMatchupsResponse,
     summary="Get all matchups from a specific meet",
     description="""
@@ -379,6 +388,7 @@ async def get_meet_matchups(
 
 @router.get(
     "/matchups/common-opponents",
+    dependencies=[query_timeout("analytics")],
     response_model=CommonOpponentsResponse,
     summary="Find common opponents between two teams",
     description="""
@@ -472,6 +482,7 @@ async def get_common_opponents(
 
 @router.get(
     "/{team_id}",
+    dependencies=[query_timeout("detail")],
     response_model=TeamKnockoutRanking,
     summary="Get Team Knockout ranking by team ID",
     description="""
@@ -6,22 +6,27 @@ FastAPI routes for team five ranking endpoints.
 
 import logging
 from typing import Optional
-from fastapi import APIRouter, Query, HTTPException, status
+from fastapi import APIRouter, Query, HTTPException, Request, status
 
 from models import (
     TeamListResponse,
     TeamRanking,
+    TeamTimelineResponse,
     SeasonResume,
+    TeamProfileResponse,
     ErrorResponse
 )
-from services import team_service, resume_service
+from services import team_service, resume_service, team_profile_service
 from config import settings
+from query_timeouts import query_timeout
+from compression import encoded_response
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/teams",
     tags=["teams"],
+    dependencies=[query_timeout("list")],
     responses={
         404: {"model": ErrorResponse, "description": "Team not found"},
         500: {"model": ErrorResponse, "description": "Internal server error"}
@@ -127,6 +132,8 @@ async def list_teams(
             "results": results
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing teams: {e}", exc_info=True)
         raise HTTPException(
@@ -137,6 +144,7 @@ async def list_teams(
 
 @router.get(
     "/{team_hnd}",
+    dependencies=[query_timeout("detail")],
     response_model=TeamRanking,
     summary="Get team by ID",
     description="""
@@ -203,9 +211,88 @@ async def get_team(
         )
 
 
+@router.get(
+    "/{team_hnd}/timeline",
+    dependencies=[query_timeout("detail")],
+    response_model=TeamTimelineResponse,
+    summary="Get team rank timeline",
+    description="""
+    Get a team's rank, team XCRI score and squad averages at every
+    checkpoint of a season in a single call.
+
+    Points are ordered oldest first; the full-season ranking (null
+    checkpoint_date) is the last point when present.
+
+    **Example:**
+    ```
+    GET /teams/123/timeline?season_year=2025&division=2030&gender=M
+    ```
+    """
+)
+async def get_team_timeline(
+    team_hnd: int,
+    season_year: int = Query(default=2024, description="Season year"),
+    division: Optional[int] = Query(
+        default=None,
+        description="Division code (optional, for disambiguation)"
+    ),
+    gender: Optional[str] = Query(
+        default=None,
+        description="Gender code (optional, for disambiguation)",
+        pattern="^[MFmf]$"
+    ),
+    scoring_group: str = Query(
+        default="division",
+        description="Scoring scope"
+    ),
+    algorithm_type: str = Query(
+        default="light",
+        description="Algorithm type"
+    )
+):
+    """Get team rank history across all checkpoints"""
+    try:
+        points = await team_service.get_team_timeline(
+            team_hnd=team_hnd,
+            season_year=season_year,
+            division=division,
+            gender=gender,
+            scoring_group=scoring_group,
+            algorithm_type=algorithm_type
+        )
+
+        if not points:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Team {team_hnd} not found for season {season_year}"
+            )
+
+        # Identity fields come from the most recent point
+        latest = points[-1]
+        return {
+            "anet_team_hnd": team_hnd,
+            "team_name": latest['team_name'],
+            "season_year": season_year,
+            "division_code": latest['division_code'],
+            "gender_code": latest['gender_code'],
+            "total": len(points),
+            "points": points
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting timeline for team {team_hnd}: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve team timeline: {str(e)}"
+        )
+
+
 # Session 004: Season Resume Endpoint (Issue #15)
 @router.get(
     "/{team_hnd}/resume",
+    dependencies=[query_timeout("detail")],
     response_model=SeasonResume,
     summary="Get team season resume",
     description="""
@@ -213,6 +300,10 @@ async def get_team(
 
     The resume contains performance history and meet results for the season.
 
+    The body is compressed once per resume version (gzip, and brotli when
+    available) and served with the matching Content-Encoding and an ETag;
+    send If-None-Match to get 304 Not Modified for an unchanged resume.
+
     **Example:**
     ```
     GET /teams/123/resume?season_year=2025&division=2030&gender=M
@@ -224,6 +315,7 @@ async def get_team(
     }
 )
 async def get_team_resume(
+    request: Request,
     team_hnd: int,
     season_year: int = Query(default=2025, description="Season year"),
     division: Optional[int] = Query(
@@ -238,20 +330,20 @@ async def get_team_resume(
 ):
     """Get season resume for a team"""
     try:
-        result = await resume_service.get_team_resume(
+        body = await resume_service.get_team_resume_encoded(
             anet_team_hnd=team_hnd,
             season_year=season_year,
             division_code=division,
             gender_code=gender
         )
 
-        if not result:
+        if not body:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Season resume not found for team {team_hnd} (season={season_year}, division={division}, gender={gender})"
             )
 
-        return result
+        return encoded_response(request, body)
 
     except HTTPException:
         raise
@@ -261,3 +353,89 @@ async def get_team_resume(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve team resume: {str(e)}"
         )
+
+
+@router.get(
+    "/{team_hnd}/profile",
+    dependencies=[query_timeout("detail")],
+    response_model=TeamProfileResponse,
+    summary="Get team profile",
+    description="""
+    Get everything the team profile page needs in one call: the team
+    ranking, its roster, season resume and Team Knockout division ranking.
+
+    The lookups run concurrently. The resume's season_html is large and is
+    only included with `include_resume_html=true`; `resume` and `knockout`
+    are null when the team has none.
+
+    **Example:**
+    ```
+    GET /teams/123/profile?season_year=2025&division=2030&gender=M
+    ```
+    """
+)
+async def get_team_profile(
+    team_hnd: int,
+    season_year: int = Query(default=2024, description="Season year"),
+    division: Optional[int] = Query(
+        default=None,
+        description="Division code (optional, for disambiguation)"
+    ),
+    gender: Optional[str] = Query(
+        default=None,
+        description="Gender code (optional, for disambiguation)",
+        pattern="^[MFmf]$"
+    ),
+    scoring_group: str = Query(
+        default="division",
+        description="Scoring scope"
+    ),
+    checkpoint_date: Optional[str] = Query(
+        default=None,
+        description="Rankings as of date (YYYY-MM-DD)"
+    ),
+    algorithm_type: str = Query(
+        default="light",
+        description="Algorithm type"
+    ),
+    roster_limit: int = Query(
+        default=100,
+        ge=1,
+        le=500,
+        description="Maximum roster athletes to return"
+    ),
+    include_resume_html: bool = Query(
+        default=False,
+        description="Include the season resume HTML"
+    )
+):
+    """Get team, roster, resume and knockout ranking in one document"""
+    try:
+        result = await team_profile_service.get_team_profile(
+            team_hnd=team_hnd,
+            season_year=season_year,
+            division=division,
+            gender=gender,
+            scoring_group=scoring_group,
+            checkpoint_date=checkpoint_date,
+            algorithm_type=algorithm_type,
+            roster_limit=roster_limit,
+            include_resume_html=include_resume_html
+        )
+
+        if not result:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Team {team_hnd} not found for season {season_year}"
+            )
+
+        return result
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting profile for team {team_hnd}: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve team profile: {str(e)}"
+        )
@@ -8,6 +8,7 @@ import logging
 from typing import Optional, Tuple, List, Dict, Any
 
 from database_async import get_db_cursor, build_where_clause
+from query_shapes import query_registry
 
 logger = logging.getLogger(__name__)
 
@@ -54,18 +55,10 @@ async def get_athletes(
             gender=gender,
             scoring_group=scoring_group,
             checkpoint_date=checkpoint_date,
-            algorithm_type=algorithm_type
+            algorithm_type=algorithm_type,
+            alias="a"  # table alias for the JOIN query (Session 009D)
         )
 
-        # Add table alias prefix for JOIN query (Session 009D)
-        where_sql = where_sql.replace('season_year =', 'a.season_year =') \
-                           .replace('scoring_group =', 'a.scoring_group =') \
-                           .replace('algorithm_type =', 'a.algorithm_type =') \
-                           .replace('checkpoint_date =', 'a.checkpoint_date =') \
-                           .replace('checkpoint_date IS', 'a.checkpoint_date IS') \
-                           .replace('division_code =', 'a.division_code =') \
-                           .replace('gender_code =', 'a.gender_code =')
-
         # Add optional filters (with table alias for JOIN - Session 009D)
         where_clauses = [where_sql]
 
@@ -91,7 +84,7 @@ async def get_athletes(
         final_where = " AND ".join(where_clauses)
 
         # Get total count (use JOIN for region/conference filtering - Session 010)
-        count_sql = f"""
+        count_shape = query_registry.shape("athletes.count", final_where, lambda: f"""
             SELECT COUNT(*) as total
             FROM iz_rankings_xcri_athlete_rankings a
             LEFT JOIN iz_rankings_xcri_team_rankings t
@@ -101,12 +94,11 @@ async def get_athletes(
                 AND a.gender_code = t.gender_code
                 AND COALESCE(a.checkpoint_date, '') = COALESCE(t.checkpoint_date, '')
             WHERE {final_where}
-        """
-        await cursor.execute(count_sql, params)
-        total = (await cursor.fetchone())['total']
+        """)
+        total = (await count_shape.fetchone(cursor, params))['total']
 
         # Get results with pagination (JOIN with team rankings for region/conference - Session 009D)
-        query_sql = f"""
+        query_shape = query_registry.shape("athletes.list", final_where, lambda: f"""
             SELECT
                 a.ranking_id,
                 a.season_year,
@@ -156,9 +148,8 @@ async def get_athletes(
             WHERE {final_where}
             ORDER BY a.athlete_rank
             LIMIT %s OFFSET %s
-        """
-        await cursor.execute(query_sql, params + [limit, offset])
-        results = await cursor.fetchall()
+        """)
+        results = await query_shape.fetchall(cursor, params + [limit, offset])
 
         logger.info(
             f"Athletes query: season={season_year}, division={division}, "
@@ -209,7 +200,7 @@ async def get_athlete_by_id(
         where_sql += " AND anet_athlete_hnd = %s"
         params.append(athlete_hnd)
 
-        query_sql = f"""
+        query_shape = query_registry.shape("athletes.detail", where_sql, lambda: f"""
             SELECT
                 ranking_id,
                 season_year,
@@ -250,9 +241,8 @@ async def get_athlete_by_id(
             WHERE {where_sql}
             ORDER BY calculated_at DESC
             LIMIT 1
-        """
-        await cursor.execute(query_sql, params)
-        result = await cursor.fetchone()
+        """)
+        result = await query_shape.fetchone(cursor, params)
 
         if result:
             logger.info(
@@ -274,7 +264,8 @@ async def get_team_roster(
     scoring_group: str = "division",
     checkpoint_date: Optional[str] = None,
     algorithm_type: str = "light",
-    limit: int = 100
+    limit: int = 100,
+    count: bool = True
 ) -> Tuple[List[Dict[str, Any]], int]:
     """
     Get all athletes on a team roster.
@@ -288,6 +279,8 @@ async def get_team_roster(
         checkpoint_date: Rankings as of date (optional)
         algorithm_type: Algorithm type (default: 'light')
         limit: Maximum athletes to return (default: 100)
+        count: Run a COUNT for the total (default: True); False reports the
+            number of rows returned, which is exact when below limit
 
     Returns:
         Tuple of (results: List[Dict], total_count: int)
@@ -308,16 +301,17 @@ async def get_team_roster(
         params.append(team_hnd)
 
         # Get total count
-        count_sql = f"""
-            SELECT COUNT(*) as total
-            FROM iz_rankings_xcri_athlete_rankings
-            WHERE {where_sql}
-        """
-        await cursor.execute(count_sql, params)
-        total = (await cursor.fetchone())['total']
+        total = None
+        if count:
+            count_shape = query_registry.shape("athletes.roster_count", where_sql, lambda: f"""
+                SELECT COUNT(*) as total
+                FROM iz_rankings_xcri_athlete_rankings
+                WHERE {where_sql}
+            """)
+            total = (await count_shape.fetchone(cursor, params))['total']
 
         # Get results ordered by rank
-        query_sql = f"""
+        query_shape = query_registry.shape("athletes.roster", where_sql, lambda: f"""
             SELECT
                 ranking_id,
                 season_year,
@@ -358,9 +352,11 @@ async def get_team_roster(
             WHERE {where_sql}
             ORDER BY athlete_rank
             LIMIT %s
-        """
-        await cursor.execute(query_sql, params + [limit])
-        results = await cursor.fetchall()
+        """)
+        results = await query_shape.fetchall(cursor, params + [limit])
+
+        if total is None:
+            total = len(results)
 
         logger.info(
             f"Team roster query: team_hnd={team_hnd}, season={season_year}, "
@@ -368,3 +364,186 @@ async def get_team_roster(
         )
 
         return results, total
+
+
+async def get_athlete_timeline(
+    athlete_hnd: int,
+    season_year: int = 2024,
+    division: Optional[int] = None,
+    gender: Optional[str] = None,
+    scoring_group: str = "division",
+    algorithm_type: str = "light"
+) -> List[Dict[str, Any]]:
+    """
+    Get an athlete's ranking at every checkpoint of a season in one query.
+
+    Returns one row per checkpoint_date (ascending), followed by the full-season
+    row (checkpoint_date NULL) if present. Replaces N calls to get_athlete_by_id.
+
+    Args:
+        athlete_hnd: AthleticNet athlete handle (required)
+        season_year: Season year (default: 2024)
+        division: Division code (optional)
+        gender: Gender code (optional)
+        scoring_group: Scoring scope (default: 'division')
+        algorithm_type: Algorithm type (default: 'light')
+
+    Returns:
+        List of timeline points (may be empty)
+    """
+    async with get_db_cursor() as cursor:
+        where_clauses = [
+            "anet_athlete_hnd = %s",
+            "season_year = %s",
+            "scoring_group = %s",
+            "algorithm_type = %s"
+        ]
+        params = [athlete_hnd, season_year, scoring_group, algorithm_type]
+
+        if division:
+            where_clauses.append("division_code = %s")
+            params.append(division)
+
+        if gender:
+            where_clauses.append("gender_code = %s")
+            params.append(gender.upper())
+
+        where_sql = " AND ".join(where_clauses)
+
+        # Full-season row (NULL checkpoint) sorts last as the "current" point
+        query_sql = f"""
+            SELECT
+                checkpoint_date,
+                division_code,
+                gender_code,
+                anet_team_hnd,
+                team_name,
+                athlete_name_first,
+                athlete_name_last,
+                athlete_rank,
+                xcri_score,
+                races_count,
+                scs_score,
+                saga_score,
+                sewr_score,
+                osma_score,
+                calculated_at
+            FROM iz_rankings_xcri_athlete_rankings
+            WHERE {where_sql}
+            ORDER BY checkpoint_date IS NULL, checkpoint_date, calculated_at
+        """
+        await cursor.execute(query_sql, params)
+        results = await cursor.fetchall()
+
+        logger.info(
+            f"Athlete timeline query: athlete_hnd={athlete_hnd}, "
+            f"season={season_year}, points={len(results)}"
+        )
+
+        return results
+
+
+async def get_athletes_bulk(
+    athlete_hnds: List[int],
+    season_year: int = 2024,
+    division: Optional[int] = None,
+    gender: Optional[str] = None,
+    scoring_group: str = "division",
+    checkpoint_date: Optional[str] = None,
+    algorithm_type: str = "light"
+) -> Tuple[List[Dict[str, Any]], List[int]]:
+    """
+    Get many athletes by AthleticNet athlete handle in one query.
+
+    Resolves e.g. a team's top-7 handles without one get_athlete_by_id call
+    per athlete. As in get_athlete_by_id, an athlete with several records
+    (e.g. different divisions) resolves to the most recent one.
+
+    Args:
+        athlete_hnds: AthleticNet athlete handles (results keep this order)
+        season_year: Season year (default: 2024)
+        division: Division code (optional)
+        gender: Gender code (optional)
+        scoring_group: Scoring scope (default: 'division')
+        checkpoint_date: Rankings as of date (optional, None = full season)
+        algorithm_type: Algorithm type (default: 'light')
+
+    Returns:
+        Tuple of (results: List[Dict] in request order, not_found: List[int])
+    """
+    # Duplicate handles resolve once, at their first position
+    handles = list(dict.fromkeys(athlete_hnds))
+
+    async with get_db_cursor() as cursor:
+        # Build WHERE clause
+        where_sql, params = build_where_clause(
+            season_year=season_year,
+            division=division,
+            gender=gender,
+            scoring_group=scoring_group,
+            checkpoint_date=checkpoint_date,
+            algorithm_type=algorithm_type
+        )
+
+        # Add athlete handle filter
+        where_sql += f" AND anet_athlete_hnd IN ({', '.join(['%s'] * len(handles))})"
+        params.extend(handles)
+
+        query_sql = f"""
+            SELECT
+                ranking_id,
+                season_year,
+                division_code,
+                gender_code,
+                checkpoint_date,
+                algorithm_type,
+                scoring_group,
+                anet_athlete_hnd,
+                athlete_name_first,
+                athlete_name_last,
+                anet_team_hnd,
+                team_name,
+                team_group_fk,
+                athlete_rank,
+                xcri_score,
+                races_count,
+                season_average,
+                best_performance,
+                h2h_wins,
+                h2h_losses,
+                h2h_meetings,
+                h2h_win_rate,
+                min_opponent_quality,
+                avg_opponent_quality,
+                scs_score,
+                scs_rank,
+                saga_score,
+                saga_rank,
+                sewr_score,
+                sewr_rank,
+                osma_score,
+                osma_rank,
+                calculated_at,
+                algorithm_version,
+                processing_time_seconds
+            FROM iz_rankings_xcri_athlete_rankings
+            WHERE {where_sql}
+            ORDER BY calculated_at DESC
+        """
+        await cursor.execute(query_sql, params)
+        rows = await cursor.fetchall()
+
+    # Most recent record per handle (rows are newest first)
+    by_handle: Dict[int, Dict[str, Any]] = {}
+    for row in rows:
+        by_handle.setdefault(row['anet_athlete_hnd'], row)
+
+    results = [by_handle[h] for h in handles if h in by_handle]
+    not_found = [h for h in handles if h not in by_handle]
+
+    logger.info(
+        f"Athletes bulk query: season={season_year}, division={division}, gender={gender}, "
+        f"requested={len(handles)}, found={len(results)}"
+    )
+
+    return results, not_found
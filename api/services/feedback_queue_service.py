@@ -0,0 +1,392 @@
+"""
+XCRI Rankings API - Feedback Queue
+
+Durable queue between the feedback form and GitHub. POST /feedback/ stores
+the submission in a local SQLite file (FEEDBACK_QUEUE_PATH) and returns at
+once; a background worker in each API worker process turns queued
+submissions into GitHub issues:
+
+- One shared httpx.AsyncClient (GITHUB_API_URL, so tests can point it at a
+  local mock server).
+- Network errors, 429 and 5xx responses are retried with exponential
+  backoff and jitter (FEEDBACK_RETRY_BASE_SECONDS doubling up to
+  FEEDBACK_RETRY_MAX_SECONDS, or the server's Retry-After), up to
+  FEEDBACK_MAX_ATTEMPTS; other 4xx responses fail the submission at once.
+- Workers claim a submission with a lease (an atomic UPDATE), so several
+  uvicorn workers can drain the same file. A worker that dies mid-send
+  leaves the lease to expire and the submission is retried: delivery is at
+  least once.
+
+Submissions survive restarts and GitHub outages; sent and failed rows stay
+in the file with their issue number or last error.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import sqlite3
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import httpx
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Idle poll interval (submissions enqueued by other workers, due retries)
+POLL_SECONDS = 5.0
+# How long a claimed submission stays reserved for the claiming worker
+LEASE_SECONDS = 60.0
+HTTP_TIMEOUT_SECONDS = 10.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS feedback_queue (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    claimed_until REAL,
+    last_error TEXT,
+    issue_number INTEGER,
+    issue_url TEXT,
+    created_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_feedback_queue_due ON feedback_queue (status, next_attempt_at);
+"""
+
+TYPE_LABELS = {
+    "bug": ["bug", "user-feedback"],
+    "feedback": ["enhancement", "user-feedback"],
+    "question": ["question", "user-feedback"]
+}
+
+TYPE_TITLES = {
+    "bug": "Bug Report",
+    "feedback": "User Feedback",
+    "question": "User Question"
+}
+
+
+def build_issue(submission: Dict[str, Any]) -> Dict[str, Any]:
+    """GitHub issue title, body and labels for a feedback submission"""
+    feedback_type = submission["feedback_type"]
+    message = submission["message"]
+
+    issue_body = f"""## {TYPE_TITLES[feedback_type]}
+
+**Message:**
+{message}
+
+---
+
+**Submitted by:** {submission.get('name') or 'Anonymous'}
+**Email:** {submission.get('email') or 'Not provided'}
+**Type:** {feedback_type}
+**Date:** {submission['submitted_at']}
+**Source:** XCRI Feedback Form
+"""
+
+    # Truncate message for title if needed
+    title_message = message[:80] + "..." if len(message) > 80 else message
+
+    return {
+        "title": f"[User {TYPE_TITLES[feedback_type]}] {title_message}",
+        "body": issue_body,
+        "labels": TYPE_LABELS[feedback_type]
+    }
+
+
+def _retryable(status_code: int) -> bool:
+    return status_code == 429 or status_code >= 500
+
+
+class FeedbackQueue:
+    """SQLite-backed submission queue with a GitHub delivery worker"""
+
+    def __init__(self):
+        self._path: Optional[str] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+
+    # ---------------------------------------------------------------
+    # Storage (blocking; called through asyncio.to_thread)
+    # ---------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._path or settings.feedback_queue_path, timeout=10, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self) -> None:
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    def _insert(self, payload: str) -> int:
+        now = time.time()
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "INSERT INTO feedback_queue (payload, next_attempt_at, created_at) VALUES (?, ?, ?)",
+                (payload, now, now)
+            )
+            return cursor.lastrowid
+        finally:
+            conn.close()
+
+    def _claim(self) -> Optional[sqlite3.Row]:
+        """Reserve the oldest due submission for this worker"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                """
+                SELECT id, payload, attempts FROM feedback_queue
+                WHERE status = 'pending' AND next_attempt_at <= ?
+                  AND (claimed_until IS NULL OR claimed_until < ?)
+                ORDER BY id LIMIT 1
+                """,
+                (now, now)
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE feedback_queue SET claimed_until = ? WHERE id = ?",
+                    (now + LEASE_SECONDS, row["id"])
+                )
+            conn.execute("COMMIT")
+            return row
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _update(self, submission_id: int, **fields: Any) -> None:
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        conn = self._connect()
+        try:
+            conn.execute(
+                f"UPDATE feedback_queue SET {assignments} WHERE id = ?",
+                (*fields.values(), submission_id)
+            )
+        finally:
+            conn.close()
+
+    def _counts(self) -> Dict[str, int]:
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT status, COUNT(*) AS n FROM feedback_queue GROUP BY status").fetchall()
+        finally:
+            conn.close()
+        counts = {"pending": 0, "sent": 0, "failed": 0}
+        counts.update({row["status"]: row["n"] for row in rows})
+        return counts
+
+    # ---------------------------------------------------------------
+    # Queue API
+    # ---------------------------------------------------------------
+
+    async def enqueue(self, submission: Dict[str, Any]) -> int:
+        """Store a submission durably; returns its queue id"""
+        payload = json.dumps({
+            **submission,
+            "submitted_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')
+        })
+        submission_id = await asyncio.to_thread(self._insert, payload)
+        self._wakeup.set()
+        return submission_id
+
+    async def get_stats(self) -> Dict[str, int]:
+        return await asyncio.to_thread(self._counts)
+
+    # ---------------------------------------------------------------
+    # Delivery worker
+    # ---------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Create the queue file if needed and start the delivery worker"""
+        if self._task is not None and not self._task.done():
+            return
+        self._path = settings.feedback_queue_path
+        await asyncio.to_thread(self._init_db)
+        self._wakeup = asyncio.Event()
+        self._client = httpx.AsyncClient(base_url=settings.github_api_url, timeout=HTTP_TIMEOUT_SECONDS)
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Feedback queue started ({self._path})")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._step()
+            except Exception as e:
+                # Keep the worker alive (locked queue file, disk errors)
+                logger.error(f"Feedback queue worker error: {e}", exc_info=True)
+                await asyncio.sleep(POLL_SECONDS)
+
+    async def _step(self) -> None:
+        """Deliver one due submission, or wait for one"""
+        self._wakeup.clear()
+        job = None
+        if settings.github_token:
+            try:
+                job = await asyncio.to_thread(self._claim)
+            except Exception as e:
+                logger.warning(f"Feedback queue claim failed: {e}")
+
+        if job is None:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            return
+
+        try:
+            await self._deliver(job)
+        except Exception as e:
+            # Unexpected errors (bad payload, storage) count as attempts and
+            # back off like GitHub failures, so they cannot loop
+            logger.error(f"Feedback {job['id']} delivery error: {e}", exc_info=True)
+            await self._retry(job["id"], job["attempts"] + 1, f"{type(e).__name__}: {e}")
+
+    async def _deliver(self, job: sqlite3.Row) -> None:
+        """Create the GitHub issue for one claimed submission"""
+        submission_id = job["id"]
+        attempts = job["attempts"] + 1
+        submission = json.loads(job["payload"])
+
+        try:
+            response = await self._client.post(
+                f"/repos/{settings.github_repo}/issues",
+                json=build_issue(submission),
+                headers={
+                    "Authorization": f"Bearer {settings.github_token}",
+                    "Accept": "application/vnd.github+json",
+                    "X-GitHub-Api-Version": "2022-11-28"
+                }
+            )
+        except httpx.HTTPError as e:
+            await self._retry(submission_id, attempts, f"{type(e).__name__}: {e}")
+            return
+
+        if response.status_code == 201:
+            # The issue exists: never retry (and duplicate it) over its body
+            try:
+                issue = response.json()
+            except ValueError:
+                issue = {}
+            await self._mark_sent(submission_id, attempts, issue)
+            logger.info(f"Feedback {submission_id} created GitHub issue #{issue.get('number')}")
+            return
+
+        error = f"HTTP {response.status_code}: {response.text[:500]}"
+        if _retryable(response.status_code):
+            retry_after = response.headers.get("retry-after")
+            await self._retry(
+                submission_id,
+                attempts,
+                error,
+                float(retry_after) if retry_after and retry_after.isdigit() else None
+            )
+            return
+
+        await asyncio.to_thread(
+            self._update,
+            submission_id,
+            status="failed",
+            attempts=attempts,
+            claimed_until=None,
+            last_error=error,
+            finished_at=time.time()
+        )
+        logger.error(f"Feedback {submission_id} rejected by GitHub, not retried: {error}")
+
+    async def _mark_sent(self, submission_id: int, attempts: int, issue: Dict[str, Any]) -> None:
+        """
+        Record a created issue, retrying the write until it sticks.
+
+        Only the storage write is retried: failing over to _retry would post
+        the issue again. The worker delivers nothing else meanwhile; if the
+        file stays unwritable past the lease, another worker may still
+        redeliver (at least once).
+        """
+        while True:
+            try:
+                await asyncio.to_thread(
+                    self._update,
+                    submission_id,
+                    status="sent",
+                    attempts=attempts,
+                    claimed_until=None,
+                    issue_number=issue.get("number"),
+                    issue_url=issue.get("html_url"),
+                    finished_at=time.time()
+                )
+                return
+            except Exception as e:
+                logger.error(
+                    f"Feedback {submission_id} created issue #{issue.get('number')} but could not "
+                    f"be marked sent ({e}); retrying in {POLL_SECONDS:.0f}s"
+                )
+                await asyncio.sleep(POLL_SECONDS)
+
+    async def _retry(
+        self,
+        submission_id: int,
+        attempts: int,
+        error: str,
+        retry_after: Optional[float] = None
+    ) -> None:
+        """Schedule another attempt with backoff, or give up after the last one"""
+        if attempts >= settings.feedback_max_attempts:
+            await asyncio.to_thread(
+                self._update,
+                submission_id,
+                status="failed",
+                attempts=attempts,
+                claimed_until=None,
+                last_error=error,
+                finished_at=time.time()
+            )
+            logger.error(f"Feedback {submission_id} failed after {attempts} attempts: {error}")
+            return
+
+        backoff = min(
+            settings.feedback_retry_max_seconds,
+            settings.feedback_retry_base_seconds * 2 ** (attempts - 1)
+        )
+        delay = max(retry_after or 0.0, random.uniform(backoff / 2, backoff))
+        await asyncio.to_thread(
+            self._update,
+            submission_id,
+            attempts=attempts,
+            claimed_until=None,
+            last_error=error,
+            next_attempt_at=time.time() + delay
+        )
+        logger.warning(f"Feedback {submission_id} attempt {attempts} failed ({error}); retrying in {delay:.1f}s")
+
+
+# Global queue (one delivery worker per API worker process)
+feedback_queue = FeedbackQueue()
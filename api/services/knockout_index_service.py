@@ -0,0 +1,218 @@
+"""
+Team Knockout API - Opponent Index
+
+In-memory index of head-to-head records per Team Knockout context
+(season, rank group type, rank group, gender, checkpoint):
+
+    team_id -> {opponent_id: [wins, losses]}
+
+built once per calculation from iz_rankings_xcri_team_knockout_matchups, so a
+common-opponent query is a set intersection of two teams' opponent keys
+instead of a self-join of the matchups table.
+
+The index for a context is built in a background task the first time it is
+requested; until it is ready, get_common_opponents() computes the same
+records from the two teams' matchups only. A new calculation (newer
+calculated_at in the calculation metadata, checked at most once per
+KNOCKOUT_INDEX_REFRESH_SECONDS) discards every built index.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from config import settings
+from database_async import get_db_cursor
+
+logger = logging.getLogger(__name__)
+
+# (season_year, rank_group_type, rank_group_fk, gender_code, checkpoint_date)
+ContextKey = Tuple[int, str, int, str, Optional[str]]
+# team_id -> {opponent_id: [wins, losses]}
+OpponentRecords = Dict[int, Dict[int, List[int]]]
+
+
+def build_opponent_records(rows: Iterable[Dict[str, Any]]) -> OpponentRecords:
+    """
+    Aggregate matchup rows into per-team opponent records.
+
+    A matchup counts as a win for the winner and a loss for the other team;
+    matchups without a winner (ties) count for neither.
+    """
+    records: OpponentRecords = {}
+    for row in rows:
+        team_a, team_b, winner = row['team_a_id'], row['team_b_id'], row['winner_team_id']
+        for team, opponent in ((team_a, team_b), (team_b, team_a)):
+            record = records.setdefault(team, {}).setdefault(opponent, [0, 0])
+            if winner == team:
+                record[0] += 1
+            elif winner is not None:
+                record[1] += 1
+    return records
+
+
+def find_common_opponents(
+    records: OpponentRecords,
+    team_names: Dict[int, str],
+    team_a_id: int,
+    team_b_id: int
+) -> List[Dict[str, Any]]:
+    """
+    Common opponents of two teams with each team's record against them.
+
+    Ordered by combined wins (team A + team B) descending, then opponent id.
+    """
+    a_opponents = records.get(team_a_id, {})
+    b_opponents = records.get(team_b_id, {})
+    shared = (a_opponents.keys() & b_opponents.keys()) - {team_a_id, team_b_id}
+
+    result = [
+        {
+            'opponent_id': opponent,
+            'opponent_name': team_names.get(opponent),
+            'team_a_wins': a_opponents[opponent][0],
+            'team_a_losses': a_opponents[opponent][1],
+            'team_b_wins': b_opponents[opponent][0],
+            'team_b_losses': b_opponents[opponent][1],
+        }
+        for opponent in shared
+    ]
+    result.sort(key=lambda o: (-(o['team_a_wins'] + o['team_b_wins']), o['opponent_id']))
+    return result
+
+
+def context_where(
+    season_year: int,
+    rank_group_type: str,
+    rank_group_fk: int,
+    gender_code: str,
+    checkpoint_date: Optional[str]
+) -> Tuple[str, List[Any]]:
+    """WHERE clause (and params) selecting one Team Knockout context"""
+    where_clauses = [
+        "season_year = %s",
+        "rank_group_type = %s",
+        "rank_group_fk = %s",
+        "gender_code = %s"
+    ]
+    params: List[Any] = [season_year, rank_group_type, rank_group_fk, gender_code]
+
+    if checkpoint_date:
+        where_clauses.append("checkpoint_date = %s")
+        params.append(checkpoint_date)
+    else:
+        where_clauses.append("checkpoint_date IS NULL")
+
+    return " AND ".join(where_clauses), params
+
+
+class KnockoutIndexService:
+    """
+    Per-context opponent indexes, built in the background and invalidated
+    when a new calculation is published.
+    """
+
+    def __init__(self):
+        # context -> {"records": OpponentRecords, "names": {team_id: name}, ...}
+        self._indexes: "OrderedDict[ContextKey, Dict[str, Any]]" = OrderedDict()
+        self._builds: Dict[ContextKey, asyncio.Task] = {}
+        self._calculated_at = None
+        self._last_check: float = 0.0
+        self._check_lock = asyncio.Lock()
+
+    async def get_index(self, context: ContextKey) -> Optional[Dict[str, Any]]:
+        """
+        Return the index for a context, or None while it is being built.
+
+        The first request for a context schedules the build and returns None.
+        """
+        await self._check_calculation()
+
+        index = self._indexes.get(context)
+        if index is not None:
+            self._indexes.move_to_end(context)
+            return index
+
+        if context not in self._builds:
+            task = asyncio.create_task(self._build(context, self._calculated_at))
+            self._builds[context] = task
+            task.add_done_callback(lambda _: self._builds.pop(context, None))
+        return None
+
+    async def _check_calculation(self) -> None:
+        """Drop all indexes when calculation metadata shows a newer run"""
+        if time.monotonic() - self._last_check < settings.knockout_index_refresh_seconds:
+            return
+
+        async with self._check_lock:
+            if time.monotonic() - self._last_check < settings.knockout_index_refresh_seconds:
+                return
+
+            async with get_db_cursor(primary=True) as cursor:
+                await cursor.execute(
+                    "SELECT MAX(calculated_at) as calculated_at FROM iz_rankings_xcri_calculation_metadata"
+                )
+                row = await cursor.fetchone()
+            calculated_at = row['calculated_at'] if row else None
+            self._last_check = time.monotonic()
+
+            if calculated_at != self._calculated_at:
+                if self._indexes:
+                    logger.info(
+                        f"Knockout opponent index: new calculation ({calculated_at}), "
+                        f"dropping {len(self._indexes)} context index(es)"
+                    )
+                self._indexes.clear()
+                self._calculated_at = calculated_at
+
+    async def _build(self, context: ContextKey, calculated_at) -> None:
+        """Load one context's matchups and team names and index them"""
+        started = time.perf_counter()
+        where_sql, params = context_where(*context)
+
+        try:
+            # Indexed under the primary's calculation, so read from the primary
+            async with get_db_cursor(primary=True) as cursor:
+                await cursor.execute(f"""
+                    SELECT team_a_id, team_b_id, winner_team_id
+                    FROM iz_rankings_xcri_team_knockout_matchups
+                    WHERE {where_sql}
+                """, params)
+                rows = await cursor.fetchall()
+
+                await cursor.execute(f"""
+                    SELECT team_id, team_name
+                    FROM iz_rankings_xcri_team_knockout
+                    WHERE {where_sql}
+                """, params)
+                names = {row['team_id']: row['team_name'] for row in await cursor.fetchall()}
+
+            # Aggregate off the event loop: LIVE contexts hold tens of thousands of matchups
+            records = await asyncio.to_thread(build_opponent_records, rows)
+        except Exception as e:
+            logger.error(f"Knockout opponent index build failed for {context}: {e}", exc_info=True)
+            return
+
+        # A newer calculation landed while building: the result is already stale
+        if calculated_at != self._calculated_at:
+            return
+
+        self._indexes[context] = {
+            "records": records,
+            "names": names,
+            "matchups": len(rows),
+            "built_at": time.time(),
+        }
+        while len(self._indexes) > settings.knockout_index_max_contexts:
+            self._indexes.popitem(last=False)
+
+        logger.info(
+            f"Knockout opponent index built: context={context}, teams={len(records)}, "
+            f"matchups={len(rows)}, {(time.perf_counter() - started) * 1000:.0f}ms"
+        )
+
+
+# Global service instance
+knockout_index_service = KnockoutIndexService()
@@ -272,8 +272,8 @@ async def get_processing_summary() -> Dict[str, Any]:
               AND algorithm_type = 'light'
               AND scoring_group = 'division'
         """
-        cursor.execute(query_sql)
-        result = cursor.fetchone()
+        await cursor.execute(query_sql)
+        result = await cursor.fetchone()
 
         logger.info("Processing summary retrieved")
 
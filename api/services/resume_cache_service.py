@@ -0,0 +1,104 @@
+"""
+XCRI Rankings API - Season Resume Cache
+
+Two caches in front of iz_groups_season_resumes:
+
+- Team mapping: anet_team_hnd -> USTFCCCA group_fk(s), from iz_athnet_teams
+  (IDSchool -> UstfcccaId). Teams rarely change, so entries live for
+  RESUME_TEAM_MAP_TTL_SECONDS and resume queries filter on group_fk
+  directly instead of joining iz_athnet_teams.
+- Encoded resumes: the serialized /teams/{hnd}/resume body, pre-compressed
+  (gzip, and brotli when installed) with a content-addressed ETag. Keyed by
+  resume (id, updated_at), so a regenerated resume is a new key and stale
+  bodies simply age out. Least recently used bodies are evicted beyond
+  RESUME_CACHE_MAX_BYTES.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+from compression import EncodedBody, encode_body
+from config import settings
+from database_async import get_db_cursor
+
+logger = logging.getLogger(__name__)
+
+# (resume id, updated_at)
+ResumeKey = Tuple[int, Any]
+
+
+class ResumeCacheService:
+    """Team -> group_fk mapping and pre-compressed resume bodies"""
+
+    def __init__(self):
+        # anet_team_hnd -> (group_fks, fetched_at)
+        self._group_fks: "OrderedDict[int, Tuple[List[int], float]]" = OrderedDict()
+        self._bodies: "OrderedDict[ResumeKey, EncodedBody]" = OrderedDict()
+        self._bytes = 0
+        self._encodes: Dict[ResumeKey, asyncio.Task] = {}
+
+    async def get_group_fks(self, anet_team_hnd: int) -> List[int]:
+        """USTFCCCA group ids of a team (empty if the team is unknown)"""
+        cached = self._group_fks.get(anet_team_hnd)
+        if cached is not None and time.monotonic() - cached[1] < settings.resume_team_map_ttl_seconds:
+            self._group_fks.move_to_end(anet_team_hnd)
+            return cached[0]
+
+        async with get_db_cursor() as cursor:
+            await cursor.execute(
+                "SELECT DISTINCT UstfcccaId FROM iz_athnet_teams WHERE IDSchool = %s",
+                [anet_team_hnd]
+            )
+            group_fks = [row['UstfcccaId'] for row in await cursor.fetchall() if row['UstfcccaId'] is not None]
+
+        self._group_fks[anet_team_hnd] = (group_fks, time.monotonic())
+        self._group_fks.move_to_end(anet_team_hnd)
+        while len(self._group_fks) > settings.resume_team_map_max_entries:
+            self._group_fks.popitem(last=False)
+
+        return group_fks
+
+    async def get_body(self, key: ResumeKey, build) -> EncodedBody:
+        """
+        Encoded body for a resume version, building it on a miss.
+
+        build: coroutine function returning the uncompressed body bytes.
+        Concurrent misses for the same key share one build.
+        """
+        body = self._bodies.get(key)
+        if body is not None:
+            self._bodies.move_to_end(key)
+            return body
+
+        task = self._encodes.get(key)
+        if task is None:
+            task = asyncio.create_task(self._encode(key, build))
+            self._encodes[key] = task
+            task.add_done_callback(lambda _: self._encodes.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _encode(self, key: ResumeKey, build) -> EncodedBody:
+        started = time.perf_counter()
+        # Compression is CPU-bound: keep it off the event loop
+        body = await asyncio.to_thread(encode_body, await build())
+
+        if body.size <= settings.resume_cache_max_bytes:
+            self._bodies[key] = body
+            self._bytes += body.size
+            while self._bytes > settings.resume_cache_max_bytes:
+                _, evicted = self._bodies.popitem(last=False)
+                self._bytes -= evicted.size
+
+        logger.info(
+            f"Resume cached: id={key[0]}, identity={len(body.identity)}B, "
+            + ", ".join(f"{enc}={len(data)}B" for enc, data in body.encoded.items())
+            + f", {(time.perf_counter() - started) * 1000:.0f}ms"
+        )
+        return body
+
+
+# Global service instance
+resume_cache_service = ResumeCacheService()
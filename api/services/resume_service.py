@@ -9,6 +9,9 @@ import logging
 from typing import Optional, Dict, Any
 
 from database_async import get_db_cursor
+from models import SeasonResume
+from compression import EncodedBody
+from services.resume_cache_service import resume_cache_service
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +20,8 @@ async def get_team_resume(
     anet_team_hnd: int,
     season_year: int = 2025,
     division_code: Optional[int] = None,
-    gender_code: Optional[str] = None
+    gender_code: Optional[str] = None,
+    include_html: bool = True
 ) -> Optional[Dict[str, Any]]:
     """
     Get season resume for a specific team.
@@ -27,6 +31,7 @@ async def get_team_resume(
         season_year: Season year (default: 2025)
         division_code: Division code (optional, currently not used in query)
         gender_code: Gender code M/F (optional)
+        include_html: Select season_html (default: True); False returns it as None
 
     Returns:
         Resume record dictionary or None if not found
@@ -41,6 +46,12 @@ async def get_team_resume(
             'updated_at': datetime
         }
     """
+    # Map anet_team_hnd to group_fk from the cached team mapping (no JOIN)
+    group_fks = await resume_cache_service.get_group_fks(anet_team_hnd)
+    if not group_fks:
+        logger.info(f"Resume not found: anet_team_hnd={anet_team_hnd} has no USTFCCCA group")
+        return None
+
     async with get_db_cursor() as cursor:
         # Build WHERE clause
         # Map gender code (M/F) to gender_fk (1/2)
@@ -49,11 +60,11 @@ async def get_team_resume(
             gender_fk = 1 if gender_code.upper() == 'M' else 2
 
         where_clauses = [
-            "t.IDSchool = %s",
+            f"r.group_fk IN ({', '.join(['%s'] * len(group_fks))})",
             "r.season_year = %s",
             "r.sport_fk = 3"  # 3 = Cross Country
         ]
-        params = [anet_team_hnd, season_year]
+        params = [*group_fks, season_year]
 
         if gender_fk is not None:
             where_clauses.append("r.gender_fk = %s")
@@ -61,7 +72,9 @@ async def get_team_resume(
 
         where_sql = " AND ".join(where_clauses)
 
-        # Join through iz_athnet_teams to map anet_team_hnd to group_fk
+        # season_html is the bulk of the row; skip it when only metadata is needed
+        html_column = "r.season_html" if include_html else "NULL AS season_html"
+
         query_sql = f"""
             SELECT
                 r.id,
@@ -69,11 +82,10 @@ async def get_team_resume(
                 r.group_fk,
                 r.gender_fk,
                 r.sport_fk,
-                r.season_html,
+                {html_column},
                 r.created_at,
                 r.updated_at
             FROM iz_groups_season_resumes r
-            JOIN iz_athnet_teams t ON r.group_fk = t.UstfcccaId
             WHERE {where_sql}
             ORDER BY r.updated_at DESC
             LIMIT 1
@@ -93,3 +105,53 @@ async def get_team_resume(
             )
 
         return result
+
+
+async def get_resume_html(resume_id: int) -> Optional[str]:
+    """Get the season_html of one resume record"""
+    async with get_db_cursor() as cursor:
+        await cursor.execute(
+            "SELECT season_html FROM iz_groups_season_resumes WHERE id = %s",
+            [resume_id]
+        )
+        row = await cursor.fetchone()
+
+    return row['season_html'] if row else None
+
+
+async def get_team_resume_encoded(
+    anet_team_hnd: int,
+    season_year: int = 2025,
+    division_code: Optional[int] = None,
+    gender_code: Optional[str] = None
+) -> Optional[EncodedBody]:
+    """
+    Get a team's season resume as a pre-compressed JSON body.
+
+    Looks up the current resume version without its HTML; the HTML is only
+    read and compressed when that (id, updated_at) is not cached yet.
+
+    Args:
+        anet_team_hnd: AthleticNet team handle (IDSchool in iz_athnet_teams)
+        season_year: Season year (default: 2025)
+        division_code: Division code (optional, currently not used in query)
+        gender_code: Gender code M/F (optional)
+
+    Returns:
+        Encoded SeasonResume body or None if not found
+    """
+    resume = await get_team_resume(
+        anet_team_hnd=anet_team_hnd,
+        season_year=season_year,
+        division_code=division_code,
+        gender_code=gender_code,
+        include_html=False
+    )
+    if not resume:
+        return None
+
+    async def build() -> bytes:
+        season_html = await get_resume_html(resume['id'])
+        return SeasonResume(**{**resume, 'season_html': season_html or ''}).model_dump_json().encode()
+
+    return await resume_cache_service.get_body((resume['id'], resume['updated_at']), build)
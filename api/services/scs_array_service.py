@@ -0,0 +1,411 @@
+"""
+XCRI Rankings API - SCS Score Arrays
+
+Cached NumPy arrays of SCS component scores per division slice
+(season_year, division_code, gender_code), loaded with one query from
+iz_rankings_xcri_scs_components:
+
+    handles             anet_athlete_hnd per row
+    scores[component]   float64 scores, NaN where the component is NULL
+    ranks[component]    float64 ranks, NaN where NULL
+
+Distribution statistics are computed from these arrays instead of pulling
+every score through SQL per request, and memoized per (slice, component,
+bins, percentiles).
+
+A DiscrepancyIndex per slice joins the LIVE XCRI Light athlete_rank
+(iz_rankings_xcri_athlete_rankings) with the SCS ranks by athlete handle,
+so rank-discrepancy lookups and top-K lists need no SQL join.
+
+Everything is dropped when the SCS table changes (row count or
+MAX(updated_at)) or a new calculation is recorded in the calculation
+metadata, checked at most once per SCS_CACHE_REFRESH_SECONDS.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import settings
+from database_async import get_db_cursor
+
+logger = logging.getLogger(__name__)
+
+COMPONENTS = ('saga', 'sewr', 'osma', 'xcri')
+
+# (season_year, division_code, gender_code)
+SliceKey = Tuple[int, int, str]
+
+
+def _column(rows: List[Dict[str, Any]], name: str) -> np.ndarray:
+    """Numeric column as float64 with NULL -> NaN"""
+    return np.array(
+        [np.nan if row[name] is None else float(row[name]) for row in rows],
+        dtype=np.float64
+    )
+
+
+def ordinal(p: float) -> str:
+    """Percentile label: 25 -> '25th', 1 -> '1st', 2.5 -> '2.5th'"""
+    label = f"{p:g}"
+    if p != int(p) or 10 <= int(p) % 100 <= 20:
+        return f"{label}th"
+    return label + {1: "st", 2: "nd", 3: "rd"}.get(int(p) % 10, "th")
+
+
+class ScsSlice:
+    """Score and rank arrays for one (season, division, gender) slice"""
+
+    def __init__(self, key: SliceKey, rows: List[Dict[str, Any]]):
+        self.key = key
+        self.handles = np.array([row['anet_athlete_hnd'] for row in rows], dtype=np.int64)
+        self.scores = {c: _column(rows, f"{c}_score") for c in COMPONENTS}
+        self.ranks = {c: _column(rows, f"{c}_rank") for c in COMPONENTS}
+        self._sorted: Dict[str, np.ndarray] = {}
+        self._higher_is_better: Dict[str, bool] = {}
+        # Handle lookup: unique handles in ascending order and their first row
+        self._lookup_handles, self._lookup_rows = np.unique(self.handles, return_index=True)
+
+    def __len__(self) -> int:
+        return len(self.handles)
+
+    def rows_for(self, handles: Sequence[int]) -> np.ndarray:
+        """Row index of each handle in the slice, -1 where not present"""
+        wanted = np.asarray(handles, dtype=np.int64)
+        if len(self._lookup_handles) == 0:
+            return np.full(len(wanted), -1, dtype=np.int64)
+        positions = np.searchsorted(self._lookup_handles, wanted)
+        positions = np.minimum(positions, len(self._lookup_handles) - 1)
+        found = self._lookup_handles[positions] == wanted
+        return np.where(found, self._lookup_rows[positions], -1)
+
+    def higher_is_better(self, component: str) -> bool:
+        """Score direction, read from the ranks: does rank 1 hold the highest score?"""
+        direction = self._higher_is_better.get(component)
+        if direction is None:
+            scores, ranks = self.scores[component], self.ranks[component]
+            ranked = ~np.isnan(scores) & ~np.isnan(ranks)
+            if ranked.sum() < 2:
+                direction = True
+            else:
+                best, worst = np.argmin(np.where(ranked, ranks, np.inf)), np.argmax(np.where(ranked, ranks, -np.inf))
+                direction = bool(scores[best] >= scores[worst])
+            self._higher_is_better[component] = direction
+        return direction
+
+    def percentiles(self, component: str, scores: np.ndarray) -> np.ndarray:
+        """
+        Exact percentile of each score among the slice's non-NULL scores.
+
+        Percentile = share of scored athletes with a strictly worse score,
+        so tied athletes share a percentile, the best scored athlete gets
+        (n - 1) / n and the worst 0. NULL scores give NaN.
+        """
+        values = self.sorted_scores(component)
+        scores = np.asarray(scores, dtype=np.float64)
+        if len(values) == 0:
+            return np.full(len(scores), np.nan)
+
+        if self.higher_is_better(component):
+            worse = np.searchsorted(values, scores, side='left')
+        else:
+            worse = len(values) - np.searchsorted(values, scores, side='right')
+        return np.where(np.isnan(scores), np.nan, np.round(worse * 100.0 / len(values), 1))
+
+    def sorted_scores(self, component: str) -> np.ndarray:
+        """Non-NULL scores of a component in ascending order (cached)"""
+        values = self._sorted.get(component)
+        if values is None:
+            scores = self.scores[component]
+            values = np.sort(scores[~np.isnan(scores)])
+            self._sorted[component] = values
+        return values
+
+
+class DiscrepancyIndex:
+    """
+    XCRI Light rank vs SCS rank for the athletes of one slice that have both.
+
+    discrepancy = xcri_rank - athlete_rank: positive when XCRI Light ranks
+    the athlete better than SCS (wins races despite slower times), negative
+    when SCS ranks them better (fast times, fewer quality wins).
+    """
+
+    def __init__(self, scs_slice: ScsSlice, rankings: List[Dict[str, Any]]):
+        ranking_handles = np.array([row['anet_athlete_hnd'] for row in rankings], dtype=np.int64)
+        athlete_ranks = _column(rankings, 'athlete_rank')
+        scs_rows = scs_slice.rows_for(ranking_handles)
+
+        xcri_ranks = np.full(len(rankings), np.nan)
+        matched = scs_rows >= 0
+        xcri_ranks[matched] = scs_slice.ranks['xcri'][scs_rows[matched]]
+        keep = matched & ~np.isnan(athlete_ranks) & ~np.isnan(xcri_ranks)
+
+        self.handles = ranking_handles[keep]
+        self.athlete_rank = athlete_ranks[keep].astype(np.int64)
+        self.xcri_rank = xcri_ranks[keep].astype(np.int64)
+        self.discrepancy = self.xcri_rank - self.athlete_rank
+        self.component_ranks = {
+            c: scs_slice.ranks[c][scs_rows[keep]] for c in ('saga', 'sewr', 'osma')
+        }
+
+        kept = np.flatnonzero(keep)
+        self.athletes = [
+            {
+                'athlete_name_first': rankings[i]['athlete_name_first'],
+                'athlete_name_last': rankings[i]['athlete_name_last'],
+                'team_name': rankings[i]['team_name'],
+            }
+            for i in kept
+        ]
+        self._lookup_handles, self._lookup_rows = np.unique(self.handles, return_index=True)
+
+    def __len__(self) -> int:
+        return len(self.handles)
+
+    def row_for(self, handle: int) -> Optional[int]:
+        """Row of an athlete handle, or None"""
+        position = int(np.searchsorted(self._lookup_handles, handle))
+        if position < len(self._lookup_handles) and self._lookup_handles[position] == handle:
+            return int(self._lookup_rows[position])
+        return None
+
+    def entry(self, row: int) -> Dict[str, Any]:
+        """Discrepancy record for one row"""
+        return {
+            'athlete_hnd': int(self.handles[row]),
+            **self.athletes[row],
+            'athlete_rank': int(self.athlete_rank[row]),
+            'xcri_rank': int(self.xcri_rank[row]),
+            'discrepancy': int(self.discrepancy[row]),
+            'abs_discrepancy': abs(int(self.discrepancy[row])),
+        }
+
+    def top(self, limit: int, direction: str = "any") -> List[int]:
+        """
+        Rows with the largest discrepancies, biggest first (ties by XCRI Light rank).
+
+        direction: 'any' (absolute), 'light' (XCRI Light rank better) or
+        'scs' (SCS rank better). Uses a partial sort: O(n) selection of the
+        top `limit`, then sorting only those.
+        """
+        if direction == "light":
+            values = self.discrepancy
+        elif direction == "scs":
+            values = -self.discrepancy
+        else:
+            values = np.abs(self.discrepancy)
+
+        candidates = np.flatnonzero(values > 0)
+        k = min(limit, len(candidates))
+        if k == 0:
+            return []
+
+        selected = candidates[np.argpartition(-values[candidates], k - 1)[:k]]
+        order = np.lexsort((self.athlete_rank[selected], -values[selected]))
+        return [int(i) for i in selected[order]]
+
+
+def compute_distribution(values: np.ndarray, bins: int, percentiles: Sequence[float]) -> Dict[str, Any]:
+    """
+    Statistics, percentiles and histogram of a sorted score array.
+
+    std is the population standard deviation (as MySQL STDDEV); percentiles
+    use linear interpolation between closest ranks.
+    """
+    if len(values) == 0:
+        return {
+            'statistics': {'min': None, 'max': None, 'mean': None, 'std': None, 'count': 0},
+            'percentiles': {ordinal(p): None for p in percentiles},
+            'histogram': [],
+        }
+
+    counts, edges = np.histogram(values, bins=bins)
+    points = np.percentile(values, percentiles) if percentiles else []
+
+    return {
+        'statistics': {
+            'min': float(values[0]),
+            'max': float(values[-1]),
+            'mean': float(values.mean()),
+            'std': float(values.std()),
+            'count': int(len(values)),
+        },
+        'percentiles': {ordinal(p): float(v) for p, v in zip(percentiles, points)},
+        'histogram': [
+            {'lower': float(edges[i]), 'upper': float(edges[i + 1]), 'count': int(counts[i])}
+            for i in range(len(counts))
+        ],
+    }
+
+
+class ScsArrayService:
+    """
+    Per-slice SCS score arrays, memoized distributions and rank-discrepancy
+    indexes, invalidated when the SCS table or the calculation changes.
+    """
+
+    def __init__(self):
+        self._slices: "OrderedDict[SliceKey, ScsSlice]" = OrderedDict()
+        self._loading: Dict[SliceKey, asyncio.Task] = {}
+        self._distributions: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._discrepancies: "OrderedDict[SliceKey, DiscrepancyIndex]" = OrderedDict()
+        self._version: Optional[tuple] = None
+        self._last_check: float = 0.0
+        self._check_lock = asyncio.Lock()
+
+    async def get_slice(self, season_year: int, division: int, gender: str) -> ScsSlice:
+        """Score arrays for a slice, loading them on first use"""
+        await self._check_version()
+
+        key = (season_year, division, gender.upper())
+        scs_slice = self._slices.get(key)
+        if scs_slice is not None:
+            self._slices.move_to_end(key)
+            return scs_slice
+
+        # Concurrent requests for the same slice share one load
+        task = self._loading.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key))
+            self._loading[key] = task
+            task.add_done_callback(lambda _: self._loading.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def get_distribution(
+        self,
+        component: str,
+        season_year: int,
+        division: int,
+        gender: str,
+        bins: int,
+        percentiles: Sequence[float]
+    ) -> Dict[str, Any]:
+        """Memoized distribution of one component over a slice"""
+        scs_slice = await self.get_slice(season_year, division, gender)
+        memo_key = (scs_slice.key, component, bins, tuple(percentiles))
+
+        result = self._distributions.get(memo_key)
+        if result is None:
+            result = compute_distribution(scs_slice.sorted_scores(component), bins, percentiles)
+            self._distributions[memo_key] = result
+            while len(self._distributions) > settings.scs_cache_max_slices * 8:
+                self._distributions.popitem(last=False)
+        else:
+            self._distributions.move_to_end(memo_key)
+        return result
+
+    async def get_discrepancy_index(self, season_year: int, division: int, gender: str) -> DiscrepancyIndex:
+        """XCRI Light vs SCS rank index for a slice, built on first use"""
+        scs_slice = await self.get_slice(season_year, division, gender)
+        version = self._version
+
+        index = self._discrepancies.get(scs_slice.key)
+        if index is not None:
+            self._discrepancies.move_to_end(scs_slice.key)
+            return index
+
+        # LIVE XCRI Light rankings of the slice (same context as /athletes/);
+        # cached per version, so read from the primary
+        async with get_db_cursor(primary=True) as cursor:
+            await cursor.execute("""
+                SELECT anet_athlete_hnd, athlete_rank, athlete_name_first, athlete_name_last, team_name
+                FROM iz_rankings_xcri_athlete_rankings
+                WHERE season_year = %s
+                  AND division_code = %s
+                  AND gender_code = %s
+                  AND checkpoint_date IS NULL
+                  AND algorithm_type = %s
+                  AND scoring_group = %s
+            """, list(scs_slice.key) + ["light", "division"])
+            rankings = await cursor.fetchall()
+
+        index = DiscrepancyIndex(scs_slice, rankings)
+        if version == self._version:
+            self._discrepancies[scs_slice.key] = index
+            while len(self._discrepancies) > settings.scs_cache_max_slices:
+                self._discrepancies.popitem(last=False)
+
+        logger.info(
+            f"Rank discrepancy index built: season={season_year}, division={division}, "
+            f"gender={gender}, athletes={len(index)}"
+        )
+        return index
+
+    async def _load(self, key: SliceKey) -> ScsSlice:
+        started = time.perf_counter()
+        version = self._version
+        # Cached per version, so read from the primary
+        async with get_db_cursor(primary=True) as cursor:
+            await cursor.execute("""
+                SELECT
+                    anet_athlete_hnd,
+                    saga_score, saga_rank,
+                    sewr_score, sewr_rank,
+                    osma_score, osma_rank,
+                    xcri_score, xcri_rank
+                FROM iz_rankings_xcri_scs_components
+                WHERE season_year = %s
+                  AND division_code = %s
+                  AND gender_code = %s
+            """, list(key))
+            rows = await cursor.fetchall()
+
+        scs_slice = ScsSlice(key, rows)
+        # Not cached if the table changed while loading (answers this request only)
+        if version != self._version:
+            return scs_slice
+        self._slices[key] = scs_slice
+        while len(self._slices) > settings.scs_cache_max_slices:
+            self._slices.popitem(last=False)
+
+        logger.info(
+            f"SCS score arrays loaded: season={key[0]}, division={key[1]}, gender={key[2]}, "
+            f"athletes={len(scs_slice)}, {(time.perf_counter() - started) * 1000:.0f}ms"
+        )
+        return scs_slice
+
+    async def _check_version(self) -> None:
+        """Drop cached arrays when the SCS table changed or a new calculation ran"""
+        if time.monotonic() - self._last_check < settings.scs_cache_refresh_seconds:
+            return
+
+        async with self._check_lock:
+            if time.monotonic() - self._last_check < settings.scs_cache_refresh_seconds:
+                return
+
+            async with get_db_cursor(primary=True) as cursor:
+                await cursor.execute("""
+                    SELECT COUNT(*) as total, MAX(updated_at) as updated_at
+                    FROM iz_rankings_xcri_scs_components
+                """)
+                row = await cursor.fetchone()
+                await cursor.execute(
+                    "SELECT MAX(calculated_at) as calculated_at FROM iz_rankings_xcri_calculation_metadata"
+                )
+                calculation = await cursor.fetchone()
+            version = (
+                row['total'] if row else None,
+                row['updated_at'] if row else None,
+                calculation['calculated_at'] if calculation else None
+            )
+            self._last_check = time.monotonic()
+
+            if version != self._version:
+                if self._slices:
+                    logger.info(
+                        f"SCS components or calculation changed ({version}), dropping "
+                        f"{len(self._slices)} cached slice(s)"
+                    )
+                self._slices.clear()
+                self._distributions.clear()
+                self._discrepancies.clear()
+                self._version = version
+
+
+# Global service instance
+scs_array_service = ScsArrayService()
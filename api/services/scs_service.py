@@ -5,9 +5,12 @@ Business logic for querying SCS component breakdowns from database.
 """
 
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Sequence
+
+import numpy as np
 
 from database_async import get_db_cursor
+from services.scs_array_service import COMPONENTS, scs_array_service
 
 logger = logging.getLogger(__name__)
 
@@ -236,85 +239,146 @@ async def get_component_comparison(
         if not athlete_data:
             return None
 
-        # Get division totals for percentile calculation
-        totals_sql = """
-            SELECT COUNT(*) as total_athletes
-            FROM iz_rankings_xcri_scs_components
-            WHERE season_year = %s
-              AND division_code = %s
-              AND gender_code = %s
-        """
-        await cursor.execute(totals_sql, [season_year, division, gender])
-        totals = await cursor.fetchone()
-        total_athletes = totals['total_athletes']
-
-        # Calculate percentiles
-        def calc_percentile(rank, total):
-            if rank is None or total == 0:
-                return None
-            return round((1 - (rank / total)) * 100, 1)
-
-        result = {
-            'athlete_info': {
-                'athlete_hnd': athlete_data['anet_athlete_hnd'],
-                'name': f"{athlete_data['athlete_name_first']} {athlete_data['athlete_name_last']}",
-                'team': athlete_data['team_name'],
-                'races_used': athlete_data['races_used'],
-                'total_opponents': athlete_data['total_opponents']
+    # Division context from the cached score arrays (exact, NULL-aware percentiles)
+    scs_slice = await scs_array_service.get_slice(season_year, division, gender)
+    total_athletes = len(scs_slice)
+
+    def calc_percentile(component):
+        score = athlete_data[f"{component}_score"]
+        if score is None:
+            return None
+        return float(scs_slice.percentiles(component, [float(score)])[0])
+
+    result = {
+        'athlete_info': {
+            'athlete_hnd': athlete_data['anet_athlete_hnd'],
+            'name': f"{athlete_data['athlete_name_first']} {athlete_data['athlete_name_last']}",
+            'team': athlete_data['team_name'],
+            'races_used': athlete_data['races_used'],
+            'total_opponents': athlete_data['total_opponents']
+        },
+        'components': {
+            'saga': {
+                'score': float(athlete_data['saga_score']) if athlete_data['saga_score'] else None,
+                'rank': athlete_data['saga_rank'],
+                'percentile': calc_percentile('saga'),
+                'description': 'Season Adjusted Gap Average'
             },
-            'components': {
-                'saga': {
-                    'score': float(athlete_data['saga_score']) if athlete_data['saga_score'] else None,
-                    'rank': athlete_data['saga_rank'],
-                    'percentile': calc_percentile(athlete_data['saga_rank'], total_athletes),
-                    'description': 'Season Adjusted Gap Average'
-                },
-                'sewr': {
-                    'score': float(athlete_data['sewr_score']) if athlete_data['sewr_score'] else None,
-                    'rank': athlete_data['sewr_rank'],
-                    'percentile': calc_percentile(athlete_data['sewr_rank'], total_athletes),
-                    'description': 'Season Equal-Weight Rating (own performance)'
-                },
-                'osma': {
-                    'score': float(athlete_data['osma_score']) if athlete_data['osma_score'] else None,
-                    'rank': athlete_data['osma_rank'],
-                    'percentile': calc_percentile(athlete_data['osma_rank'], total_athletes),
-                    'description': 'Opponent Strength of Schedule'
-                },
-                'xcri': {
-                    'score': float(athlete_data['xcri_score']) if athlete_data['xcri_score'] else None,
-                    'rank': athlete_data['xcri_rank'],
-                    'percentile': calc_percentile(athlete_data['xcri_rank'], total_athletes),
-                    'description': 'Final SCS = (0.6 × SEWR) + (0.4 × OSMA)'
-                }
+            'sewr': {
+                'score': float(athlete_data['sewr_score']) if athlete_data['sewr_score'] else None,
+                'rank': athlete_data['sewr_rank'],
+                'percentile': calc_percentile('sewr'),
+                'description': 'Season Equal-Weight Rating (own performance)'
             },
-            'detail_metrics': {
-                'ags': {
-                    'best': float(athlete_data['best_ags']) if athlete_data['best_ags'] else None,
-                    'average': float(athlete_data['avg_ags']) if athlete_data['avg_ags'] else None,
-                    'worst': float(athlete_data['worst_ags']) if athlete_data['worst_ags'] else None
-                },
-                'cpr': {
-                    'best': float(athlete_data['best_cpr']) if athlete_data['best_cpr'] else None,
-                    'average': float(athlete_data['avg_cpr']) if athlete_data['avg_cpr'] else None,
-                    'worst': float(athlete_data['worst_cpr']) if athlete_data['worst_cpr'] else None
-                }
+            'osma': {
+                'score': float(athlete_data['osma_score']) if athlete_data['osma_score'] else None,
+                'rank': athlete_data['osma_rank'],
+                'percentile': calc_percentile('osma'),
+                'description': 'Opponent Strength of Schedule'
             },
-            'context': {
-                'total_athletes': total_athletes,
-                'season_year': season_year,
-                'division_code': division,
-                'gender_code': gender
+            'xcri': {
+                'score': float(athlete_data['xcri_score']) if athlete_data['xcri_score'] else None,
+                'rank': athlete_data['xcri_rank'],
+                'percentile': calc_percentile('xcri'),
+                'description': 'Final SCS = (0.6 × SEWR) + (0.4 × OSMA)'
             }
+        },
+        'detail_metrics': {
+            'ags': {
+                'best': float(athlete_data['best_ags']) if athlete_data['best_ags'] else None,
+                'average': float(athlete_data['avg_ags']) if athlete_data['avg_ags'] else None,
+                'worst': float(athlete_data['worst_ags']) if athlete_data['worst_ags'] else None
+            },
+            'cpr': {
+                'best': float(athlete_data['best_cpr']) if athlete_data['best_cpr'] else None,
+                'average': float(athlete_data['avg_cpr']) if athlete_data['avg_cpr'] else None,
+                'worst': float(athlete_data['worst_cpr']) if athlete_data['worst_cpr'] else None
+            }
+        },
+        'context': {
+            'total_athletes': total_athletes,
+            # Percentiles are relative to athletes with a score for the component
+            'scored_athletes': {c: len(scs_slice.sorted_scores(c)) for c in COMPONENTS},
+            'season_year': season_year,
+            'division_code': division,
+            'gender_code': gender
         }
+    }
 
-        logger.info(
-            f"Component comparison: athlete_hnd={athlete_hnd}, "
-            f"SAGA %tile={result['components']['saga']['percentile']}, "
-            f"SEWR %tile={result['components']['sewr']['percentile']}"
+    logger.info(
+        f"Component comparison: athlete_hnd={athlete_hnd}, "
+        f"SAGA %tile={result['components']['saga']['percentile']}, "
+        f"SEWR %tile={result['components']['sewr']['percentile']}"
+    )
+
+    return result
+
+
+async def get_component_percentiles_bulk(
+    athlete_hnds: List[int],
+    season_year: int = 2024,
+    division: int = 2030,
+    gender: str = 'M'
+) -> Dict[str, Any]:
+    """
+    Get SCS component scores, ranks and percentiles for many athletes at once.
+
+    One vectorized lookup against the cached score arrays of the division
+    (e.g. for a team roster); no per-athlete queries.
+
+    Args:
+        athlete_hnds: AthleticNet athlete handles (results keep this order)
+        season_year: Season year
+        division: Division code
+        gender: Gender code
+
+    Returns:
+        Dict with context, per-athlete results and handles not found
+    """
+    scs_slice = await scs_array_service.get_slice(season_year, division, gender)
+    rows = scs_slice.rows_for(athlete_hnds)
+    found = rows >= 0
+    found_rows = rows[found]
+
+    components = {}
+    for component in COMPONENTS:
+        scores = scs_slice.scores[component][found_rows]
+        components[component] = (
+            scores,
+            scs_slice.ranks[component][found_rows],
+            scs_slice.percentiles(component, scores)
         )
 
-        return result
+    def value(array, i, cast):
+        return None if np.isnan(array[i]) else cast(array[i])
+
+    results = []
+    for i, athlete_hnd in enumerate(np.asarray(athlete_hnds)[found]):
+        entry = {'athlete_hnd': int(athlete_hnd)}
+        for component, (scores, ranks, percentiles) in components.items():
+            entry[component] = {
+                'score': value(scores, i, float),
+                'rank': value(ranks, i, int),
+                'percentile': value(percentiles, i, float)
+            }
+        results.append(entry)
+
+    not_found = [int(h) for h in np.asarray(athlete_hnds)[~found]]
+
+    logger.info(
+        f"Component percentiles (bulk): season={season_year}, division={division}, gender={gender}, "
+        f"requested={len(athlete_hnds)}, found={len(results)}"
+    )
+
+    return {
+        'season_year': season_year,
+        'division_code': division,
+        'gender_code': gender,
+        'total_athletes': len(scs_slice),
+        'scored_athletes': {c: len(scs_slice.sorted_scores(c)) for c in COMPONENTS},
+        'results': results,
+        'not_found': not_found
+    }
 
 
 async def get_component_distribution(
@@ -322,92 +386,151 @@ async def get_component_distribution(
     season_year: int = 2024,
     division: int = 2030,
     gender: str = 'M',
-    bins: int = 10
+    bins: int = 10,
+    percentiles: Sequence[float] = (25, 50, 75)
 ) -> Dict[str, Any]:
     """
     Get distribution statistics for a specific component.
 
+    Computed from the cached score array of the division
+    (scs_array_service) and memoized until the SCS table changes.
+
     Args:
         component: Component name ('saga', 'sewr', 'osma', or 'xcri')
         season_year: Season year
         division: Division code
         gender: Gender code
         bins: Number of bins for histogram (default: 10)
+        percentiles: Percentiles to report, 0-100 (default: 25, 50, 75)
 
     Returns:
-        Dict with min, max, mean, median, std, histogram
+        Dict with min, max, mean, std, count, percentiles and histogram
     """
     # Validate component
     valid_components = {'saga', 'sewr', 'osma', 'xcri'}
     if component.lower() not in valid_components:
         raise ValueError(f"Invalid component: {component}")
 
+    invalid = [p for p in percentiles if not 0 <= p <= 100]
+    if invalid:
+        raise ValueError(f"Percentiles must be between 0 and 100: {invalid}")
+
     component = component.lower()
-    score_col = f"{component}_score"
 
-    async with get_db_cursor() as cursor:
-        # Get distribution statistics
-        stats_sql = f"""
-            SELECT
-                MIN({score_col}) as min_score,
-                MAX({score_col}) as max_score,
-                AVG({score_col}) as mean_score,
-                STDDEV({score_col}) as std_score,
-                COUNT(*) as total_count
-            FROM iz_rankings_xcri_scs_components
-            WHERE season_year = %s
-              AND division_code = %s
-              AND gender_code = %s
-              AND {score_col} IS NOT NULL
-        """
-        await cursor.execute(stats_sql, [season_year, division, gender])
-        stats = await cursor.fetchone()
+    distribution = await scs_array_service.get_distribution(
+        component, season_year, division, gender, bins, percentiles
+    )
+
+    result = {
+        'component': component.upper(),
+        'statistics': distribution['statistics'],
+        'percentiles': distribution['percentiles'],
+        'histogram': distribution['histogram'],
+        'context': {
+            'season_year': season_year,
+            'division_code': division,
+            'gender_code': gender
+        }
+    }
 
-        # Get percentiles (25th, 50th, 75th)
-        # Note: MySQL doesn't have built-in PERCENTILE function, so we approximate
-        percentile_sql = f"""
-            SELECT {score_col}
-            FROM iz_rankings_xcri_scs_components
-            WHERE season_year = %s
-              AND division_code = %s
-              AND gender_code = %s
-              AND {score_col} IS NOT NULL
-            ORDER BY {score_col}
-        """
-        await cursor.execute(percentile_sql, [season_year, division, gender])
-        all_scores = [row[score_col] for row in await cursor.fetchall()]
-
-        def get_percentile(scores, p):
-            if not scores:
-                return None
-            index = int(len(scores) * p / 100)
-            return float(scores[index])
-
-        result = {
-            'component': component.upper(),
-            'statistics': {
-                'min': float(stats['min_score']) if stats['min_score'] else None,
-                'max': float(stats['max_score']) if stats['max_score'] else None,
-                'mean': float(stats['mean_score']) if stats['mean_score'] else None,
-                'std': float(stats['std_score']) if stats['std_score'] else None,
-                'count': stats['total_count']
-            },
-            'percentiles': {
-                '25th': get_percentile(all_scores, 25),
-                '50th': get_percentile(all_scores, 50),  # median
-                '75th': get_percentile(all_scores, 75)
-            },
-            'context': {
-                'season_year': season_year,
-                'division_code': division,
-                'gender_code': gender
-            }
+    logger.info(
+        f"Component distribution: {component.upper()}, "
+        f"count={result['statistics']['count']}, mean={result['statistics']['mean']}, "
+        f"std={result['statistics']['std']}, bins={bins}"
+    )
+
+    return result
+
+
+async def get_rank_discrepancy(
+    athlete_hnd: int,
+    season_year: int = 2024,
+    division: int = 2030,
+    gender: str = 'M'
+) -> Optional[Dict[str, Any]]:
+    """
+    Get an athlete's XCRI Light rank vs SCS ranks.
+
+    Args:
+        athlete_hnd: AthleticNet athlete handle
+        season_year: Season year
+        division: Division code
+        gender: Gender code
+
+    Returns:
+        Dict with both ranks, the discrepancy and per-component rank
+        differences, or None if the athlete lacks either rank
+    """
+    index = await scs_array_service.get_discrepancy_index(season_year, division, gender)
+    row = index.row_for(athlete_hnd)
+
+    if row is None:
+        logger.warning(f"Rank discrepancy not found: athlete_hnd={athlete_hnd}")
+        return None
+
+    result = index.entry(row)
+    athlete_rank = result['athlete_rank']
+    result['component_discrepancies'] = {
+        component: {
+            'rank': None if np.isnan(ranks[row]) else int(ranks[row]),
+            'discrepancy': None if np.isnan(ranks[row]) else int(ranks[row]) - athlete_rank
         }
+        for component, ranks in index.component_ranks.items()
+    }
+    # Position among all athletes of the slice by absolute discrepancy (1 = biggest)
+    result['discrepancy_position'] = int((np.abs(index.discrepancy) > result['abs_discrepancy']).sum()) + 1
+    result['context'] = {
+        'athletes_compared': len(index),
+        'season_year': season_year,
+        'division_code': division,
+        'gender_code': gender
+    }
+
+    logger.info(
+        f"Rank discrepancy: athlete_hnd={athlete_hnd}, light={athlete_rank}, "
+        f"scs={result['xcri_rank']}, discrepancy={result['discrepancy']}"
+    )
+
+    return result
+
+
+async def get_biggest_rank_discrepancies(
+    season_year: int = 2024,
+    division: int = 2030,
+    gender: str = 'M',
+    limit: int = 25,
+    direction: str = 'any'
+) -> Dict[str, Any]:
+    """
+    Get athletes with the biggest gaps between XCRI Light rank and SCS rank.
 
-        logger.info(
-            f"Component distribution: {component.upper()}, "
-            f"mean={result['statistics']['mean']:.2f}, "
-            f"std={result['statistics']['std']:.2f}"
-        )
+    Args:
+        season_year: Season year
+        division: Division code
+        gender: Gender code
+        limit: Number of results
+        direction: 'any', 'light' (Light rank better) or 'scs' (SCS rank better)
 
-        return result
+    Returns:
+        Dict with context and results ordered by discrepancy size
+    """
+    if direction not in ('any', 'light', 'scs'):
+        raise ValueError(f"Invalid direction: {direction}. Must be one of any, light, scs")
+
+    index = await scs_array_service.get_discrepancy_index(season_year, division, gender)
+    results = [index.entry(row) for row in index.top(limit, direction)]
+
+    logger.info(
+        f"Biggest rank discrepancies: season={season_year}, division={division}, gender={gender}, "
+        f"direction={direction}, compared={len(index)}, returned={len(results)}"
+    )
+
+    return {
+        'season_year': season_year,
+        'division_code': division,
+        'gender_code': gender,
+        'direction': direction,
+        'athletes_compared': len(index),
+        'limit': limit,
+        'results': results
+    }
@@ -4,32 +4,79 @@ XCRI Rankings API - Snapshot Service
 Business logic for retrieving historical snapshot data from MySQL database.
 """
 
+import asyncio
 import logging
+import time
 from typing import List, Dict, Tuple, Optional
+
+from config import settings
 from database_async import get_db_cursor
 
 logger = logging.getLogger(__name__)
 
 
 class SnapshotService:
-    """Service for managing historical ranking snapshots"""
+    """
+    Service for managing historical ranking snapshots.
+
+    Keeps an in-memory snapshot catalogue. Historical checkpoints are
+    immutable once a newer checkpoint exists, so after the first full scan
+    the catalogue is only extended by querying checkpoint dates >= the
+    newest known date (the newest date is re-counted in case it was still
+    being written).
+    """
 
     def __init__(self):
         """Initialize snapshot service"""
-        pass
+        # date (YYYY-MM-DD) -> catalogue entry
+        self._catalogue: Dict[str, Dict] = {}
+        # date (YYYY-MM-DD) -> get_snapshot_metadata() result (frozen dates only)
+        self._metadata_cache: Dict[str, Dict] = {}
+        self._latest_date: Optional[str] = None
+        self._last_refresh: float = 0.0
+        self._refresh_lock = asyncio.Lock()
 
     async def list_snapshots(self) -> List[Dict]:
         """
-        List all available snapshot dates from MySQL.
+        List all available snapshot dates from the cached catalogue.
 
         Returns:
             List of snapshot dictionaries with date, season, divisions, and athlete count
         """
-        snapshots = []
-
         try:
+            await self._refresh_catalogue()
+        except Exception as e:
+            logger.error(f"Error listing snapshots from MySQL: {e}", exc_info=True)
+            if not self._catalogue:
+                return []
+
+        return sorted(self._catalogue.values(), key=lambda s: s['date'], reverse=True)
+
+    async def _refresh_catalogue(self) -> None:
+        """Extend the catalogue with new checkpoints (at most once per refresh interval)"""
+        if time.monotonic() - self._last_refresh < settings.snapshot_catalogue_refresh_seconds:
+            return
+
+        async with self._refresh_lock:
+            # Another request may have refreshed while we waited
+            if time.monotonic() - self._last_refresh < settings.snapshot_catalogue_refresh_seconds:
+                return
+
+            where_clauses = [
+                "checkpoint_date IS NOT NULL",
+                "algorithm_type = %s",
+                "scoring_group = %s"
+            ]
+            params = ["light", "division"]
+
+            if self._latest_date:
+                where_clauses.append("checkpoint_date >= %s")
+                params.append(self._latest_date)
+
+            where_sql = " AND ".join(where_clauses)
+
             async with get_db_cursor() as cursor:
-                query = """
+                query = f"""
                 SELECT
                     checkpoint_date as date,
                     season_year as season,
@@ -37,33 +84,37 @@ class SnapshotService:
                     COUNT(DISTINCT gender_code) as genders,
                     COUNT(*) as total_athletes
                 FROM iz_rankings_xcri_athlete_rankings
-                WHERE checkpoint_date IS NOT NULL
-                    AND algorithm_type = %s
-                    AND scoring_group = %s
+                WHERE {where_sql}
                 GROUP BY checkpoint_date, season_year
-                ORDER BY checkpoint_date DESC
                 """
-                await cursor.execute(query, ["light", "division"])
+                await cursor.execute(query, params)
                 results = await cursor.fetchall()
 
-                for row in results:
-                    snapshot_date = row['date'].strftime('%Y-%m-%d') if row['date'] else None
-                    if snapshot_date:
-                        snapshots.append({
-                            "date": snapshot_date,
-                            "season": row['season'],
-                            "divisions": row['divisions'],
-                            "genders": row['genders'],
-                            "total_athletes": row['total_athletes'],
-                            "display_name": self._format_display_date(snapshot_date)
-                        })
-
-                logger.info(f"Found {len(snapshots)} snapshots in MySQL")
-                return snapshots
+            for row in results:
+                snapshot_date = row['date'].strftime('%Y-%m-%d') if row['date'] else None
+                if not snapshot_date:
+                    continue
+                self._catalogue[snapshot_date] = {
+                    "date": snapshot_date,
+                    "season": row['season'],
+                    "divisions": row['divisions'],
+                    "genders": row['genders'],
+                    "total_athletes": row['total_athletes'],
+                    "display_name": self._format_display_date(snapshot_date)
+                }
 
-        except Exception as e:
-            logger.error(f"Error listing snapshots from MySQL: {e}", exc_info=True)
-            return []
+            if self._catalogue:
+                self._latest_date = max(self._catalogue)
+            self._last_refresh = time.monotonic()
+
+            logger.info(
+                f"Snapshot catalogue refreshed: {len(results)} checkpoint(s) scanned, "
+                f"{len(self._catalogue)} cached, latest={self._latest_date}"
+            )
+
+    def _is_frozen(self, snapshot_date: str) -> bool:
+        """A checkpoint is immutable once a newer checkpoint exists"""
+        return self._latest_date is not None and snapshot_date < self._latest_date
 
     async def get_snapshot_athletes(
         self,
@@ -274,6 +325,16 @@ class SnapshotService:
         Returns:
             Metadata dictionary
         """
+        cached = self._metadata_cache.get(snapshot_date)
+        if cached is not None:
+            return cached
+
+        # Keep _latest_date current so the result can be frozen below
+        try:
+            await self._refresh_catalogue()
+        except Exception as e:
+            logger.warning(f"Snapshot catalogue refresh failed: {e}")
+
         try:
             season = int(snapshot_date[:4])
 
@@ -311,7 +372,7 @@ class SnapshotService:
                         "athlete_count": row['athlete_count']
                     })
 
-                return {
+                metadata = {
                     "date": snapshot_date,
                     "season": season,
                     "divisions_available": divisions_available,
@@ -319,6 +380,11 @@ class SnapshotService:
                     "status": "available"
                 }
 
+                if self._is_frozen(snapshot_date):
+                    self._metadata_cache[snapshot_date] = metadata
+
+                return metadata
+
         except Exception as e:
             logger.error(f"Error getting snapshot metadata for {snapshot_date}: {e}", exc_info=True)
             return {
@@ -12,6 +12,12 @@ from typing import Optional, Tuple, List, Dict, Any
 from datetime import date
 
 from database_async import get_db_cursor
+from query_shapes import query_registry
+from services.knockout_index_service import (
+    build_opponent_records,
+    find_common_opponents,
+    knockout_index_service
+)
 
 logger = logging.getLogger(__name__)
 
@@ -383,41 +389,35 @@ async def get_head_to_head(
         Dict with h2h stats and matchup list
     """
     async with get_db_cursor() as cursor:
-        # Build WHERE clause (with table alias for use in subqueries)
+        # Build WHERE clause; {col} is the table alias prefix ("" in the
+        # subquery, "m." in the main query)
         where_clauses = [
-            "((team_a_id = %s AND team_b_id = %s) OR (team_a_id = %s AND team_b_id = %s))",
-            "season_year = %s",
-            "rank_group_type = %s"
+            "(({col}team_a_id = %s AND {col}team_b_id = %s) OR ({col}team_a_id = %s AND {col}team_b_id = %s))",
+            "{col}season_year = %s",
+            "{col}rank_group_type = %s"
         ]
         params = [team_a_id, team_b_id, team_b_id, team_a_id, season_year, rank_group_type]
 
         if rank_group_fk is not None:
-            where_clauses.append("rank_group_fk = %s")
+            where_clauses.append("{col}rank_group_fk = %s")
             params.append(rank_group_fk)
 
         if gender_code:
-            where_clauses.append("gender_code = %s")
+            where_clauses.append("{col}gender_code = %s")
             params.append(gender_code.upper())
 
         if checkpoint_date:
-            where_clauses.append("checkpoint_date = %s")
+            where_clauses.append("{col}checkpoint_date = %s")
             params.append(checkpoint_date)
         else:
-            where_clauses.append("checkpoint_date IS NULL")
-
-        where_sql = " AND ".join(where_clauses)
+            where_clauses.append("{col}checkpoint_date IS NULL")
 
-        # Build WHERE clause with table alias for main query
-        where_sql_with_alias = where_sql.replace("team_a_id", "m.team_a_id") \
-                                       .replace("team_b_id", "m.team_b_id") \
-                                       .replace("season_year", "m.season_year") \
-                                       .replace("rank_group_type", "m.rank_group_type") \
-                                       .replace("rank_group_fk", "m.rank_group_fk") \
-                                       .replace("gender_code", "m.gender_code") \
-                                       .replace("checkpoint_date", "m.checkpoint_date")
+        where_template = " AND ".join(where_clauses)
+        where_sql = where_template.format(col="")
+        where_sql_with_alias = where_template.format(col="m.")
 
         # Get H2H statistics
-        stats_sql = f"""
+        stats_shape = query_registry.shape("knockout.h2h_stats", where_template, lambda: f"""
             SELECT
                 COUNT(*) as total_matchups,
                 SUM(CASE WHEN m.winner_team_id = %s THEN 1 ELSE 0 END) as team_a_wins,
@@ -427,13 +427,12 @@ async def get_head_to_head(
                     THEN m.winner_team_id ELSE NULL END) as latest_winner_id
             FROM iz_rankings_xcri_team_knockout_matchups m
             WHERE {where_sql_with_alias}
-        """
-        await cursor.execute(stats_sql, [team_a_id, team_b_id] + params + params)
-        stats = await cursor.fetchone()
+        """)
+        stats = await stats_shape.fetchone(cursor, [team_a_id, team_b_id] + params + params)
 
         # Get matchup details
         # Session 031: Added meet_id, team_a_ko_rank, team_b_ko_rank
-        query_sql = f"""
+        query_shape = query_registry.shape("knockout.h2h_matchups", where_template, lambda: f"""
             SELECT
                 m.matchup_id,
                 m.race_hnd,
@@ -482,9 +481,8 @@ async def get_head_to_head(
                 AND COALESCE(m.checkpoint_date, '9999-12-31') = COALESCE(tw.checkpoint_date, '9999-12-31')
             WHERE {where_sql_with_alias}
             ORDER BY m.race_date DESC
-        """
-        await cursor.execute(query_sql, params)
-        matchups = await cursor.fetchall()
+        """)
+        matchups = await query_shape.fetchall(cursor, params)
 
         # Get team names
         team_a_name = matchups[0]['team_a_name'] if matchups and matchups[0]['team_a_id'] == team_a_id else None
@@ -634,6 +632,11 @@ async def get_common_opponents(
     """
     Find common opponents between two teams.
 
+    With a full context (rank_group_fk and gender_code), records come from
+    the per-context opponent index (knockout_index_service). While that index
+    is being built, or for partial contexts, only the two teams' matchups
+    are read and intersected the same way.
+
     Args:
         team_a_id: First team identifier (required)
         team_b_id: Second team identifier (required)
@@ -646,99 +649,145 @@ async def get_common_opponents(
     Returns:
         Dict with common opponent analysis
     """
+    gender_code = gender_code.upper() if gender_code else None
+    common_opponents = None
+    source = "pair"
+
+    if rank_group_fk is not None and gender_code:
+        context = (season_year, rank_group_type, rank_group_fk, gender_code, checkpoint_date)
+        index = await knockout_index_service.get_index(context)
+        if index is not None:
+            common_opponents = find_common_opponents(
+                index['records'], index['names'], team_a_id, team_b_id
+            )
+            source = "index"
+
+    if common_opponents is None:
+        common_opponents = await _get_pair_common_opponents(
+            team_a_id, team_b_id, season_year, rank_group_type,
+            rank_group_fk, gender_code, checkpoint_date
+        )
+
+    # Calculate summary statistics
+    team_a_total_wins = sum(opp['team_a_wins'] for opp in common_opponents)
+    team_a_total_losses = sum(opp['team_a_losses'] for opp in common_opponents)
+    team_b_total_wins = sum(opp['team_b_wins'] for opp in common_opponents)
+    team_b_total_losses = sum(opp['team_b_losses'] for opp in common_opponents)
+
+    result = {
+        'team_a_id': team_a_id,
+        'team_a_name': None,  # Will be filled by route handler if needed
+        'team_b_id': team_b_id,
+        'team_b_name': None,  # Will be filled by route handler if needed
+        'total_common_opponents': len(common_opponents),
+        'team_a_record_vs_common': f"{team_a_total_wins}-{team_a_total_losses}",
+        'team_b_record_vs_common': f"{team_b_total_wins}-{team_b_total_losses}",
+        'common_opponents': common_opponents
+    }
+
+    logger.info(
+        f"Common opponents: team_a={team_a_id} vs team_b={team_b_id}, "
+        f"total_common={result['total_common_opponents']}, source={source}"
+    )
+
+    return result
+
+
+async def _get_pair_common_opponents(
+    team_a_id: int,
+    team_b_id: int,
+    season_year: int,
+    rank_group_type: str,
+    rank_group_fk: Optional[int],
+    gender_code: Optional[str],
+    checkpoint_date: Optional[str]
+) -> List[Dict[str, Any]]:
+    """
+    Common opponents from the two teams' matchups only.
+
+    Records are kept per (rank_group_fk, gender_code) so that, as with a full
+    context, a team only counts as a common opponent within one ranking
+    group; with a partial context the per-group records are summed.
+    """
     async with get_db_cursor() as cursor:
-        # Build WHERE clause
-        where_clauses = ["m1.season_year = %s", "m1.rank_group_type = %s"]
-        params = [season_year, rank_group_type]
+        where_clauses = [
+            "(team_a_id IN (%s, %s) OR team_b_id IN (%s, %s))",
+            "season_year = %s",
+            "rank_group_type = %s"
+        ]
+        params = [team_a_id, team_b_id, team_a_id, team_b_id, season_year, rank_group_type]
 
         if rank_group_fk is not None:
-            where_clauses.append("m1.rank_group_fk = %s")
+            where_clauses.append("rank_group_fk = %s")
             params.append(rank_group_fk)
 
         if gender_code:
-            where_clauses.append("m1.gender_code = %s")
-            params.append(gender_code.upper())
+            where_clauses.append("gender_code = %s")
+            params.append(gender_code)
 
         if checkpoint_date:
-            where_clauses.append("m1.checkpoint_date = %s")
-            where_clauses.append("m2.checkpoint_date = %s")
-            params.extend([checkpoint_date, checkpoint_date])
+            where_clauses.append("checkpoint_date = %s")
+            params.append(checkpoint_date)
         else:
-            where_clauses.append("m1.checkpoint_date IS NULL")
-            where_clauses.append("m2.checkpoint_date IS NULL")
+            where_clauses.append("checkpoint_date IS NULL")
 
         where_sql = " AND ".join(where_clauses)
 
-        # Find common opponents
-        query_sql = f"""
-            SELECT
-                CASE
-                    WHEN m1.team_a_id = %s THEN m1.team_b_id
-                    ELSE m1.team_a_id
-                END as opponent_id,
-                MAX(t.team_name) as opponent_name,
-                SUM(CASE WHEN m1.winner_team_id = %s THEN 1 ELSE 0 END) as team_a_wins,
-                SUM(CASE WHEN m1.winner_team_id != %s THEN 1 ELSE 0 END) as team_a_losses,
-                SUM(CASE WHEN m2.winner_team_id = %s THEN 1 ELSE 0 END) as team_b_wins,
-                SUM(CASE WHEN m2.winner_team_id != %s THEN 1 ELSE 0 END) as team_b_losses
-            FROM iz_rankings_xcri_team_knockout_matchups m1
-            INNER JOIN iz_rankings_xcri_team_knockout_matchups m2
-                ON (
-                    (m1.team_a_id != %s AND m1.team_a_id != %s AND (m2.team_a_id = m1.team_a_id OR m2.team_b_id = m1.team_a_id))
-                    OR
-                    (m1.team_b_id != %s AND m1.team_b_id != %s AND (m2.team_a_id = m1.team_b_id OR m2.team_b_id = m1.team_b_id))
-                )
-                AND (m2.team_a_id = %s OR m2.team_b_id = %s)
-                AND m1.season_year = m2.season_year
-                AND m1.rank_group_type = m2.rank_group_type
-                AND m1.rank_group_fk = m2.rank_group_fk
-                AND m1.gender_code = m2.gender_code
-            LEFT JOIN iz_rankings_xcri_team_knockout t
-                ON CASE
-                    WHEN m1.team_a_id = %s THEN m1.team_b_id
-                    ELSE m1.team_a_id
-                END = t.team_id
-                AND m1.season_year = t.season_year
-                AND m1.rank_group_type = t.rank_group_type
-                AND m1.rank_group_fk = t.rank_group_fk
-                AND m1.gender_code = t.gender_code
-                AND COALESCE(m1.checkpoint_date, '9999-12-31') = COALESCE(t.checkpoint_date, '9999-12-31')
-            WHERE (m1.team_a_id = %s OR m1.team_b_id = %s)
-              AND {where_sql}
-            GROUP BY opponent_id
-            HAVING opponent_id NOT IN (%s, %s)
-            ORDER BY (SUM(CASE WHEN m1.winner_team_id = %s THEN 1 ELSE 0 END) + SUM(CASE WHEN m2.winner_team_id = %s THEN 1 ELSE 0 END)) DESC
-        """
-
-        query_params = [
-            team_a_id, team_a_id, team_a_id, team_b_id, team_b_id,  # CASE and SUM clauses
-            team_a_id, team_b_id, team_a_id, team_b_id, team_b_id, team_b_id,  # JOIN conditions
-            team_a_id, team_a_id, team_a_id,  # WHERE and LEFT JOIN
-        ] + params + [team_a_id, team_b_id, team_a_id, team_b_id]  # HAVING + ORDER BY clauses
-
-        await cursor.execute(query_sql, query_params)
-        common_opponents = await cursor.fetchall()
-
-        # Calculate summary statistics
-        team_a_total_wins = sum(opp['team_a_wins'] for opp in common_opponents)
-        team_a_total_losses = sum(opp['team_a_losses'] for opp in common_opponents)
-        team_b_total_wins = sum(opp['team_b_wins'] for opp in common_opponents)
-        team_b_total_losses = sum(opp['team_b_losses'] for opp in common_opponents)
-
-        result = {
-            'team_a_id': team_a_id,
-            'team_a_name': None,  # Will be filled by route handler if needed
-            'team_b_id': team_b_id,
-            'team_b_name': None,  # Will be filled by route handler if needed
-            'total_common_opponents': len(common_opponents),
-            'team_a_record_vs_common': f"{team_a_total_wins}-{team_a_total_losses}",
-            'team_b_record_vs_common': f"{team_b_total_wins}-{team_b_total_losses}",
-            'common_opponents': common_opponents
-        }
-
-        logger.info(
-            f"Common opponents: team_a={team_a_id} vs team_b={team_b_id}, "
-            f"total_common={result['total_common_opponents']}"
-        )
-
-        return result
+        await cursor.execute(f"""
+            SELECT team_a_id, team_b_id, winner_team_id, rank_group_fk, gender_code
+            FROM iz_rankings_xcri_team_knockout_matchups
+            WHERE {where_sql}
+        """, params)
+        rows = await cursor.fetchall()
+
+        groups: Dict[Tuple[int, str], List[Dict[str, Any]]] = {}
+        for row in rows:
+            groups.setdefault((row['rank_group_fk'], row['gender_code']), []).append(row)
+
+        merged: Dict[int, Dict[str, Any]] = {}
+        for group_rows in groups.values():
+            records = build_opponent_records(group_rows)
+            for opponent in find_common_opponents(records, {}, team_a_id, team_b_id):
+                existing = merged.get(opponent['opponent_id'])
+                if existing is None:
+                    merged[opponent['opponent_id']] = opponent
+                else:
+                    for key in ('team_a_wins', 'team_a_losses', 'team_b_wins', 'team_b_losses'):
+                        existing[key] += opponent[key]
+
+        if not merged:
+            return []
+
+        # Opponent names from the knockout rankings of the same context
+        name_clauses = ["season_year = %s", "rank_group_type = %s"]
+        name_params: List[Any] = [season_year, rank_group_type]
+        if rank_group_fk is not None:
+            name_clauses.append("rank_group_fk = %s")
+            name_params.append(rank_group_fk)
+        if gender_code:
+            name_clauses.append("gender_code = %s")
+            name_params.append(gender_code)
+        if checkpoint_date:
+            name_clauses.append("checkpoint_date = %s")
+            name_params.append(checkpoint_date)
+        else:
+            name_clauses.append("checkpoint_date IS NULL")
+        placeholders = ", ".join(["%s"] * len(merged))
+        name_clauses.append(f"team_id IN ({placeholders})")
+        name_params.extend(merged)
+
+        await cursor.execute(f"""
+            SELECT team_id, MAX(team_name) as team_name
+            FROM iz_rankings_xcri_team_knockout
+            WHERE {" AND ".join(name_clauses)}
+            GROUP BY team_id
+        """, name_params)
+        names = {row['team_id']: row['team_name'] for row in await cursor.fetchall()}
+
+    common_opponents = sorted(
+        merged.values(),
+        key=lambda o: (-(o['team_a_wins'] + o['team_b_wins']), o['opponent_id'])
+    )
+    for opponent in common_opponents:
+        opponent['opponent_name'] = names.get(opponent['opponent_id'])
+    return common_opponents
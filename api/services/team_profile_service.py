@@ -0,0 +1,107 @@
+"""
+XCRI Rankings API - Team Profile Service
+
+Builds the team profile document (team ranking, roster, season resume and
+Team Knockout ranking) in one call. The four lookups are independent, so
+they run concurrently, each on its own pooled connection; the profile takes
+as long as the slowest lookup instead of the sum of all four.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional, Dict, Any
+
+from services import athlete_service, resume_service, team_knockout_service, team_service
+
+logger = logging.getLogger(__name__)
+
+
+async def get_team_profile(
+    team_hnd: int,
+    season_year: int = 2024,
+    division: Optional[int] = None,
+    gender: Optional[str] = None,
+    scoring_group: str = "division",
+    checkpoint_date: Optional[str] = None,
+    algorithm_type: str = "light",
+    roster_limit: int = 100,
+    include_resume_html: bool = False
+) -> Optional[Dict[str, Any]]:
+    """
+    Get a team's ranking, roster, season resume and Team Knockout ranking.
+
+    The Team Knockout ranking is the team's division ranking (rank group
+    type 'D') at the same checkpoint.
+
+    Args:
+        team_hnd: AthleticNet team handle (required)
+        season_year: Season year (default: 2024)
+        division: Division code (optional)
+        gender: Gender code (optional)
+        scoring_group: Scoring scope (default: 'division')
+        checkpoint_date: Rankings as of date (optional, None = full season)
+        algorithm_type: Algorithm type (default: 'light')
+        roster_limit: Maximum roster athletes (default: 100)
+        include_resume_html: Include the resume's season_html (default: False)
+
+    Returns:
+        Profile dictionary or None if the team is not found
+    """
+    started = time.perf_counter()
+
+    team, (roster, roster_total), resume, knockout = await asyncio.gather(
+        team_service.get_team_by_id(
+            team_hnd=team_hnd,
+            season_year=season_year,
+            division=division,
+            gender=gender,
+            scoring_group=scoring_group,
+            checkpoint_date=checkpoint_date,
+            algorithm_type=algorithm_type
+        ),
+        athlete_service.get_team_roster(
+            team_hnd=team_hnd,
+            season_year=season_year,
+            division=division,
+            gender=gender,
+            scoring_group=scoring_group,
+            checkpoint_date=checkpoint_date,
+            algorithm_type=algorithm_type,
+            limit=roster_limit,
+            count=False
+        ),
+        resume_service.get_team_resume(
+            anet_team_hnd=team_hnd,
+            season_year=season_year,
+            division_code=division,
+            gender_code=gender,
+            include_html=include_resume_html
+        ),
+        team_knockout_service.get_team_knockout_by_id(
+            team_id=team_hnd,
+            season_year=season_year,
+            rank_group_type="D",
+            rank_group_fk=division,
+            gender_code=gender,
+            checkpoint_date=checkpoint_date
+        )
+    )
+
+    if not team:
+        logger.warning(f"Team profile not found: team_hnd={team_hnd}")
+        return None
+
+    logger.info(
+        f"Team profile: team_hnd={team_hnd}, season={season_year}, roster={roster_total}, "
+        f"resume={resume is not None}, knockout={knockout is not None}, "
+        f"{(time.perf_counter() - started) * 1000:.0f}ms"
+    )
+
+    return {
+        "team": team,
+        "roster": roster,
+        "roster_total": roster_total,
+        "resume": resume,
+        "knockout": knockout
+    }
@@ -8,6 +8,7 @@ import logging
 from typing import Optional, Tuple, List, Dict, Any
 
 from database_async import get_db_cursor, build_where_clause
+from query_shapes import query_registry
 
 logger = logging.getLogger(__name__)
 
@@ -74,16 +75,15 @@ async def get_teams(
         final_where = " AND ".join(where_clauses)
 
         # Get total count
-        count_sql = f"""
+        count_shape = query_registry.shape("teams.count", final_where, lambda: f"""
             SELECT COUNT(*) as total
             FROM iz_rankings_xcri_team_rankings
             WHERE {final_where}
-        """
-        await cursor.execute(count_sql, params)
-        total = (await cursor.fetchone())['total']
+        """)
+        total = (await count_shape.fetchone(cursor, params))['total']
 
         # Get results with pagination
-        query_sql = f"""
+        query_shape = query_registry.shape("teams.list", final_where, lambda: f"""
             SELECT
                 ranking_id,
                 season_year,
@@ -117,9 +117,8 @@ async def get_teams(
             WHERE {final_where}
             ORDER BY team_rank
             LIMIT %s OFFSET %s
-        """
-        await cursor.execute(query_sql, params + [limit, offset])
-        results = await cursor.fetchall()
+        """)
+        results = await query_shape.fetchall(cursor, params + [limit, offset])
 
         logger.info(
             f"Teams query: season={season_year}, division={division}, "
@@ -170,7 +169,7 @@ async def get_team_by_id(
         where_sql += " AND anet_team_hnd = %s"
         params.append(team_hnd)
 
-        query_sql = f"""
+        query_shape = query_registry.shape("teams.detail", where_sql, lambda: f"""
             SELECT
                 ranking_id,
                 season_year,
@@ -204,9 +203,8 @@ async def get_team_by_id(
             WHERE {where_sql}
             ORDER BY calculated_at DESC
             LIMIT 1
-        """
-        await cursor.execute(query_sql, params)
-        result = await cursor.fetchone()
+        """)
+        result = await query_shape.fetchone(cursor, params)
 
         if result:
             logger.info(
@@ -218,3 +216,76 @@ async def get_team_by_id(
             logger.warning(f"Team not found: team_hnd={team_hnd}")
 
         return result
+
+
+async def get_team_timeline(
+    team_hnd: int,
+    season_year: int = 2024,
+    division: Optional[int] = None,
+    gender: Optional[str] = None,
+    scoring_group: str = "division",
+    algorithm_type: str = "light"
+) -> List[Dict[str, Any]]:
+    """
+    Get a team's ranking at every checkpoint of a season in one query.
+
+    Returns one row per checkpoint_date (ascending), followed by the full-season
+    row (checkpoint_date NULL) if present. Replaces N calls to get_team_by_id.
+
+    Args:
+        team_hnd: AthleticNet team handle (required)
+        season_year: Season year (default: 2024)
+        division: Division code (optional)
+        gender: Gender code (optional)
+        scoring_group: Scoring scope (default: 'division')
+        algorithm_type: Algorithm type (default: 'light')
+
+    Returns:
+        List of timeline points (may be empty)
+    """
+    async with get_db_cursor() as cursor:
+        where_clauses = [
+            "anet_team_hnd = %s",
+            "season_year = %s",
+            "scoring_group = %s",
+            "algorithm_type = %s"
+        ]
+        params = [team_hnd, season_year, scoring_group, algorithm_type]
+
+        if division:
+            where_clauses.append("division_code = %s")
+            params.append(division)
+
+        if gender:
+            where_clauses.append("gender_code = %s")
+            params.append(gender.upper())
+
+        where_sql = " AND ".join(where_clauses)
+
+        # Full-season row (NULL checkpoint) sorts last as the "current" point
+        query_sql = f"""
+            SELECT
+                checkpoint_date,
+                division_code,
+                gender_code,
+                team_name,
+                team_rank,
+                team_xcri_score,
+                athletes_count,
+                top5_average,
+                top7_average,
+                squad_depth_score,
+                calculated_at
+            FROM iz_rankings_xcri_team_rankings
+            WHERE {where_sql}
+            ORDER BY checkpoint_date IS NULL, checkpoint_date, calculated_at
+        """
+        await cursor.execute(query_sql, params)
+        results = await cursor.fetchall()
+
+        logger.info(
+            f"Team timeline query: team_hnd={team_hnd}, "
+            f"season={season_year}, points={len(results)}"
+        )
+
+        return results
@@ -0,0 +1,7 @@
+"""
+XCRI Benchmarks
+
+Offline load and latency benchmarks for the XCRI Rankings API: synthetic
+season data, an in-process SQLite stand-in for MySQL, and runners that drive
+main.app through httpx without a network. See benchmarks/README.md.
+"""
@@ -0,0 +1,252 @@
+"""
+XCRI Benchmarks - Endpoint Catalogue
+
+Every API route with a request generator. Generators draw handles, dates and
+team pairs from fixtures sampled out of the loaded database, so the same
+catalogue works against the SQLite stand-in and a real MySQL copy.
+"""
+
+import random
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# (method, path, query params, JSON body)
+Request = Tuple[str, str, Dict[str, Any], Optional[Any]]
+
+COMPONENTS = ["saga", "sewr", "osma", "xcri"]
+
+
+@dataclass
+class Fixtures:
+    season_year: int
+    contexts: List[Tuple[int, str]]                 # (division, gender)
+    checkpoints: List[str]                          # YYYY-MM-DD
+    athletes: List[Tuple[int, int, str]]            # (hnd, division, gender)
+    teams: List[Tuple[int, int, str]]               # (hnd, division, gender)
+    team_pairs: List[Tuple[int, int, int, str]]     # (team_a, team_b, division, gender)
+    races: List[int]
+    metadata_ids: List[int]
+    regions: List[str]
+    conferences: List[str]
+    last_names: List[str]
+
+
+async def load_fixtures(database_async, per_context: int = 50) -> Fixtures:
+    """Sample handles and keys from the benchmark database"""
+    async with database_async.get_db_cursor() as cursor:
+        await cursor.execute(
+            "SELECT MAX(season_year) AS season FROM iz_rankings_xcri_athlete_rankings"
+        )
+        season = (await cursor.fetchone())["season"]
+
+        await cursor.execute(
+            "SELECT DISTINCT division_code, gender_code FROM iz_rankings_xcri_athlete_rankings "
+            "WHERE season_year = %s AND checkpoint_date IS NULL",
+            [season],
+        )
+        contexts = [(r["division_code"], r["gender_code"]) for r in await cursor.fetchall()]
+
+        await cursor.execute(
+            "SELECT DISTINCT checkpoint_date FROM iz_rankings_xcri_athlete_rankings "
+            "WHERE season_year = %s AND checkpoint_date IS NOT NULL ORDER BY checkpoint_date",
+            [season],
+        )
+        checkpoints = [str(r["checkpoint_date"]) for r in await cursor.fetchall()]
+
+        await cursor.execute(
+            "SELECT anet_athlete_hnd, division_code, gender_code, athlete_name_last "
+            "FROM iz_rankings_xcri_athlete_rankings "
+            "WHERE season_year = %s AND checkpoint_date IS NULL AND athlete_rank <= %s",
+            [season, per_context],
+        )
+        rows = await cursor.fetchall()
+        athletes = [(r["anet_athlete_hnd"], r["division_code"], r["gender_code"]) for r in rows]
+        last_names = sorted({r["athlete_name_last"] for r in rows})
+
+        await cursor.execute(
+            "SELECT anet_team_hnd, division_code, gender_code, regl_group_name, conf_group_name "
+            "FROM iz_rankings_xcri_team_rankings "
+            "WHERE season_year = %s AND checkpoint_date IS NULL AND team_rank <= %s",
+            [season, per_context],
+        )
+        rows = await cursor.fetchall()
+        teams = [(r["anet_team_hnd"], r["division_code"], r["gender_code"]) for r in rows]
+        regions = sorted({r["regl_group_name"] for r in rows if r["regl_group_name"]})
+        conferences = sorted({r["conf_group_name"] for r in rows if r["conf_group_name"]})
+
+        await cursor.execute(
+            "SELECT team_a_id, team_b_id, rank_group_fk, gender_code, race_hnd "
+            "FROM iz_rankings_xcri_team_knockout_matchups "
+            "WHERE season_year = %s AND checkpoint_date IS NULL AND team_a_ko_rank <= %s "
+            "LIMIT 500",
+            [season, per_context],
+        )
+        rows = await cursor.fetchall()
+        team_pairs = [(r["team_a_id"], r["team_b_id"], r["rank_group_fk"], r["gender_code"]) for r in rows]
+        races = sorted({r["race_hnd"] for r in rows})
+
+        await cursor.execute(
+            "SELECT metadata_id FROM iz_rankings_xcri_calculation_metadata LIMIT 100"
+        )
+        metadata_ids = [r["metadata_id"] for r in await cursor.fetchall()]
+
+    return Fixtures(
+        season_year=season,
+        contexts=contexts,
+        checkpoints=checkpoints,
+        athletes=athletes,
+        teams=teams,
+        team_pairs=team_pairs,
+        races=races,
+        metadata_ids=metadata_ids,
+        regions=regions,
+        conferences=conferences,
+        last_names=last_names,
+    )
+
+
+@dataclass
+class Endpoint:
+    name: str
+    build: Callable[[random.Random, Fixtures], Request]
+
+
+def _ctx(rng: random.Random, fx: Fixtures) -> Dict[str, Any]:
+    division, gender = rng.choice(fx.contexts)
+    return {"season_year": fx.season_year, "division": division, "gender": gender}
+
+
+def _athlete(rng: random.Random, fx: Fixtures) -> Tuple[int, Dict[str, Any]]:
+    hnd, division, gender = rng.choice(fx.athletes)
+    return hnd, {"season_year": fx.season_year, "division": division, "gender": gender}
+
+
+def _team(rng: random.Random, fx: Fixtures) -> Tuple[int, Dict[str, Any]]:
+    hnd, division, gender = rng.choice(fx.teams)
+    return hnd, {"season_year": fx.season_year, "division": division, "gender": gender}
+
+
+def _ko_pair(rng: random.Random, fx: Fixtures) -> Dict[str, Any]:
+    a, b, division, gender = rng.choice(fx.team_pairs)
+    return {
+        "team_a_id": a, "team_b_id": b, "season_year": fx.season_year,
+        "rank_group_type": "D", "rank_group_fk": division, "gender_code": gender,
+    }
+
+
+def _ko_team(rng: random.Random, fx: Fixtures) -> Tuple[int, Dict[str, Any]]:
+    hnd, division, gender = rng.choice(fx.teams)
+    return hnd, {
+        "season_year": fx.season_year, "rank_group_type": "D",
+        "rank_group_fk": division, "gender_code": gender,
+    }
+
+
+def _athletes_bulk(rng: random.Random, fx: Fixtures) -> Dict[str, Any]:
+    # A roster-sized list of handles from one context, plus one unknown handle
+    _, division, gender = rng.choice(fx.athletes)
+    pool = [hnd for hnd, d, g in fx.athletes if d == division and g == gender]
+    handles = rng.sample(pool, min(25, len(pool))) + [1]
+    return {
+        "season_year": fx.season_year, "division": division, "gender": gender,
+        "athlete_hnds": ",".join(map(str, handles)),
+    }
+
+
+def _get(path: str, params: Dict[str, Any]) -> Request:
+    return ("GET", path, params, None)
+
+
+def _batch(rng: random.Random, fx: Fixtures) -> Request:
+    hnd, params = _athlete(rng, fx)
+    team, team_params = _team(rng, fx)
+    items = [
+        {"id": "athlete", "path": f"/athletes/{hnd}", "params": params},
+        {"id": "timeline", "path": f"/athletes/{hnd}/timeline", "params": params},
+        {"id": "team", "path": f"/teams/{team}", "params": team_params},
+        {"id": "roster", "path": f"/athletes/team/{team}/roster", "params": team_params},
+        {"id": "latest", "path": "/metadata/latest/date", "params": {}},
+    ]
+    return ("POST", "/batch/", {}, {"requests": items})
+
+
+ENDPOINTS: List[Endpoint] = [
+    # System
+    Endpoint("root", lambda r, f: _get("/", {})),
+    Endpoint("health", lambda r, f: _get("/health", {})),
+
+    # Athletes
+    Endpoint("athletes.list", lambda r, f: _get("/athletes/", {**_ctx(r, f), "limit": 100})),
+    Endpoint("athletes.list_page", lambda r, f: _get("/athletes/", {**_ctx(r, f), "limit": 100, "offset": r.randint(0, 20) * 100})),
+    Endpoint("athletes.list_search", lambda r, f: _get("/athletes/", {**_ctx(r, f), "limit": 50, "search": r.choice(f.last_names)})),
+    Endpoint("athletes.list_region", lambda r, f: _get("/athletes/", {**_ctx(r, f), "limit": 100, "region": r.choice(f.regions)})),
+    Endpoint("athletes.list_checkpoint", lambda r, f: _get("/athletes/", {**_ctx(r, f), "limit": 100, "checkpoint_date": r.choice(f.checkpoints)})),
+    Endpoint("athletes.detail", lambda r, f: (lambda h, p: _get(f"/athletes/{h}", p))(*_athlete(r, f))),
+    Endpoint("athletes.bulk", lambda r, f: _get("/athletes/bulk", _athletes_bulk(r, f))),
+    Endpoint("athletes.timeline", lambda r, f: (lambda h, p: _get(f"/athletes/{h}/timeline", p))(*_athlete(r, f))),
+    Endpoint("athletes.roster", lambda r, f: (lambda h, p: _get(f"/athletes/team/{h}/roster", p))(*_team(r, f))),
+
+    # Teams
+    Endpoint("teams.list", lambda r, f: _get("/teams/", {**_ctx(r, f), "limit": 100})),
+    Endpoint("teams.list_conference", lambda r, f: _get("/teams/", {**_ctx(r, f), "limit": 100, "conference": r.choice(f.conferences)})),
+    Endpoint("teams.detail", lambda r, f: (lambda h, p: _get(f"/teams/{h}", p))(*_team(r, f))),
+    Endpoint("teams.timeline", lambda r, f: (lambda h, p: _get(f"/teams/{h}/timeline", p))(*_team(r, f))),
+    Endpoint("teams.profile", lambda r, f: (lambda h, p: _get(f"/teams/{h}/profile", p))(*_team(r, f))),
+    Endpoint("teams.resume", lambda r, f: (lambda h, p: _get(f"/teams/{h}/resume", p))(*_team(r, f))),
+
+    # Team Five (legacy aliases)
+    Endpoint("team_five.list", lambda r, f: _get("/team-five/", {**_ctx(r, f), "limit": 100})),
+    Endpoint("team_five.detail", lambda r, f: (lambda h, p: _get(f"/team-five/{h}", p))(*_team(r, f))),
+    Endpoint("team_five.resume", lambda r, f: (lambda h, p: _get(f"/team-five/{h}/resume", p))(*_team(r, f))),
+
+    # Team Knockout
+    Endpoint("knockout.list", lambda r, f: _get("/team-knockout/", {
+        "season_year": f.season_year, "rank_group_type": "D",
+        "rank_group_fk": r.choice(f.contexts)[0], "gender_code": r.choice(f.contexts)[1], "limit": 100,
+    })),
+    Endpoint("knockout.detail", lambda r, f: (lambda h, p: _get(f"/team-knockout/{h}", p))(*_ko_team(r, f))),
+    Endpoint("knockout.matchups", lambda r, f: (lambda h, p: _get("/team-knockout/matchups", {**p, "team_id": h, "limit": 100}))(*_ko_team(r, f))),
+    Endpoint("knockout.head_to_head", lambda r, f: _get("/team-knockout/matchups/head-to-head", _ko_pair(r, f))),
+    Endpoint("knockout.meet", lambda r, f: _get(f"/team-knockout/matchups/meet/{r.choice(f.races)}", {"season_year": f.season_year})),
+    Endpoint("knockout.common_opponents", lambda r, f: _get("/team-knockout/matchups/common-opponents", _ko_pair(r, f))),
+
+    # Metadata
+    Endpoint("metadata.list", lambda r, f: _get("/metadata/", {"season_year": f.season_year})),
+    Endpoint("metadata.latest_date", lambda r, f: _get("/metadata/latest/date", {})),
+    Endpoint("metadata.latest", lambda r, f: _get("/metadata/latest", {})),
+    Endpoint("metadata.by_id", lambda r, f: _get(f"/metadata/{r.choice(f.metadata_ids)}", {})),
+    Endpoint("metadata.summary", lambda r, f: _get("/metadata/summary/processing", {})),
+
+    # Snapshots
+    Endpoint("snapshots.list", lambda r, f: _get("/snapshots/", {})),
+    Endpoint("snapshots.athletes", lambda r, f: _get(f"/snapshots/{r.choice(f.checkpoints)}/athletes", {
+        "division": r.choice(f.contexts)[0], "gender": r.choice(f.contexts)[1], "limit": 100,
+    })),
+    Endpoint("snapshots.teams", lambda r, f: _get(f"/snapshots/{r.choice(f.checkpoints)}/teams", {
+        "division": r.choice(f.contexts)[0], "gender": r.choice(f.contexts)[1], "limit": 100,
+    })),
+    Endpoint("snapshots.metadata", lambda r, f: _get(f"/snapshots/{r.choice(f.checkpoints)}/metadata", {})),
+
+    # SCS components
+    Endpoint("scs.components", lambda r, f: (lambda h, p: _get(f"/scs/athletes/{h}/components", p))(*_athlete(r, f))),
+    Endpoint("scs.leaderboard", lambda r, f: _get(f"/scs/leaderboard/{r.choice(COMPONENTS)}", _ctx(r, f))),
+    Endpoint("scs.comparison", lambda r, f: (lambda h, p: _get(f"/scs/athletes/{h}/comparison", p))(*_athlete(r, f))),
+    Endpoint("scs.distribution", lambda r, f: _get(f"/scs/distribution/{r.choice(COMPONENTS)}", _ctx(r, f))),
+    Endpoint("scs.discrepancy", lambda r, f: (lambda h, p: _get(f"/scs/athletes/{h}/discrepancy", p))(*_athlete(r, f))),
+    Endpoint("scs.biggest_discrepancies", lambda r, f: _get("/scs/biggest-discrepancies", {
+        **_ctx(r, f), "limit": 50, "direction": r.choice(["any", "light", "scs"]),
+    })),
+    Endpoint("components.athlete", lambda r, f: (lambda h, p: _get(f"/components/athletes/{h}", p))(*_athlete(r, f))),
+    Endpoint("components.leaderboard", lambda r, f: _get("/components/leaderboard", {**_ctx(r, f), "component": r.choice(COMPONENTS), "limit": 50})),
+
+    # Batch
+    Endpoint("batch.mixed", _batch),
+]
+
+
+def select(names: Optional[str]) -> List[Endpoint]:
+    """Endpoints whose name starts with any comma-separated prefix"""
+    if not names:
+        return list(ENDPOINTS)
+    prefixes = [n.strip() for n in names.split(",") if n.strip()]
+    return [e for e in ENDPOINTS if any(e.name.startswith(p) for p in prefixes)]
@@ -0,0 +1,109 @@
+"""
+XCRI Benchmarks - Application Harness
+
+Boots main.app in-process against a benchmark database and exposes an
+httpx.AsyncClient wired to it through ASGITransport (no sockets, no
+uvicorn). The application's own lifespan runs, so startup validation and
+anything else registered there behaves as in production.
+
+Backends:
+    sqlite  SQLite stand-in pool (benchmarks/standin.py); no server needed
+    mysql   real aiomysql pool against a local MySQL/MariaDB loaded with
+            benchmarks.loader --backend mysql
+"""
+
+import logging
+import os
+import sys
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+from . import standin
+
+API_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "api")
+
+
+def _import_api(mysql: Optional[Dict[str, Any]]):
+    """Import the API package modules with settings pointing at the benchmark DB"""
+    if API_DIR not in sys.path:
+        sys.path.insert(0, API_DIR)
+
+    if mysql:
+        os.environ["DATABASE_HOST"] = str(mysql["host"])
+        os.environ["DATABASE_PORT"] = str(mysql["port"])
+        os.environ["DATABASE_USER"] = mysql["user"]
+        os.environ["DATABASE_PASSWORD"] = mysql["password"] or "benchmark"
+        os.environ["DATABASE_NAME"] = mysql["db"]
+    else:
+        os.environ.setdefault("DATABASE_PASSWORD", "benchmark")
+
+    import database
+    import database_async
+    import main
+    from services import components_service
+
+    return main, database, database_async, components_service
+
+
+@asynccontextmanager
+async def running_app(
+    backend: str = "sqlite",
+    sqlite_path: Optional[str] = None,
+    mysql: Optional[Dict[str, Any]] = None,
+    pool_min: int = 5,
+    pool_max: int = 10,
+    log_level: int = logging.WARNING,
+) -> AsyncIterator[SimpleNamespace]:
+    """
+    Start the API against the chosen backend.
+
+    Yields a namespace with ``client`` (httpx.AsyncClient), ``app``,
+    ``pool`` and ``database_async`` for pool/health inspection.
+    """
+    main, database, database_async, components_service = _import_api(mysql if backend == "mysql" else None)
+
+    # Per-request INFO logging in the services would dominate the timings
+    logging.getLogger().setLevel(log_level)
+
+    if backend == "sqlite":
+        if not sqlite_path or not os.path.exists(sqlite_path):
+            raise FileNotFoundError(
+                f"SQLite benchmark database not found: {sqlite_path} "
+                f"(run python -m benchmarks.loader first)"
+            )
+
+        async def create_standin_pool(config, pool_size=10, min_size=5):
+            database_async.pool = standin.StandInPool(sqlite_path, minsize=min_size, maxsize=pool_size)
+
+        main.create_pool = create_standin_pool
+        components_service.get_db_cursor = lambda: standin.sync_cursor(sqlite_path)
+    elif backend == "mysql":
+        database.db_config = database.DatabaseConfig(SimpleNamespace(
+            database_host=mysql["host"],
+            database_port=mysql["port"],
+            database_name=mysql["db"],
+            database_user=mysql["user"],
+            database_password=mysql["password"] or "benchmark",
+        ))
+    else:
+        raise ValueError(f"Unknown backend: {backend}")
+
+    main.settings.database_pool_minsize = pool_min
+    main.settings.database_pool_maxsize = pool_max
+    # All in-process traffic shares one client address: per-client budgets
+    # would turn the measurements into 429s
+    main.settings.rate_limit_enabled = False
+
+    app = main.app
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120.0) as client:
+            yield SimpleNamespace(
+                client=client,
+                app=app,
+                pool=database_async.pool,
+                database_async=database_async,
+            )
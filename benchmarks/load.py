@@ -0,0 +1,248 @@
+"""
+XCRI Benchmarks - Scenario Load Runner
+
+Runs concurrent virtual users through the SPA traffic scenarios in
+scenarios.py against the in-process app, and reports per interval:
+
+    req/s, error rate, p95 latency
+    pool connections in use / maximum, share of samples with the pool
+    saturated (every connection checked out)
+    event-loop lag (how late a periodic timer fires)
+
+plus per-endpoint latency for the whole run. The app runs as a single
+worker, so one run models one uvicorn worker and its pool: to size
+API_WORKERS for N concurrent users, run with --users N/workers.
+
+    python -m benchmarks.load --scale 1.0 --users 40 --duration 60
+    python -m benchmarks.load --users 80 --pool-max 20 --mix rankings=3,knockout=1 --think-scale 0.5
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List
+
+from . import endpoints, loader, scenarios, stats
+from .harness import running_app
+
+logger = logging.getLogger("benchmarks.load")
+
+
+@dataclass
+class Interval:
+    """Metrics for one reporting interval"""
+
+    t: float
+    requests: int = 0
+    errors: int = 0
+    latencies: List[float] = field(default_factory=list)
+    pool_used: List[int] = field(default_factory=list)
+    pool_saturated: int = 0
+    pool_samples: int = 0
+    lag: List[float] = field(default_factory=list)
+
+    def row(self, interval: float, pool_max: int) -> Dict:
+        return {
+            "t": round(self.t, 1),
+            "rps": round(self.requests / interval, 1),
+            "error_rate": round(self.errors / self.requests, 4) if self.requests else 0.0,
+            "p95_ms": round(stats.percentile(self.latencies, 95) * 1000, 1),
+            "pool_used_max": max(self.pool_used) if self.pool_used else 0,
+            "pool_max": pool_max,
+            "pool_saturated": round(self.pool_saturated / self.pool_samples, 3) if self.pool_samples else 0.0,
+            "lag_p99_ms": round(stats.percentile(self.lag, 99) * 1000, 1),
+            "lag_max_ms": round(max(self.lag) * 1000, 1) if self.lag else 0.0,
+        }
+
+
+class LoadRun:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.started = 0.0
+        self.intervals: List[Interval] = []
+        self.recorders: Dict[str, stats.Recorder] = {}
+        self.sessions: Dict[str, int] = {}
+        self.stop = asyncio.Event()
+        self.printed = 0
+
+    def _current(self) -> Interval:
+        index = int((time.perf_counter() - self.started) / self.args.interval)
+        while len(self.intervals) <= index:
+            self.intervals.append(Interval(t=len(self.intervals) * self.args.interval))
+        return self.intervals[index]
+
+    def record(self, name: str, elapsed: float, status: int, size: int) -> None:
+        recorder = self.recorders.setdefault(name, stats.Recorder(name))
+        if status:
+            recorder.record(elapsed, status, size)
+        else:
+            recorder.record_failure(elapsed)
+        interval = self._current()
+        interval.requests += 1
+        interval.latencies.append(elapsed)
+        if status == 0 or status >= 400:
+            interval.errors += 1
+
+    async def sample_pool(self, pool) -> None:
+        """Sample connections in use every 50ms"""
+        while not self.stop.is_set():
+            interval = self._current()
+            used = pool.size - pool.freesize
+            interval.pool_used.append(used)
+            interval.pool_samples += 1
+            if pool.freesize == 0 and pool.size >= pool.maxsize:
+                interval.pool_saturated += 1
+            await asyncio.sleep(0.05)
+
+    async def sample_lag(self) -> None:
+        """Measure how late a 20ms timer fires: time the loop spent busy elsewhere"""
+        loop = asyncio.get_running_loop()
+        period = 0.02
+        while not self.stop.is_set():
+            start = loop.time()
+            await asyncio.sleep(period)
+            self._current().lag.append(max(0.0, loop.time() - start - period))
+
+    async def virtual_user(self, client, fixtures: endpoints.Fixtures, mix: Dict[str, float], index: int) -> None:
+        rng = random.Random(f"{self.args.seed}:user:{index}")
+        user = scenarios.VirtualUser(client, fixtures, rng, self.record, self.args.think_scale)
+        # Stagger arrivals over the ramp-up period
+        await asyncio.sleep(rng.uniform(0, self.args.ramp_up))
+        while not self.stop.is_set():
+            name = scenarios.pick(rng, mix)
+            self.sessions[name] = self.sessions.get(name, 0) + 1
+            try:
+                await scenarios.SCENARIOS[name](user)
+            except Exception as e:
+                logger.warning(f"Scenario {name} failed: {e}")
+
+    async def run(self) -> None:
+        args = self.args
+        mix = scenarios.parse_mix(args.mix)
+        sqlite_path = args.sqlite_path or loader.default_sqlite_path(args.scale, args.seed)
+        mysql = loader.mysql_connect_args(args) if args.backend == "mysql" else None
+
+        async with running_app(
+            backend=args.backend,
+            sqlite_path=sqlite_path,
+            mysql=mysql,
+            pool_min=args.pool_min,
+            pool_max=args.pool_max,
+        ) as env:
+            fixtures = await endpoints.load_fixtures(env.database_async)
+            self.started = time.perf_counter()
+            samplers = [
+                asyncio.create_task(self.sample_pool(env.database_async.pool)),
+                asyncio.create_task(self.sample_lag()),
+            ]
+            users = [
+                asyncio.create_task(self.virtual_user(env.client, fixtures, mix, i))
+                for i in range(args.users)
+            ]
+            reporter = asyncio.create_task(self.report_progress())
+
+            await asyncio.sleep(args.duration)
+            self.stop.set()
+            # Let in-flight sessions finish their current request, then cancel
+            await asyncio.sleep(min(1.0, args.interval))
+            for task in users + samplers + [reporter]:
+                task.cancel()
+            await asyncio.gather(*users, *samplers, reporter, return_exceptions=True)
+
+    async def report_progress(self) -> None:
+        while True:
+            await asyncio.sleep(self.args.interval)
+            self.print_rows(len(self.intervals) - 1)
+
+    def print_rows(self, upto: int) -> None:
+        """Print completed intervals not yet shown"""
+        while self.printed < upto:
+            print(self.format_row(self.intervals[self.printed].row(self.args.interval, self.args.pool_max)), flush=True)
+            self.printed += 1
+
+    @staticmethod
+    def header() -> str:
+        return (f"{'t':>6} {'req/s':>7} {'err%':>6} {'p95':>9} {'pool':>7} "
+                f"{'sat%':>6} {'lag p99':>9} {'lag max':>9}")
+
+    @staticmethod
+    def format_row(row: Dict) -> str:
+        return (
+            f"{row['t']:>5.0f}s {row['rps']:>7.1f} {row['error_rate'] * 100:>5.1f}% {row['p95_ms']:>7.1f}ms "
+            f"{row['pool_used_max']:>3}/{row['pool_max']:<3} {row['pool_saturated'] * 100:>5.1f}% "
+            f"{row['lag_p99_ms']:>7.1f}ms {row['lag_max_ms']:>7.1f}ms"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay SPA traffic scenarios against the in-process API")
+    parser.add_argument("--backend", choices=["sqlite", "mysql"], default="sqlite")
+    parser.add_argument("--sqlite-path", help="SQLite benchmark database (default: from --scale/--seed)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Scale used when loading (locates the SQLite file)")
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("-u", "--users", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("-d", "--duration", type=float, default=30.0, help="Run time in seconds")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="Seconds over which users arrive")
+    parser.add_argument("--interval", type=float, default=1.0, help="Reporting interval in seconds")
+    parser.add_argument("--think-scale", type=float, default=1.0,
+                        help="Multiplier for user think time (0 = no pauses, maximum pressure)")
+    parser.add_argument("--mix", help="Scenario weights, e.g. rankings=4,search=1,knockout=2 "
+                                      f"(scenarios: {', '.join(scenarios.SCENARIOS)})")
+    parser.add_argument("--pool-min", type=int, default=5)
+    parser.add_argument("--pool-max", type=int, default=10)
+    parser.add_argument("--json", help="Write timeline and endpoint summaries to this JSON file")
+    loader.add_mysql_arguments(parser)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+
+    load = LoadRun(args)
+    print(f"Backend: {args.backend}  users={args.users}  duration={args.duration:g}s  "
+          f"pool={args.pool_min}-{args.pool_max}  think-scale={args.think_scale:g}")
+    print(LoadRun.header())
+    asyncio.run(load.run())
+    load.print_rows(len(load.intervals))
+
+    wall = max(time.perf_counter() - load.started, 1e-9)
+    timeline = [i.row(args.interval, args.pool_max) for i in load.intervals]
+    summaries = [stats.summarize(r, wall) for r in sorted(load.recorders.values(), key=lambda r: r.name)]
+
+    all_latencies = [s for r in load.recorders.values() for s in r.samples]
+    all_lag = [s for i in load.intervals for s in i.lag]
+    total = len(all_latencies)
+    errors = sum(r.errors for r in load.recorders.values())
+    saturated = sum(i.pool_saturated for i in load.intervals)
+    pool_samples = sum(i.pool_samples for i in load.intervals)
+
+    print()
+    print(stats.format_table(summaries))
+    print()
+    print(f"Sessions:        {', '.join(f'{k}={v}' for k, v in sorted(load.sessions.items()))}")
+    print(f"Requests:        {total} ({total / wall:.1f}/s), errors {errors} ({errors / total * 100 if total else 0:.2f}%)")
+    print(f"Latency:         p50 {stats.percentile(all_latencies, 50) * 1000:.1f}ms  "
+          f"p95 {stats.percentile(all_latencies, 95) * 1000:.1f}ms  p99 {stats.percentile(all_latencies, 99) * 1000:.1f}ms")
+    print(f"Pool saturated:  {saturated / pool_samples * 100 if pool_samples else 0:.1f}% of samples "
+          f"(peak {max((max(i.pool_used) for i in load.intervals if i.pool_used), default=0)}/{args.pool_max} in use)")
+    print(f"Event-loop lag:  p50 {stats.percentile(all_lag, 50) * 1000:.1f}ms  "
+          f"p99 {stats.percentile(all_lag, 99) * 1000:.1f}ms  max {max(all_lag, default=0) * 1000:.1f}ms")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "meta": {k: v for k, v in vars(args).items() if not k.startswith("mysql_password")},
+                "sessions": load.sessions,
+                "timeline": timeline,
+                "endpoints": [asdict(s) for s in summaries],
+            }, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""
+XCRI Benchmarks - Data Loader
+
+Creates the schema and loads synthetic data into either a SQLite file (for
+the in-process stand-in) or a local MySQL/MariaDB database.
+
+    python -m benchmarks.loader --backend sqlite --scale 0.1
+    python -m benchmarks.loader --backend mysql --mysql-db xcri_bench --scale 1.0
+
+MySQL loading drops and recreates the benchmark tables in the target
+database: never point it at the production schema.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sqlite3
+import sys
+import time
+from typing import Any, Dict
+
+from . import standin  # noqa: F401  (registers the sqlite date adapters)
+from .schema import TABLES, create_index_sql, create_table_sql, insert_columns
+from . import synthetic
+from .synthetic import GeneratorConfig, SyntheticDataset
+
+logger = logging.getLogger("benchmarks.loader")
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".data")
+
+
+def default_sqlite_path(scale: float, seed: int) -> str:
+    return os.path.join(DATA_DIR, f"xcri_bench_v{synthetic.DATASET_VERSION}_s{scale:g}_seed{seed}.sqlite3")
+
+
+def _log_progress(counts: Dict[str, int], started: float) -> None:
+    total = sum(counts.values())
+    logger.info(f"  {total:,} rows loaded ({time.perf_counter() - started:.1f}s)")
+
+
+def load_sqlite(path: str, config: GeneratorConfig) -> Dict[str, int]:
+    """Create a fresh SQLite database file with the synthetic data"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = OFF")
+    for table in TABLES:
+        conn.execute(create_table_sql(table, "sqlite"))
+
+    started = time.perf_counter()
+    counts = {table: 0 for table in TABLES}
+    conn.execute("BEGIN")
+    for table, batch in SyntheticDataset(config).tables():
+        columns = insert_columns(table)
+        placeholders = ", ".join("?" for _ in columns)
+        conn.executemany(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+            batch,
+        )
+        counts[table] += len(batch)
+        if sum(counts.values()) % 100000 < len(batch):
+            _log_progress(counts, started)
+    conn.execute("COMMIT")
+
+    logger.info("Creating indexes...")
+    for statement in create_index_sql("sqlite"):
+        conn.execute(statement)
+    conn.execute("ANALYZE")
+    conn.close()
+    return counts
+
+
+async def load_mysql(connect_args: Dict[str, Any], config: GeneratorConfig) -> Dict[str, int]:
+    """Recreate the benchmark tables in a local MySQL/MariaDB database"""
+    import aiomysql
+
+    conn = await aiomysql.connect(autocommit=False, charset="utf8mb4", **connect_args)
+    try:
+        async with conn.cursor() as cursor:
+            for table in TABLES:
+                await cursor.execute(f"DROP TABLE IF EXISTS {table}")
+                await cursor.execute(create_table_sql(table, "mysql"))
+
+            started = time.perf_counter()
+            counts = {table: 0 for table in TABLES}
+            for table, batch in SyntheticDataset(config).tables():
+                columns = insert_columns(table)
+                placeholders = ", ".join("%s" for _ in columns)
+                await cursor.executemany(
+                    f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+                    batch,
+                )
+                await conn.commit()
+                counts[table] += len(batch)
+                if sum(counts.values()) % 100000 < len(batch):
+                    _log_progress(counts, started)
+
+            logger.info("Creating indexes...")
+            for statement in create_index_sql("mysql"):
+                await cursor.execute(statement)
+            for table in TABLES:
+                await cursor.execute(f"ANALYZE TABLE {table}")
+                await cursor.fetchall()
+            await conn.commit()
+    finally:
+        conn.close()
+    return counts
+
+
+def add_mysql_arguments(parser: argparse.ArgumentParser) -> None:
+    """Connection options shared by the loader and the benchmark runners"""
+    parser.add_argument("--mysql-host", default=os.environ.get("BENCH_MYSQL_HOST", "127.0.0.1"))
+    parser.add_argument("--mysql-port", type=int, default=int(os.environ.get("BENCH_MYSQL_PORT", "3306")))
+    parser.add_argument("--mysql-user", default=os.environ.get("BENCH_MYSQL_USER", "root"))
+    parser.add_argument("--mysql-password", default=os.environ.get("BENCH_MYSQL_PASSWORD", ""))
+    parser.add_argument("--mysql-db", default=os.environ.get("BENCH_MYSQL_DB", "xcri_bench"))
+
+
+def mysql_connect_args(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "host": args.mysql_host,
+        "port": args.mysql_port,
+        "user": args.mysql_user,
+        "password": args.mysql_password,
+        "db": args.mysql_db,
+    }
+
+
+def add_generator_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--scale", type=float, default=1.0, help="Data volume (1.0 ~= 400K athlete rows)")
+    parser.add_argument("--seed", type=int, default=2025, help="Random seed")
+    parser.add_argument("--meet-size", type=int, default=20, help="Teams per meet in the matchup graph")
+    parser.add_argument("--meets-per-team", type=int, default=8, help="Meets attended per team")
+
+
+def generator_config(args: argparse.Namespace) -> GeneratorConfig:
+    return GeneratorConfig(
+        scale=args.scale,
+        seed=args.seed,
+        meet_size=args.meet_size,
+        meets_per_team=args.meets_per_team,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load synthetic XCRI data for benchmarking")
+    parser.add_argument("--backend", choices=["sqlite", "mysql"], default="sqlite")
+    parser.add_argument("--sqlite-path", help="SQLite file (default: benchmarks/.data/...)")
+    add_generator_arguments(parser)
+    add_mysql_arguments(parser)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    config = generator_config(args)
+    started = time.perf_counter()
+
+    if args.backend == "sqlite":
+        path = args.sqlite_path or default_sqlite_path(args.scale, args.seed)
+        logger.info(f"Loading synthetic data into {path} (scale={args.scale})")
+        counts = load_sqlite(path, config)
+    else:
+        logger.info(f"Loading synthetic data into MySQL {args.mysql_host}:{args.mysql_port}/{args.mysql_db}")
+        counts = asyncio.run(load_mysql(mysql_connect_args(args), config))
+
+    for table, count in counts.items():
+        logger.info(f"  {table:<45} {count:>10,}")
+    logger.info(f"Done in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+XCRI Benchmarks - Endpoint Benchmark
+
+Drives every API route in-process and reports p50/p95/p99 latency and
+throughput per endpoint.
+
+    python -m benchmarks.loader --scale 0.25
+    python -m benchmarks.run --scale 0.25 -n 200 -c 8 --json after.json --baseline before.json
+
+With --baseline the run exits non-zero if any endpoint's p95 regressed by
+more than --fail-threshold (default 20%).
+"""
+
+import argparse
+import asyncio
+import logging
+import platform
+import random
+import sys
+import time
+from typing import List
+
+from . import endpoints, loader, stats
+from .harness import running_app
+
+logger = logging.getLogger("benchmarks.run")
+
+
+async def bench_endpoint(client, endpoint: endpoints.Endpoint, fixtures: endpoints.Fixtures,
+                         n: int, concurrency: int, seed: int, warmup: int) -> stats.Summary:
+    """Run n requests for one endpoint with bounded concurrency"""
+    rng = random.Random(f"{seed}:{endpoint.name}")
+    requests = [endpoint.build(rng, fixtures) for _ in range(warmup + n)]
+    recorder = stats.Recorder(endpoint.name)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(request, record: bool):
+        method, path, params, body = request
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, params=params, json=body)
+            except Exception as e:
+                if record:
+                    recorder.record_failure(time.perf_counter() - start)
+                logger.debug(f"{endpoint.name} {path} failed: {e}")
+                return
+            elapsed = time.perf_counter() - start
+            if record:
+                recorder.record(elapsed, response.status_code, len(response.content))
+            if response.status_code >= 400:
+                logger.debug(f"{endpoint.name} {path} -> {response.status_code}: {response.text[:200]}")
+
+    # Warm-up requests prime pool connections and any application caches
+    await asyncio.gather(*(one(req, False) for req in requests[:warmup]))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(req, True) for req in requests[warmup:]))
+    return stats.summarize(recorder, time.perf_counter() - start)
+
+
+async def run(args: argparse.Namespace) -> List[stats.Summary]:
+    sqlite_path = args.sqlite_path or loader.default_sqlite_path(args.scale, args.seed)
+    mysql = loader.mysql_connect_args(args) if args.backend == "mysql" else None
+    selected = endpoints.select(args.endpoints)
+
+    async with running_app(
+        backend=args.backend,
+        sqlite_path=sqlite_path,
+        mysql=mysql,
+        pool_min=args.pool_min,
+        pool_max=args.pool_max,
+    ) as env:
+        fixtures = await endpoints.load_fixtures(env.database_async)
+        summaries = []
+        for endpoint in selected:
+            summary = await bench_endpoint(
+                env.client, endpoint, fixtures, args.requests, args.concurrency, args.seed, args.warmup
+            )
+            summaries.append(summary)
+            if args.progress:
+                print(stats.format_table([summary]).splitlines()[1], flush=True)
+        return summaries
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark every XCRI API endpoint in-process")
+    parser.add_argument("--backend", choices=["sqlite", "mysql"], default="sqlite")
+    parser.add_argument("--sqlite-path", help="SQLite benchmark database (default: from --scale/--seed)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Scale used when loading (locates the SQLite file)")
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("-n", "--requests", type=int, default=100, help="Measured requests per endpoint")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="Concurrent requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=5, help="Unmeasured warm-up requests per endpoint")
+    parser.add_argument("--endpoints", help="Comma-separated endpoint name prefixes (e.g. athletes,knockout.)")
+    parser.add_argument("--pool-min", type=int, default=5)
+    parser.add_argument("--pool-max", type=int, default=10)
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against a previous --json result")
+    parser.add_argument("--fail-threshold", type=float, default=0.20, help="Allowed p95 growth vs baseline")
+    parser.add_argument("--progress", action="store_true", help="Print each endpoint as it finishes")
+    loader.add_mysql_arguments(parser)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+
+    started = time.perf_counter()
+    summaries = asyncio.run(run(args))
+    elapsed = time.perf_counter() - started
+
+    print()
+    print(f"Backend: {args.backend}  scale={args.scale}  n={args.requests}  concurrency={args.concurrency}  "
+          f"pool={args.pool_min}-{args.pool_max}  ({elapsed:.1f}s)")
+    print(stats.format_table(summaries))
+
+    if args.json:
+        stats.write_json(args.json, summaries, {
+            "backend": args.backend,
+            "scale": args.scale,
+            "seed": args.seed,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "pool": [args.pool_min, args.pool_max],
+            "python": platform.python_version(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        })
+        print(f"\nResults written to {args.json}")
+
+    if args.baseline:
+        regressions = stats.compare(summaries, stats.load_json(args.baseline), args.fail_threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) vs {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions vs {args.baseline} (threshold {args.fail_threshold:.0%})")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+"""
+XCRI Benchmarks - SPA Traffic Scenarios
+
+Virtual-user sessions that replay the request sequences the frontend issues
+(frontend/src/App.jsx and its modals), with think time between steps:
+
+    rankings        App mount + full-slice load (limit=50000) for a division,
+                    then filter changes (region/conference, gender) that each
+                    reload the slice after the 300ms debounce
+    search          search-as-you-type: one /athletes/?search= per keystroke
+    knockout        Team Knockout view (limit=500), then matchup history
+                    modals and H2H modals against opponents listed there
+    snapshots       snapshot selector, then switching between checkpoints
+                    (full-slice snapshot loads)
+    team_profile    TeamProfile page: team + roster, resume, and the parallel
+                    per-snapshot history fan-out
+    scs_modal       athlete list, then SCS breakdown modals
+
+Each scenario is an async function taking a VirtualUser; requests go through
+VirtualUser.get so the runner can time and attribute them.
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .endpoints import Fixtures
+
+
+class VirtualUser:
+    """One simulated browser tab: issues requests and sleeps between steps"""
+
+    def __init__(self, client, fixtures: Fixtures, rng: random.Random,
+                 record: Callable[[str, float, int, int], None], think_scale: float = 1.0):
+        self.client = client
+        self.fx = fixtures
+        self.rng = rng
+        self.record = record
+        self.think_scale = think_scale
+
+    async def get(self, name: str, path: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """GET and record; returns parsed JSON on success, None otherwise"""
+        start = time.perf_counter()
+        try:
+            response = await self.client.get(path, params=params)
+        except Exception:
+            self.record(name, time.perf_counter() - start, 0, 0)
+            return None
+        self.record(name, time.perf_counter() - start, response.status_code, len(response.content))
+        if response.status_code != 200:
+            return None
+        return response.json()
+
+    async def think(self, low: float, high: float) -> None:
+        """Pause like a user reading the page (scaled by --think-scale)"""
+        if self.think_scale > 0:
+            await asyncio.sleep(self.rng.uniform(low, high) * self.think_scale)
+
+    def context(self):
+        return self.rng.choice(self.fx.contexts)
+
+
+async def rankings(user: VirtualUser) -> None:
+    """Default landing page: athletes or teams view with filter changes"""
+    fx = user.fx
+    division, gender = user.context()
+    view = "athletes" if user.rng.random() < 0.7 else "teams"
+    path = "/athletes/" if view == "athletes" else "/teams/"
+
+    # App mount
+    await asyncio.gather(
+        user.get("metadata.latest_date", "/metadata/latest/date"),
+        user.get("snapshots.list", "/snapshots/"),
+    )
+
+    params = {"season_year": fx.season_year, "division": division, "gender": gender, "limit": 50000, "offset": 0}
+    data = await user.get(f"{view}.slice", path, params)
+    await user.think(2, 8)
+
+    # Filter changes: each one reloads the full filtered slice
+    regions = sorted({r["regl_group_name"] for r in (data or {}).get("results", []) if r.get("regl_group_name")})
+    for _ in range(user.rng.randint(1, 3)):
+        choice = user.rng.random()
+        if choice < 0.4 and regions:
+            params = {**params, "region": user.rng.choice(regions)}
+            params.pop("conference", None)
+        elif choice < 0.6 and fx.conferences:
+            params = {**params, "conference": user.rng.choice(fx.conferences)}
+        elif choice < 0.8:
+            params = {**params, "gender": "F" if params["gender"] == "M" else "M"}
+        else:
+            params = {k: v for k, v in params.items() if k not in ("region", "conference")}
+            params["division"] = user.context()[0]
+        await user.get(f"{view}.slice", path, params)
+        await user.think(2, 6)
+
+
+async def search(user: VirtualUser) -> None:
+    """Search-as-you-type against the athletes endpoint"""
+    fx = user.fx
+    division, gender = user.context()
+    term = user.rng.choice(fx.last_names)
+    params = {"season_year": fx.season_year, "division": division, "gender": gender, "limit": 100}
+    for i in range(2, len(term) + 1):
+        await user.get("athletes.search", "/athletes/", {**params, "search": term[:i]})
+        # ~120ms between keystrokes (about 8 keys/second)
+        await user.think(0.08, 0.16)
+    await user.think(2, 5)
+
+
+async def knockout(user: VirtualUser) -> None:
+    """Team Knockout view with H2H and matchup history modals"""
+    fx = user.fx
+    division, gender = user.context()
+    params = {
+        "season_year": fx.season_year, "rank_group_type": "D",
+        "rank_group_fk": division, "gender_code": gender, "limit": 500, "offset": 0,
+    }
+    data = await user.get("knockout.list", "/team-knockout/", params)
+    teams = [r["team_id"] for r in (data or {}).get("results", [])][:50]
+    await user.think(2, 6)
+    if len(teams) < 2:
+        return
+
+    # Matchup history modal for a team, then H2H modals against opponents listed there
+    context = {"season_year": fx.season_year, "rank_group_type": "D", "rank_group_fk": division, "gender_code": gender}
+    for _ in range(user.rng.randint(1, 3)):
+        team = user.rng.choice(teams)
+        history = await user.get("knockout.matchups", "/team-knockout/matchups", {**context, "team_id": team})
+        await user.think(3, 8)
+        opponents = [
+            m["team_b_id"] if m["team_a_id"] == team else m["team_a_id"]
+            for m in (history or {}).get("matchups", [])
+        ]
+        for opponent in user.rng.sample(opponents, min(len(opponents), user.rng.randint(0, 2))):
+            await user.get("knockout.head_to_head", "/team-knockout/matchups/head-to-head", {
+                "team_a_id": team, "team_b_id": opponent, "season_year": fx.season_year,
+            })
+            await user.think(3, 8)
+
+
+async def snapshots(user: VirtualUser) -> None:
+    """Historical mode: pick a snapshot, then switch between checkpoints"""
+    fx = user.fx
+    division, gender = user.context()
+    listing = await user.get("snapshots.list", "/snapshots/")
+    dates = [s["date"] for s in (listing or {}).get("snapshots", [])] or fx.checkpoints
+    if not dates:
+        return
+    view = "athletes" if user.rng.random() < 0.7 else "teams"
+    params = {"division": division, "gender": gender, "limit": 50000, "offset": 0}
+    for _ in range(user.rng.randint(2, 5)):
+        snapshot = user.rng.choice(dates)
+        await user.get(f"snapshots.{view}", f"/snapshots/{snapshot}/{view}", params)
+        await user.think(2, 6)
+
+
+async def team_profile(user: VirtualUser) -> None:
+    """TeamProfile page including the per-snapshot ranking history fan-out"""
+    fx = user.fx
+    team, division, gender = user.rng.choice(fx.teams)
+    params = {"season_year": fx.season_year, "division": division, "gender": gender}
+    data = await user.get("teams.detail", f"/teams/{team}", params)
+    if data is None:
+        return
+    await user.get("athletes.roster", f"/athletes/team/{team}/roster", {
+        "season_year": fx.season_year, "gender": gender, "limit": 100,
+    })
+
+    listing = await user.get("snapshots.list", "/snapshots/")
+    dates = [s["date"] for s in (listing or {}).get("snapshots", []) if s["date"].startswith(str(fx.season_year))]
+    await asyncio.gather(*(
+        user.get("snapshots.teams", f"/snapshots/{d}/teams", {"division": division, "gender": gender, "limit": 500})
+        for d in dates
+    ))
+    await user.get("teams.resume", f"/teams/{team}/resume", params)
+    await user.think(5, 15)
+
+
+async def scs_modal(user: VirtualUser) -> None:
+    """Athletes page, then SCS breakdown modals for listed athletes"""
+    fx = user.fx
+    division, gender = user.context()
+    params = {"season_year": fx.season_year, "division": division, "gender": gender, "limit": 100}
+    data = await user.get("athletes.page", "/athletes/", params)
+    handles = [r["anet_athlete_hnd"] for r in (data or {}).get("results", [])]
+    if not handles:
+        return
+    await user.think(1, 4)
+    for _ in range(user.rng.randint(1, 3)):
+        await user.get("scs.components", f"/scs/athletes/{user.rng.choice(handles)}/components", {
+            "season_year": fx.season_year, "division": division, "gender": gender,
+        })
+        await user.think(3, 8)
+
+
+SCENARIOS: Dict[str, Callable[[VirtualUser], Awaitable[None]]] = {
+    "rankings": rankings,
+    "search": search,
+    "knockout": knockout,
+    "snapshots": snapshots,
+    "team_profile": team_profile,
+    "scs_modal": scs_modal,
+}
+
+# Share of sessions per scenario when no --mix is given
+DEFAULT_MIX = {
+    "rankings": 40,
+    "search": 15,
+    "knockout": 15,
+    "snapshots": 10,
+    "team_profile": 10,
+    "scs_modal": 10,
+}
+
+
+def parse_mix(spec: Optional[str]) -> Dict[str, float]:
+    """Parse 'rankings=5,knockout=2' into scenario weights"""
+    if not spec:
+        return dict(DEFAULT_MIX)
+    mix: Dict[str, float] = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario '{name}' (choose from {', '.join(SCENARIOS)})")
+        mix[name] = float(weight) if weight else 1.0
+    return mix
+
+
+def pick(rng: random.Random, mix: Dict[str, float]) -> str:
+    names: List[str] = list(mix)
+    return rng.choices(names, weights=[mix[n] for n in names])[0]
@@ -0,0 +1,268 @@
+"""
+XCRI Benchmarks - Table Definitions
+
+Column definitions for every table the API reads, with DDL generation for
+MySQL/MariaDB and for the in-process SQLite stand-in. Only the columns the
+service layer actually selects or filters on are modelled.
+"""
+
+from typing import Dict, List, Tuple
+
+# (column name, logical type); logical types map to a dialect type below
+Column = Tuple[str, str]
+
+TYPE_MAP = {
+    "mysql": {
+        "pk": "BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY",
+        "int": "INT",
+        "bigint": "BIGINT",
+        "float": "DOUBLE",
+        "str": "VARCHAR(128)",
+        "code": "VARCHAR(32)",
+        "date": "DATE",
+        "datetime": "DATETIME",
+        "text": "MEDIUMTEXT",
+        "bool": "TINYINT(1)",
+    },
+    "sqlite": {
+        "pk": "INTEGER PRIMARY KEY AUTOINCREMENT",
+        "int": "INTEGER",
+        "bigint": "INTEGER",
+        "float": "REAL",
+        "str": "TEXT",
+        "code": "TEXT",
+        # Declared types drive sqlite3 converters (see standin.py)
+        "date": "DATE",
+        "datetime": "TIMESTAMP",
+        "text": "TEXT",
+        "bool": "INTEGER",
+    },
+}
+
+CONTEXT_COLUMNS: List[Column] = [
+    ("season_year", "int"),
+    ("division_code", "int"),
+    ("gender_code", "code"),
+    ("checkpoint_date", "date"),
+    ("algorithm_type", "code"),
+    ("scoring_group", "code"),
+]
+
+TABLES: Dict[str, List[Column]] = {
+    "iz_rankings_xcri_athlete_rankings": [
+        ("ranking_id", "pk"),
+        *CONTEXT_COLUMNS,
+        ("anet_athlete_hnd", "bigint"),
+        ("athlete_name_first", "str"),
+        ("athlete_name_last", "str"),
+        ("anet_team_hnd", "bigint"),
+        ("team_name", "str"),
+        ("team_group_fk", "int"),
+        ("regl_group_name", "str"),
+        ("conf_group_name", "str"),
+        ("athlete_rank", "int"),
+        ("xcri_score", "float"),
+        ("races_count", "int"),
+        ("season_average", "float"),
+        ("best_performance", "float"),
+        ("most_recent_race_date", "date"),
+        ("h2h_wins", "int"),
+        ("h2h_losses", "int"),
+        ("h2h_meetings", "int"),
+        ("h2h_win_rate", "float"),
+        ("min_opponent_quality", "float"),
+        ("avg_opponent_quality", "float"),
+        ("scs_score", "float"),
+        ("scs_rank", "int"),
+        ("saga_score", "float"),
+        ("saga_rank", "int"),
+        ("sewr_score", "float"),
+        ("sewr_rank", "int"),
+        ("osma_score", "float"),
+        ("osma_rank", "int"),
+        ("calculated_at", "datetime"),
+        ("algorithm_version", "code"),
+        ("processing_time_seconds", "float"),
+    ],
+    "iz_rankings_xcri_team_rankings": [
+        ("ranking_id", "pk"),
+        *CONTEXT_COLUMNS,
+        ("anet_team_hnd", "bigint"),
+        ("team_name", "str"),
+        ("team_group_fk", "int"),
+        ("regl_group_name", "str"),
+        ("conf_group_name", "str"),
+        ("team_rank", "int"),
+        ("team_xcri_score", "float"),
+        ("most_recent_race_date", "date"),
+        ("athletes_count", "int"),
+        ("top7_average", "float"),
+        ("top5_average", "float"),
+        ("squad_depth_score", "float"),
+        ("top_athlete_1_hnd", "bigint"),
+        ("top_athlete_2_hnd", "bigint"),
+        ("top_athlete_3_hnd", "bigint"),
+        ("top_athlete_4_hnd", "bigint"),
+        ("top_athlete_5_hnd", "bigint"),
+        ("top_athlete_6_hnd", "bigint"),
+        ("top_athlete_7_hnd", "bigint"),
+        ("calculated_at", "datetime"),
+        ("algorithm_version", "code"),
+    ],
+    "iz_rankings_xcri_scs_components": [
+        ("component_id", "pk"),
+        ("ranking_id", "bigint"),
+        ("season_year", "int"),
+        ("division_code", "int"),
+        ("gender_code", "code"),
+        ("anet_athlete_hnd", "bigint"),
+        ("athlete_name_first", "str"),
+        ("athlete_name_last", "str"),
+        ("team_name", "str"),
+        ("saga_score", "float"),
+        ("saga_rank", "int"),
+        ("sewr_score", "float"),
+        ("sewr_rank", "int"),
+        ("osma_score", "float"),
+        ("osma_rank", "int"),
+        ("xcri_score", "float"),
+        ("xcri_rank", "int"),
+        ("races_used", "int"),
+        ("best_ags", "float"),
+        ("avg_ags", "float"),
+        ("worst_ags", "float"),
+        ("best_cpr", "float"),
+        ("avg_cpr", "float"),
+        ("worst_cpr", "float"),
+        ("avg_race_quality", "float"),
+        ("best_race_quality", "float"),
+        ("avg_opponent_count", "float"),
+        ("total_opponents", "int"),
+        ("created_at", "datetime"),
+        ("updated_at", "datetime"),
+    ],
+    "iz_rankings_xcri_calculation_metadata": [
+        ("metadata_id", "pk"),
+        *CONTEXT_COLUMNS,
+        ("calculated_at", "datetime"),
+        ("algorithm_version", "code"),
+        ("total_performances", "int"),
+        ("total_athletes", "int"),
+        ("total_teams", "int"),
+        ("total_races", "int"),
+        ("processing_time_seconds", "float"),
+        ("cache_used", "bool"),
+        ("cache_hit_rate", "float"),
+        ("athletes_with_h2h", "int"),
+        ("athletes_no_h2h", "int"),
+        ("heavy_fallback_count", "int"),
+        ("calculation_status", "code"),
+        ("error_message", "str"),
+    ],
+    "iz_rankings_xcri_team_knockout": [
+        ("id", "pk"),
+        ("team_id", "bigint"),
+        ("team_name", "str"),
+        ("team_code", "code"),
+        ("rank_group_type", "code"),
+        ("rank_group_fk", "int"),
+        ("gender_code", "code"),
+        ("regl_group_fk", "int"),
+        ("conf_group_fk", "int"),
+        ("regl_group_name", "str"),
+        ("conf_group_name", "str"),
+        ("regl_finish", "int"),
+        ("conf_finish", "int"),
+        ("knockout_rank", "int"),
+        ("team_five_rank", "int"),
+        ("elimination_method", "code"),
+        ("team_size", "int"),
+        ("athletes_with_xcri", "int"),
+        ("team_five_xcri_pts", "float"),
+        ("most_recent_race_date", "date"),
+        ("h2h_wins", "int"),
+        ("h2h_losses", "int"),
+        ("h2h_win_pct", "float"),
+        ("checkpoint_date", "date"),
+        ("season_year", "int"),
+        ("calculation_date", "datetime"),
+    ],
+    "iz_rankings_xcri_team_knockout_matchups": [
+        ("matchup_id", "pk"),
+        ("race_hnd", "bigint"),
+        ("meet_id", "bigint"),
+        ("race_date", "date"),
+        ("meet_name", "str"),
+        ("team_a_id", "bigint"),
+        ("team_a_rank", "int"),
+        ("team_a_score", "int"),
+        ("team_a_ko_rank", "int"),
+        ("team_b_id", "bigint"),
+        ("team_b_rank", "int"),
+        ("team_b_score", "int"),
+        ("team_b_ko_rank", "int"),
+        ("winner_team_id", "bigint"),
+        ("season_year", "int"),
+        ("rank_group_type", "code"),
+        ("rank_group_fk", "int"),
+        ("gender_code", "code"),
+        ("checkpoint_date", "date"),
+        ("calculation_date", "datetime"),
+    ],
+    "iz_athnet_teams": [
+        ("IDSchool", "bigint"),
+        ("UstfcccaId", "int"),
+        ("SchoolName", "str"),
+    ],
+    "iz_groups_season_resumes": [
+        ("id", "pk"),
+        ("season_year", "int"),
+        ("group_fk", "int"),
+        ("gender_fk", "int"),
+        ("sport_fk", "int"),
+        ("season_html", "text"),
+        ("created_at", "datetime"),
+        ("updated_at", "datetime"),
+    ],
+}
+
+# Indexes matching the production access paths (name, table, columns)
+INDEXES: List[Tuple[str, str, List[str]]] = [
+    ("idx_ar_context_rank", "iz_rankings_xcri_athlete_rankings",
+     ["season_year", "division_code", "gender_code", "checkpoint_date", "algorithm_type", "scoring_group", "athlete_rank"]),
+    ("idx_ar_athlete", "iz_rankings_xcri_athlete_rankings", ["anet_athlete_hnd", "season_year"]),
+    ("idx_ar_team", "iz_rankings_xcri_athlete_rankings", ["anet_team_hnd", "season_year"]),
+    ("idx_ar_checkpoint", "iz_rankings_xcri_athlete_rankings", ["checkpoint_date", "algorithm_type", "scoring_group"]),
+    ("idx_tr_context_rank", "iz_rankings_xcri_team_rankings",
+     ["season_year", "division_code", "gender_code", "checkpoint_date", "algorithm_type", "scoring_group", "team_rank"]),
+    ("idx_tr_team", "iz_rankings_xcri_team_rankings", ["anet_team_hnd", "season_year"]),
+    ("idx_scs_context", "iz_rankings_xcri_scs_components", ["season_year", "division_code", "gender_code"]),
+    ("idx_scs_athlete", "iz_rankings_xcri_scs_components", ["anet_athlete_hnd", "season_year"]),
+    ("idx_meta_context", "iz_rankings_xcri_calculation_metadata", ["checkpoint_date", "algorithm_type", "scoring_group", "calculated_at"]),
+    ("idx_ko_context", "iz_rankings_xcri_team_knockout",
+     ["season_year", "rank_group_type", "rank_group_fk", "gender_code", "checkpoint_date", "knockout_rank"]),
+    ("idx_ko_team", "iz_rankings_xcri_team_knockout", ["team_id", "season_year"]),
+    ("idx_m_team_a", "iz_rankings_xcri_team_knockout_matchups", ["team_a_id", "season_year"]),
+    ("idx_m_team_b", "iz_rankings_xcri_team_knockout_matchups", ["team_b_id", "season_year"]),
+    ("idx_m_race", "iz_rankings_xcri_team_knockout_matchups", ["race_hnd", "season_year"]),
+    ("idx_teams_school", "iz_athnet_teams", ["IDSchool"]),
+    ("idx_resume_group", "iz_groups_season_resumes", ["group_fk", "season_year", "gender_fk"]),
+]
+
+
+def create_table_sql(table: str, dialect: str) -> str:
+    """CREATE TABLE statement for one table in the given dialect"""
+    types = TYPE_MAP[dialect]
+    columns = ",\n    ".join(f"{name} {types[kind]}" for name, kind in TABLES[table])
+    suffix = " ENGINE=InnoDB DEFAULT CHARSET=utf8mb4" if dialect == "mysql" else ""
+    return f"CREATE TABLE {table} (\n    {columns}\n){suffix}"
+
+
+def create_index_sql(dialect: str) -> List[str]:
+    """CREATE INDEX statements for all benchmark indexes"""
+    return [f"CREATE INDEX {name} ON {table} ({', '.join(cols)})" for name, table, cols in INDEXES]
+
+
+def insert_columns(table: str) -> List[str]:
+    """Columns supplied on insert (auto-increment primary keys excluded)"""
+    return [name for name, kind in TABLES[table] if kind != "pk"]
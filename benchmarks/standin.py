@@ -0,0 +1,276 @@
+"""
+XCRI Benchmarks - In-Process Database Stand-In
+
+SQLite-backed replacement for the aiomysql pool so the API can be benchmarked
+without a MySQL server. Implements the subset of the aiomysql Pool /
+Connection / DictCursor interface that database_async.py uses, and rewrites
+the handful of MySQL-only constructs the services emit:
+
+- %s placeholders and %% escapes (pyformat) -> ? placeholders
+- DATE_FORMAT(x, '%Y-%m-%d') -> strftime('%Y-%m-%d', x)
+- CONCAT(...) and STDDEV(...) are registered as SQLite functions
+- @@max_connections / SHOW STATUS return fixed values
+
+Queries run in worker threads (asyncio.to_thread) so, as with aiomysql, the
+event loop stays free while SQLite works. Absolute latencies are not
+comparable with MySQL; use the stand-in for relative, run-to-run comparison.
+"""
+
+import asyncio
+import math
+import re
+import sqlite3
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+# Store dates as ISO text and parse them back by declared column type
+sqlite3.register_adapter(date, lambda d: d.isoformat())
+sqlite3.register_adapter(datetime, lambda d: d.isoformat(sep=" "))
+sqlite3.register_converter("DATE", lambda b: date.fromisoformat(b.decode()))
+sqlite3.register_converter("TIMESTAMP", lambda b: datetime.fromisoformat(b.decode()))
+
+_DATE_FORMAT_RE = re.compile(r"DATE_FORMAT\(\s*([\w.]+)\s*,\s*'([^']*)'\s*\)", re.IGNORECASE)
+_PLACEHOLDER_RE = re.compile(r"%%|%s")
+
+
+class _StdDev:
+    """Population standard deviation aggregate (MySQL STDDEV)"""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def step(self, value):
+        if value is None:
+            return
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+
+    def finalize(self):
+        return math.sqrt(self.m2 / self.n) if self.n else None
+
+
+def _concat(*parts):
+    """MySQL CONCAT: NULL if any argument is NULL"""
+    if any(p is None for p in parts):
+        return None
+    return "".join(str(p) for p in parts)
+
+
+def translate(sql: str) -> str:
+    """Rewrite a MySQL pyformat statement into SQLite qmark syntax"""
+    sql = _DATE_FORMAT_RE.sub(lambda m: f"strftime('{m.group(2)}', {m.group(1)})", sql)
+    return _PLACEHOLDER_RE.sub(lambda m: "%" if m.group(0) == "%%" else "?", sql)
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Open a stand-in connection with MySQL-compatible helper functions"""
+    conn = sqlite3.connect(
+        path,
+        detect_types=sqlite3.PARSE_DECLTYPES,
+        check_same_thread=False,
+        isolation_level=None,  # autocommit, as the API pool is configured
+    )
+    conn.row_factory = sqlite3.Row
+    conn.create_function("CONCAT", -1, _concat, deterministic=True)
+    conn.create_aggregate("STDDEV", 1, _StdDev)
+    conn.execute("PRAGMA query_only = ON")
+    conn.execute("PRAGMA cache_size = -65536")
+    conn.execute("PRAGMA mmap_size = 268435456")
+    return conn
+
+
+def _run(conn: sqlite3.Connection, sql: str, params: Optional[Sequence[Any]]) -> List[Dict[str, Any]]:
+    upper = sql.lstrip().upper()
+    if "@@MAX_CONNECTIONS" in upper:
+        return [{"max_connections": 151, "max_user_connections": 0}]
+    if upper.startswith("SHOW STATUS"):
+        return [{"Variable_name": "Threads_connected", "Value": "1"}]
+    cursor = conn.execute(translate(sql), tuple(params or ()))
+    return [dict(row) for row in cursor.fetchall()]
+
+
+class StandInCursor:
+    """DictCursor-compatible async cursor"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+        self._rows: List[Dict[str, Any]] = []
+        self._pos = 0
+        self.rowcount = -1
+
+    async def execute(self, sql: str, params: Optional[Sequence[Any]] = None) -> int:
+        self._rows = await asyncio.to_thread(_run, self._conn, sql, params)
+        self._pos = 0
+        self.rowcount = len(self._rows)
+        return self.rowcount
+
+    async def fetchone(self) -> Optional[Dict[str, Any]]:
+        if self._pos >= len(self._rows):
+            return None
+        row = self._rows[self._pos]
+        self._pos += 1
+        return row
+
+    async def fetchall(self) -> List[Dict[str, Any]]:
+        rows = self._rows[self._pos:]
+        self._pos = len(self._rows)
+        return rows
+
+    async def close(self) -> None:
+        self._rows = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+class StandInConnection:
+    """aiomysql.Connection subset"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+        self.closed = False
+
+    def cursor(self, cursor_class=None) -> StandInCursor:
+        return StandInCursor(self._conn)
+
+    def close(self) -> None:
+        self._conn.close()
+        self.closed = True
+
+
+class _AcquireContext:
+    """Awaitable and async context manager, like aiomysql's pool.acquire()"""
+
+    def __init__(self, pool: "StandInPool"):
+        self._pool = pool
+        self._conn: Optional[StandInConnection] = None
+
+    def __await__(self):
+        return self._pool._acquire().__await__()
+
+    async def __aenter__(self) -> StandInConnection:
+        self._conn = await self._pool._acquire()
+        return self._conn
+
+    async def __aexit__(self, *exc):
+        self._pool.release(self._conn)
+        self._conn = None
+
+
+class StandInPool:
+    """
+    Bounded connection pool with the aiomysql.Pool attributes used by
+    get_pool_status() and pool_admission: size, freesize, minsize, maxsize,
+    clear(); closed connections are dropped on release.
+    """
+
+    def __init__(self, path: str, minsize: int = 5, maxsize: int = 10):
+        self.path = path
+        self.minsize = minsize
+        self.maxsize = maxsize
+        self._free: List[StandInConnection] = [StandInConnection(connect(path)) for _ in range(minsize)]
+        self._used = 0
+        self._slots = asyncio.Semaphore(maxsize)
+        self._closed = False
+        # Peak connections in use and cumulative time spent waiting to acquire
+        self.max_used = 0
+        self.wait_seconds = 0.0
+        self.waits = 0
+
+    @property
+    def size(self) -> int:
+        return len(self._free) + self._used
+
+    @property
+    def freesize(self) -> int:
+        return len(self._free)
+
+    @property
+    def used(self) -> int:
+        return self._used
+
+    def acquire(self) -> _AcquireContext:
+        return _AcquireContext(self)
+
+    async def _acquire(self) -> StandInConnection:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await self._slots.acquire()
+        conn = self._free.pop() if self._free else StandInConnection(connect(self.path))
+        self._used += 1
+        self.max_used = max(self.max_used, self._used)
+        waited = loop.time() - start
+        if waited > 0.0005:
+            self.waits += 1
+            self.wait_seconds += waited
+        return conn
+
+    def release(self, conn: Optional[StandInConnection]) -> None:
+        if conn is None:
+            return
+        self._used -= 1
+        if self._closed:
+            conn.close()
+        elif not conn.closed:
+            self._free.append(conn)
+        self._slots.release()
+
+    async def clear(self) -> None:
+        """Close idle connections (aiomysql.Pool.clear)"""
+        for conn in self._free:
+            conn.close()
+        self._free.clear()
+
+    def close(self) -> None:
+        self._closed = True
+        for conn in self._free:
+            conn.close()
+        self._free.clear()
+
+    async def wait_closed(self) -> None:
+        return None
+
+
+@contextmanager
+def sync_cursor(path: str):
+    """
+    Blocking cursor replacing database.get_db_cursor (PyMySQL) for the
+    services that still use the synchronous driver.
+    """
+    conn = connect(path)
+    try:
+        yield _SyncCursor(conn)
+    finally:
+        conn.close()
+
+
+class _SyncCursor:
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+        self._rows: List[Dict[str, Any]] = []
+        self._pos = 0
+
+    def execute(self, sql: str, params: Optional[Sequence[Any]] = None) -> int:
+        self._rows = _run(self._conn, sql, params)
+        self._pos = 0
+        return len(self._rows)
+
+    def fetchone(self) -> Optional[Dict[str, Any]]:
+        if self._pos >= len(self._rows):
+            return None
+        row = self._rows[self._pos]
+        self._pos += 1
+        return row
+
+    def fetchall(self) -> List[Dict[str, Any]]:
+        rows = self._rows[self._pos:]
+        self._pos = len(self._rows)
+        return rows
@@ -0,0 +1,128 @@
+"""
+XCRI Benchmarks - Latency Statistics
+
+Percentile summaries, table/JSON reporting and baseline comparison shared by
+the endpoint benchmark and the scenario runner.
+"""
+
+import json
+import statistics
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+
+def percentile(samples: List[float], p: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+@dataclass
+class Recorder:
+    """Latency samples and status codes for one endpoint"""
+
+    name: str
+    samples: List[float] = field(default_factory=list)
+    statuses: Dict[int, int] = field(default_factory=dict)
+    errors: int = 0
+    bytes: int = 0
+
+    def record(self, elapsed: float, status: int, size: int = 0) -> None:
+        self.samples.append(elapsed)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.bytes += size
+        if status >= 400:
+            self.errors += 1
+
+    def record_failure(self, elapsed: float) -> None:
+        """Transport-level failure (exception before a response)"""
+        self.samples.append(elapsed)
+        self.statuses[0] = self.statuses.get(0, 0) + 1
+        self.errors += 1
+
+
+@dataclass
+class Summary:
+    name: str
+    requests: int
+    errors: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    rps: float
+    avg_bytes: int
+    statuses: Dict[int, int]
+
+
+def summarize(recorder: Recorder, wall_seconds: float) -> Summary:
+    samples = recorder.samples
+    n = len(samples)
+    return Summary(
+        name=recorder.name,
+        requests=n,
+        errors=recorder.errors,
+        mean_ms=statistics.mean(samples) * 1000 if samples else 0.0,
+        p50_ms=percentile(samples, 50) * 1000,
+        p95_ms=percentile(samples, 95) * 1000,
+        p99_ms=percentile(samples, 99) * 1000,
+        max_ms=max(samples) * 1000 if samples else 0.0,
+        rps=n / wall_seconds if wall_seconds else 0.0,
+        avg_bytes=recorder.bytes // n if n else 0,
+        statuses=dict(recorder.statuses),
+    )
+
+
+def format_table(summaries: List[Summary]) -> str:
+    lines = [
+        f"{'endpoint':<34} {'n':>6} {'err':>5} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9} {'req/s':>8} {'bytes':>8}"
+    ]
+    for s in summaries:
+        lines.append(
+            f"{s.name:<34} {s.requests:>6} {s.errors:>5} {s.p50_ms:>7.1f}ms {s.p95_ms:>7.1f}ms "
+            f"{s.p99_ms:>7.1f}ms {s.max_ms:>7.1f}ms {s.rps:>8.1f} {s.avg_bytes:>8}"
+        )
+    return "\n".join(lines)
+
+
+def write_json(path: str, summaries: List[Summary], meta: Dict) -> None:
+    with open(path, "w") as f:
+        json.dump({"meta": meta, "endpoints": [asdict(s) for s in summaries]}, f, indent=2)
+
+
+def load_json(path: str) -> Dict[str, Dict]:
+    with open(path) as f:
+        data = json.load(f)
+    return {entry["name"]: entry for entry in data["endpoints"]}
+
+
+def compare(
+    summaries: List[Summary],
+    baseline: Dict[str, Dict],
+    threshold: float,
+    metric: str = "p95_ms",
+    min_delta_ms: float = 2.0,
+) -> List[str]:
+    """
+    Regressions against a baseline run.
+
+    An endpoint regresses when ``metric`` grows by more than ``threshold``
+    (fraction, e.g. 0.2 = 20%) and by at least ``min_delta_ms`` (so
+    sub-millisecond jitter on fast endpoints is ignored), or when it starts
+    returning errors.
+    """
+    regressions = []
+    for s in summaries:
+        base: Optional[Dict] = baseline.get(s.name)
+        if base is None:
+            continue
+        old, new = base[metric], getattr(s, metric)
+        if new > old * (1 + threshold) and new - old >= min_delta_ms:
+            regressions.append(f"{s.name}: {metric} {old:.1f}ms -> {new:.1f}ms (+{(new / old - 1) * 100 if old else 0:.0f}%)")
+        if s.errors and not base.get("errors"):
+            regressions.append(f"{s.name}: {s.errors} error(s), baseline had none")
+    return regressions
@@ -0,0 +1,443 @@
+"""
+XCRI Benchmarks - Synthetic Data Generator
+
+Deterministic (seeded) data shaped like a production season: every division
+and gender, eight weekly checkpoints plus LIVE (checkpoint_date NULL), one
+SCS component row per athlete, knockout rankings per checkpoint and a dense
+LIVE matchup graph (every pair of teams at every meet).
+
+At scale 1.0 this is roughly:
+    iz_rankings_xcri_athlete_rankings          400,000 rows
+    iz_rankings_xcri_team_rankings              36,000 rows
+    iz_rankings_xcri_scs_components             44,000 rows
+    iz_rankings_xcri_team_knockout              36,000 rows
+    iz_rankings_xcri_team_knockout_matchups    300,000 rows
+
+Rows are yielded in batches of tuples ordered as schema.insert_columns(table)
+so the loader never holds a whole table in memory.
+"""
+
+import math
+import random
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+SEASON_YEAR = 2025
+DIVISIONS = [2030, 2031, 2032, 2028, 19781, 19782, 2034]
+GENDERS = ["M", "F"]
+CHECKPOINTS: List[Optional[date]] = [date(2025, 9, 8) + timedelta(weeks=k) for k in range(8)] + [None]
+LIVE_CALCULATED_AT = datetime(2025, 11, 10, 6, 0, 0)
+
+REGIONS = [
+    "Great Lakes", "Mid-Atlantic", "Midwest", "Mountain", "Northeast",
+    "South", "South Central", "Southeast", "West",
+]
+CONFERENCES_PER_REGION = 4
+
+FIRST_NAMES = [
+    "Alex", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery",
+    "Quinn", "Parker", "Reese", "Rowan", "Emerson", "Hayden", "Skyler", "Drew",
+    "Kendall", "Logan", "Cameron", "Sage", "Blake", "Finley", "Harper", "Dakota",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+    "Rodriguez", "Martinez", "Hernandez", "Lopez", "Wilson", "Anderson", "Thomas",
+    "Moore", "Jackson", "Martin", "Lee", "Thompson", "White", "Harris", "Clark",
+    "Lewis", "Walker", "Hall", "Young", "King", "Wright", "Scott", "Green", "Baker",
+]
+SCHOOL_WORDS = [
+    "State", "Tech", "Valley", "Lakes", "Pacific", "Northern", "Southern", "Eastern",
+    "Western", "Central", "Christian", "A&M", "Coast", "Mountain", "River", "Plains",
+]
+
+# Per (division, gender) counts at scale 1.0: 126 contexts x 3175 ~= 400K athlete rows
+ATHLETES_PER_CONTEXT = 3175
+TEAMS_PER_CONTEXT = 285
+
+BATCH_SIZE = 5000
+
+# Bump when generated data changes so cached benchmark databases are rebuilt
+DATASET_VERSION = 2
+
+
+@dataclass
+class Team:
+    hnd: int
+    name: str
+    school_id: int
+    region: str
+    conference: str
+    region_fk: int
+    conference_fk: int
+    strength: float
+
+
+@dataclass
+class Athlete:
+    hnd: int
+    first: str
+    last: str
+    team: Team
+    skill: float
+
+
+@dataclass
+class Population:
+    division: int
+    gender: str
+    teams: List[Team]
+    athletes: List[Athlete]
+    # Team handle -> knockout rank for LIVE, filled while generating knockout rows
+    ko_rank: Dict[int, int] = field(default_factory=dict)
+
+
+@dataclass
+class GeneratorConfig:
+    scale: float = 1.0
+    seed: int = 2025
+    meet_size: int = 20
+    meets_per_team: int = 8
+    resume_bytes: int = 6000
+
+
+class SyntheticDataset:
+    """Builds the athlete/team population once, then streams table rows"""
+
+    def __init__(self, config: GeneratorConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.populations: List[Population] = []
+        self.schools: Dict[int, str] = {}
+        self._build_populations()
+
+    # ---------------------------------------------------------------
+    # Population
+    # ---------------------------------------------------------------
+
+    def _build_populations(self) -> None:
+        rng = self.rng
+        n_athletes = max(20, int(ATHLETES_PER_CONTEXT * self.config.scale))
+        n_teams = max(4, int(TEAMS_PER_CONTEXT * self.config.scale))
+        next_team_hnd = 100000
+        next_athlete_hnd = 10000000
+        next_school = 1000
+
+        for division in DIVISIONS:
+            # Men's and women's teams of a division share schools (and resumes)
+            school_ids = list(range(next_school, next_school + n_teams))
+            next_school += n_teams
+            for school_id in school_ids:
+                self.schools[school_id] = (
+                    f"{rng.choice(LAST_NAMES)} {rng.choice(SCHOOL_WORDS)} {school_id}"
+                )
+
+            for gender in GENDERS:
+                teams = []
+                for school_id in school_ids:
+                    region_idx = school_id % len(REGIONS)
+                    conf_idx = (school_id // len(REGIONS)) % CONFERENCES_PER_REGION
+                    teams.append(Team(
+                        hnd=next_team_hnd,
+                        name=self.schools[school_id],
+                        school_id=school_id,
+                        region=REGIONS[region_idx],
+                        conference=f"{REGIONS[region_idx]} Conference {conf_idx + 1}",
+                        region_fk=500 + region_idx,
+                        conference_fk=600 + region_idx * CONFERENCES_PER_REGION + conf_idx,
+                        strength=rng.gauss(0, 1),
+                    ))
+                    next_team_hnd += 1
+
+                athletes = []
+                for i in range(n_athletes):
+                    team = teams[i % n_teams]
+                    athletes.append(Athlete(
+                        hnd=next_athlete_hnd,
+                        first=rng.choice(FIRST_NAMES),
+                        last=rng.choice(LAST_NAMES),
+                        team=team,
+                        skill=team.strength * 0.5 + rng.gauss(0, 1),
+                    ))
+                    next_athlete_hnd += 1
+
+                self.populations.append(Population(division, gender, teams, athletes))
+
+    # ---------------------------------------------------------------
+    # Helpers
+    # ---------------------------------------------------------------
+
+    @staticmethod
+    def _calculated_at(checkpoint: Optional[date]) -> datetime:
+        if checkpoint is None:
+            return LIVE_CALCULATED_AT
+        return datetime.combine(checkpoint + timedelta(days=1), datetime.min.time()) + timedelta(hours=6)
+
+    @staticmethod
+    def _score(skill: float) -> float:
+        """Map a latent skill onto the XCRI score range"""
+        return round(max(1.0, 600.0 + 120.0 * skill), 3)
+
+    def _batched(self, table: str, rows: Iterator[Tuple]) -> Iterator[Tuple[str, List[Tuple]]]:
+        batch: List[Tuple] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= BATCH_SIZE:
+                yield table, batch
+                batch = []
+        if batch:
+            yield table, batch
+
+    def _context_scores(self, pop: Population, checkpoint: Optional[date]) -> List[Tuple[Athlete, float]]:
+        """Athletes with their score at a checkpoint, best first"""
+        week = CHECKPOINTS.index(checkpoint)
+        rng = random.Random(f"{self.config.seed}:{pop.division}:{pop.gender}:{week}")
+        scored = [(a, self._score(a.skill + rng.gauss(0, 0.15))) for a in pop.athletes]
+        scored.sort(key=lambda item: -item[1])
+        return scored
+
+    # ---------------------------------------------------------------
+    # Tables
+    # ---------------------------------------------------------------
+
+    def athlete_and_team_rows(self) -> Iterator[Tuple[str, List[Tuple]]]:
+        """Athlete and team rankings for every context"""
+        for pop in self.populations:
+            for week, checkpoint in enumerate(CHECKPOINTS):
+                scored = self._context_scores(pop, checkpoint)
+                yield from self._batched(
+                    "iz_rankings_xcri_athlete_rankings",
+                    self._athlete_rows(pop, checkpoint, week, scored),
+                )
+                yield from self._batched(
+                    "iz_rankings_xcri_team_rankings",
+                    self._team_rows(pop, checkpoint, scored),
+                )
+
+    def _athlete_rows(self, pop: Population, checkpoint: Optional[date], week: int,
+                      scored: List[Tuple[Athlete, float]]) -> Iterator[Tuple]:
+        rng = random.Random(f"ath:{self.config.seed}:{pop.division}:{pop.gender}:{week}")
+        calculated_at = self._calculated_at(checkpoint)
+        last_race = (checkpoint or LIVE_CALCULATED_AT.date()) - timedelta(days=2)
+        n = len(scored)
+        # Component ranks are a perturbation of the overall rank
+        saga = sorted(range(n), key=lambda i: i + rng.gauss(0, n * 0.05))
+        saga_rank = {idx: r + 1 for r, idx in enumerate(saga)}
+
+        for rank, (athlete, score) in enumerate(scored, start=1):
+            races = min(week + 1, 1 + rank % 9)
+            wins = rng.randint(0, 40)
+            losses = rng.randint(0, 40)
+            meetings = wins + losses
+            scs = round(score * rng.uniform(0.95, 1.05), 3)
+            yield (
+                SEASON_YEAR, pop.division, pop.gender, checkpoint, "light", "division",
+                athlete.hnd, athlete.first, athlete.last,
+                athlete.team.hnd, athlete.team.name, athlete.team.school_id,
+                athlete.team.region, athlete.team.conference,
+                rank, score, races,
+                round(score * 0.97, 3), round(score * 1.02, 3), last_race,
+                wins, losses, meetings, round(wins / meetings, 4) if meetings else None,
+                round(rng.uniform(100, 400), 3), round(rng.uniform(300, 700), 3),
+                scs, rank,
+                round(score * rng.uniform(0.9, 1.1), 3), saga_rank[rank - 1],
+                round(score * rng.uniform(0.9, 1.1), 3), rank,
+                round(score * rng.uniform(0.9, 1.1), 3), rank,
+                calculated_at, "2.1.0", round(rng.uniform(30, 90), 2),
+            )
+
+    def _team_rows(self, pop: Population, checkpoint: Optional[date],
+                   scored: List[Tuple[Athlete, float]]) -> Iterator[Tuple]:
+        calculated_at = self._calculated_at(checkpoint)
+        last_race = (checkpoint or LIVE_CALCULATED_AT.date()) - timedelta(days=2)
+        rosters: Dict[int, List[Tuple[Athlete, float]]] = {}
+        for athlete, score in scored:
+            rosters.setdefault(athlete.team.hnd, []).append((athlete, score))
+
+        ranked = []
+        for team in pop.teams:
+            roster = rosters.get(team.hnd, [])
+            top = [s for _, s in roster[:7]]
+            top5 = top[:5]
+            team_score = sum(top5) / len(top5) if top5 else 0.0
+            ranked.append((team, roster, top, team_score))
+        ranked.sort(key=lambda item: -item[3])
+
+        for rank, (team, roster, top, team_score) in enumerate(ranked, start=1):
+            handles = [a.hnd for a, _ in roster[:7]] + [None] * (7 - min(7, len(roster)))
+            yield (
+                SEASON_YEAR, pop.division, pop.gender, checkpoint, "light", "division",
+                team.hnd, team.name, team.school_id, team.region, team.conference,
+                rank, round(team_score, 3), last_race, len(roster),
+                round(sum(top) / len(top), 3) if top else None,
+                round(team_score, 3) if top else None,
+                round(len(roster) / 12.0, 3),
+                *handles,
+                calculated_at, "2.1.0",
+            )
+
+    def scs_rows(self) -> Iterator[Tuple[str, List[Tuple]]]:
+        """One SCS component row per athlete per division/gender (LIVE)"""
+        ranking_id = 0
+        for pop in self.populations:
+            rng = random.Random(f"scs:{self.config.seed}:{pop.division}:{pop.gender}")
+            scored = self._context_scores(pop, None)
+            components = []
+            for athlete, score in scored:
+                ranking_id += 1
+                saga = round(score * rng.uniform(0.85, 1.15), 3)
+                sewr = round(score * rng.uniform(0.85, 1.15), 3)
+                # Athletes without enough head-to-head data have no OSMA score
+                osma = round(score * rng.uniform(0.85, 1.15), 3) if rng.random() > 0.05 else None
+                components.append([athlete, score, saga, sewr, osma, ranking_id])
+
+            ranks = {}
+            for col in (2, 3, 4):
+                present = sorted((c for c in components if c[col] is not None), key=lambda c: -c[col])
+                ranks[col] = {id(c): r for r, c in enumerate(present, start=1)}
+
+            # SCS = 0.6 x SEWR + 0.4 x OSMA, so SCS ranks differ from XCRI Light ranks
+            for c in components:
+                c[1] = round(0.6 * c[3] + 0.4 * (c[4] if c[4] is not None else c[3]), 3)
+            components.sort(key=lambda c: -c[1])
+
+            created_at = LIVE_CALCULATED_AT
+            rows = []
+            for xcri_rank, c in enumerate(components, start=1):
+                athlete, score, saga, sewr, osma, rid = c
+                rows.append((
+                    rid, SEASON_YEAR, pop.division, pop.gender, athlete.hnd,
+                    athlete.first, athlete.last, athlete.team.name,
+                    saga, ranks[2].get(id(c)), sewr, ranks[3].get(id(c)),
+                    osma, ranks[4].get(id(c)), score, xcri_rank,
+                    rng.randint(1, 8),
+                    round(rng.uniform(-2, 2), 4), round(rng.uniform(-1, 1), 4), round(rng.uniform(-4, 0), 4),
+                    round(rng.uniform(50, 100), 3), round(rng.uniform(30, 70), 3), round(rng.uniform(0, 40), 3),
+                    round(rng.uniform(0.3, 0.9), 4), round(rng.uniform(0.5, 1.0), 4),
+                    round(rng.uniform(50, 300), 2), rng.randint(50, 2000),
+                    created_at, created_at,
+                ))
+            yield from self._batched("iz_rankings_xcri_scs_components", iter(rows))
+
+    def metadata_rows(self) -> Iterator[Tuple[str, List[Tuple]]]:
+        """One calculation metadata row per context"""
+        rows = []
+        for pop in self.populations:
+            for checkpoint in CHECKPOINTS:
+                rows.append((
+                    SEASON_YEAR, pop.division, pop.gender, checkpoint, "light", "division",
+                    self._calculated_at(checkpoint), "2.1.0",
+                    len(pop.athletes) * 6, len(pop.athletes), len(pop.teams), len(pop.teams) // 3,
+                    round(self.rng.uniform(30, 120), 2), 1, round(self.rng.uniform(0.6, 0.99), 4),
+                    int(len(pop.athletes) * 0.9), int(len(pop.athletes) * 0.1), self.rng.randint(0, 50),
+                    "completed", None,
+                ))
+        yield from self._batched("iz_rankings_xcri_calculation_metadata", iter(rows))
+
+    def knockout_rows(self) -> Iterator[Tuple[str, List[Tuple]]]:
+        """Knockout rankings for every checkpoint and the dense LIVE matchup graph"""
+        race_hnd = 5000000
+        meet_id = 700000
+        for pop in self.populations:
+            rng = random.Random(f"ko:{self.config.seed}:{pop.division}:{pop.gender}")
+            teams = pop.teams
+            strength = {t.hnd: t.strength for t in teams}
+
+            # LIVE matchups: each meet contributes every pair of attending teams
+            n_meets = max(1, math.ceil(len(teams) * self.config.meets_per_team / self.config.meet_size))
+            meet_size = min(self.config.meet_size, len(teams))
+            ordered = sorted(teams, key=lambda t: -t.strength)
+            for rank, team in enumerate(ordered, start=1):
+                pop.ko_rank[team.hnd] = rank
+
+            record: Dict[int, List[int]] = {t.hnd: [0, 0] for t in teams}
+            matchups = []
+            for m in range(n_meets):
+                race_hnd += 1
+                meet_id += 1
+                race_date = date(2025, 9, 1) + timedelta(days=(m * 7) % 70)
+                attending = rng.sample(teams, meet_size)
+                scores = {t.hnd: max(15, int(150 - 40 * (strength[t.hnd] + rng.gauss(0, 0.7)))) for t in attending}
+                meet_name = f"{rng.choice(SCHOOL_WORDS)} Invitational {meet_id}"
+                attending.sort(key=lambda t: scores[t.hnd])
+                for i in range(len(attending)):
+                    for j in range(i + 1, len(attending)):
+                        a, b = attending[i], attending[j]
+                        record[a.hnd][0] += 1
+                        record[b.hnd][1] += 1
+                        matchups.append((
+                            race_hnd, meet_id, race_date, meet_name,
+                            a.hnd, i + 1, scores[a.hnd], pop.ko_rank[a.hnd],
+                            b.hnd, j + 1, scores[b.hnd], pop.ko_rank[b.hnd],
+                            a.hnd, SEASON_YEAR, "D", pop.division, pop.gender,
+                            None, LIVE_CALCULATED_AT,
+                        ))
+
+            knockout = []
+            for checkpoint in CHECKPOINTS:
+                calculated_at = self._calculated_at(checkpoint)
+                week = CHECKPOINTS.index(checkpoint)
+                drift = random.Random(f"kod:{self.config.seed}:{pop.division}:{pop.gender}:{week}")
+                by_rank = sorted(teams, key=lambda t: -(t.strength + drift.gauss(0, 0.1)))
+                for rank, team in enumerate(by_rank, start=1):
+                    wins, losses = record[team.hnd]
+                    total = wins + losses
+                    knockout.append((
+                        team.hnd, team.name, f"T{team.hnd}", "D", pop.division, pop.gender,
+                        team.region_fk, team.conference_fk, team.region, team.conference,
+                        1 + rank % 12, 1 + rank % 8, rank, rank,
+                        "h2h" if rank % 3 else "xcri", 7 + rank % 6, 5 + rank % 3,
+                        round(600 - rank * 1.5, 2),
+                        (checkpoint or LIVE_CALCULATED_AT.date()) - timedelta(days=2),
+                        wins, losses, round(wins * 100.0 / total, 1) if total else None,
+                        checkpoint, SEASON_YEAR, calculated_at,
+                    ))
+
+            yield from self._batched("iz_rankings_xcri_team_knockout", iter(knockout))
+            yield from self._batched("iz_rankings_xcri_team_knockout_matchups", iter(matchups))
+
+    def resume_rows(self) -> Iterator[Tuple[str, List[Tuple]]]:
+        """School mapping and season resume HTML per school and gender"""
+        teams = []
+        resumes = []
+        for pop in self.populations:
+            for team in pop.teams:
+                teams.append((team.hnd, team.school_id, team.name))
+
+        for school_id, name in self.schools.items():
+            for gender_fk in (1, 2):
+                resumes.append((
+                    SEASON_YEAR, school_id, gender_fk, 3,
+                    self._resume_html(name, school_id, gender_fk),
+                    LIVE_CALCULATED_AT, LIVE_CALCULATED_AT,
+                ))
+
+        yield from self._batched("iz_athnet_teams", iter(teams))
+        yield from self._batched("iz_groups_season_resumes", iter(resumes))
+
+    def _resume_html(self, name: str, school_id: int, gender_fk: int) -> str:
+        rng = random.Random(f"resume:{self.config.seed}:{school_id}:{gender_fk}")
+        rows = []
+        size = 0
+        while size < self.config.resume_bytes:
+            row = (
+                f"<tr><td>{rng.choice(SCHOOL_WORDS)} Invitational</td>"
+                f"<td>2025-{rng.randint(9, 11):02d}-{rng.randint(1, 28):02d}</td>"
+                f"<td>{rng.randint(1, 40)}</td><td>{rng.randint(30, 900)}</td></tr>"
+            )
+            rows.append(row)
+            size += len(row)
+        return f"<h3>{name}</h3><table class=\"resume\">{''.join(rows)}</table>"
+
+    # ---------------------------------------------------------------
+    # Entry point
+    # ---------------------------------------------------------------
+
+    def tables(self) -> Iterator[Tuple[str, List[Tuple]]]:
+        """Every table's rows as (table, batch) pairs"""
+        yield from self.athlete_and_team_rows()
+        yield from self.scs_rows()
+        yield from self.metadata_rows()
+        yield from self.knockout_rows()
+        yield from self.resume_rows()
+
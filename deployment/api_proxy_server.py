@@ -0,0 +1,211 @@
+"""
+XCRI API - Persistent Forwarding Proxy
+
+Long-lived replacement for api-proxy.cgi. The CGI script forks a Python
+interpreter and opens a fresh TCP connection to uvicorn for every request,
+then buffers the whole response before writing it out. This proxy runs as a
+single ASGI process and:
+
+- keeps a pool of keep-alive connections to the API (TCP or Unix socket)
+- streams request and response bodies through without buffering
+- passes Content-Encoding through untouched (gzip from the API is not
+  decoded and re-encoded)
+- forwards conditional requests and relays 304/204/HEAD responses without
+  a body
+- passes the visitor address to the API in X-Real-IP (the entry Apache
+  appended to X-Forwarded-For), for the API's per-client rate limits
+
+Run with (from the deployment/ directory):
+    uvicorn api_proxy_server:app --host 127.0.0.1 --port 8002
+
+Apache then forwards /iz/xcri/api/* here instead of to the CGI script
+(see the commented mod_proxy rule in .htaccess).
+
+Environment variables:
+    XCRI_PROXY_UPSTREAM       Upstream base URL (default: http://127.0.0.1:8001)
+    XCRI_PROXY_UPSTREAM_UDS   Unix socket path for the upstream (optional)
+    XCRI_PROXY_STRIP_PREFIX   Path prefix to strip before forwarding (optional)
+    XCRI_PROXY_MAX_CONNECTIONS  Upstream connection pool size (default: 20)
+    XCRI_PROXY_TIMEOUT        Upstream timeout in seconds (default: 30)
+"""
+
+import logging
+import os
+from typing import List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger("xcri_api_proxy")
+
+UPSTREAM = os.environ.get("XCRI_PROXY_UPSTREAM", "http://127.0.0.1:8001").rstrip("/")
+UPSTREAM_UDS = os.environ.get("XCRI_PROXY_UPSTREAM_UDS") or None
+STRIP_PREFIX = os.environ.get("XCRI_PROXY_STRIP_PREFIX", "").rstrip("/")
+MAX_CONNECTIONS = int(os.environ.get("XCRI_PROXY_MAX_CONNECTIONS", "20"))
+TIMEOUT = float(os.environ.get("XCRI_PROXY_TIMEOUT", "30"))
+
+# Hop-by-hop headers (RFC 7230 section 6.1) are never forwarded
+HOP_BY_HOP = {
+    b"connection",
+    b"keep-alive",
+    b"proxy-authenticate",
+    b"proxy-authorization",
+    b"te",
+    b"trailer",
+    b"transfer-encoding",
+    b"upgrade",
+    b"host",
+}
+
+# Peers whose X-Forwarded-For is trusted (Apache mod_proxy on this host)
+LOCAL_PEERS = {"127.0.0.1", "::1"}
+
+# Responses that never carry a body
+NO_BODY_STATUSES = {204, 304}
+
+client: Optional[httpx.AsyncClient] = None
+
+
+def _create_client() -> httpx.AsyncClient:
+    """Create the shared upstream client with a keep-alive connection pool"""
+    transport = httpx.AsyncHTTPTransport(
+        uds=UPSTREAM_UDS,
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_CONNECTIONS,
+            keepalive_expiry=60.0,
+        ),
+        retries=1,  # Retry once if a pooled keep-alive connection was closed
+    )
+    return httpx.AsyncClient(
+        transport=transport,
+        base_url=UPSTREAM,
+        timeout=httpx.Timeout(TIMEOUT, connect=5.0),
+        # Never decode: bodies are streamed as-is with their Content-Encoding
+        headers={"Accept-Encoding": "identity"},
+    )
+
+
+def _visitor_addr(raw_headers: List[Tuple[bytes, bytes]], client_addr: Optional[str]) -> Optional[str]:
+    """Visitor address: the entry Apache appended to X-Forwarded-For when Apache is the peer"""
+    if client_addr in LOCAL_PEERS:
+        forwarded = [v for k, v in raw_headers if k.lower() == b"x-forwarded-for"]
+        if forwarded:
+            return forwarded[-1].decode("latin-1").split(",")[-1].strip() or client_addr
+    return client_addr
+
+
+def _forward_headers(raw_headers: List[Tuple[bytes, bytes]], client_addr: Optional[str]) -> List[Tuple[bytes, bytes]]:
+    """Copy end-to-end request headers, add X-Forwarded-For and X-Real-IP"""
+    headers = [(k, v) for k, v in raw_headers if k.lower() not in HOP_BY_HOP and k.lower() != b"x-real-ip"]
+    visitor = _visitor_addr(raw_headers, client_addr)
+    if visitor:
+        headers.append((b"x-real-ip", visitor.encode()))
+    if client_addr:
+        existing = [v for k, v in headers if k.lower() == b"x-forwarded-for"]
+        forwarded = (existing[0] + b", " if existing else b"") + client_addr.encode()
+        headers = [(k, v) for k, v in headers if k.lower() != b"x-forwarded-for"]
+        headers.append((b"x-forwarded-for", forwarded))
+    return headers
+
+
+async def _request_body(receive):
+    """Stream the incoming request body chunk by chunk"""
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
+        body = message.get("body", b"")
+        if body:
+            yield body
+        if not message.get("more_body", False):
+            return
+
+
+async def _send_error(send, status: int, message: str) -> None:
+    body = ('{"error": "Proxy error: %s"}' % message.replace('"', "'")).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _lifespan(receive, send) -> None:
+    global client
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            client = _create_client()
+            logger.info(f"Proxy forwarding to {UPSTREAM} (uds={UPSTREAM_UDS}, pool={MAX_CONNECTIONS})")
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            if client is not None:
+                await client.aclose()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    """ASGI entry point"""
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    global client
+    if client is None:
+        # Lifespan disabled (--lifespan off): create lazily
+        client = _create_client()
+
+    path = scope.get("raw_path") or scope["path"].encode()
+    path = path.decode("latin-1")
+    if STRIP_PREFIX and path.startswith(STRIP_PREFIX):
+        path = path[len(STRIP_PREFIX):] or "/"
+    query = scope.get("query_string", b"").decode("latin-1")
+    url = f"{path}?{query}" if query else path
+
+    method = scope["method"]
+    client_addr = scope["client"][0] if scope.get("client") else None
+    headers = _forward_headers(scope["headers"], client_addr)
+    has_body = any(k.lower() in (b"content-length", b"transfer-encoding") for k, _ in scope["headers"])
+
+    request = client.build_request(
+        method,
+        url,
+        headers=headers,
+        content=_request_body(receive) if has_body else None,
+    )
+
+    try:
+        response = await client.send(request, stream=True)
+    except httpx.TimeoutException:
+        await _send_error(send, 504, "upstream timeout")
+        return
+    except httpx.TransportError as e:
+        logger.error(f"Upstream connection failed: {e}")
+        await _send_error(send, 502, "upstream unavailable")
+        return
+
+    try:
+        response_headers = [
+            (k, v) for k, v in response.headers.raw
+            if k.lower() not in HOP_BY_HOP and k.lower() not in (b"server", b"date")
+        ]
+        await send({
+            "type": "http.response.start",
+            "status": response.status_code,
+            "headers": response_headers,
+        })
+
+        if method == "HEAD" or response.status_code in NO_BODY_STATUSES:
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        # aiter_raw yields bytes exactly as sent by the API (still compressed)
+        async for chunk in response.aiter_raw():
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+    finally:
+        await response.aclose()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+XCRI API - Proxy Benchmark
+
+Compares the per-request cost of the three ways to reach the API:
+
+    direct   httpx keep-alive client straight to uvicorn (lower bound)
+    proxy    httpx keep-alive client to api_proxy_server.py
+    cgi      api-proxy.cgi executed as a fresh process per request, with the
+             CGI environment Apache would set (fork + interpreter start +
+             new upstream connection, as in production today)
+
+Usage (API and proxy already running):
+    python3 deployment/benchmark_proxy.py \\
+        --api http://127.0.0.1:8001 --proxy http://127.0.0.1:8002 \\
+        --path "/athletes/?division=2030&gender=M&limit=25" -n 200
+
+Reports mean, p50, p95 and p99 latency plus requests/second for each mode.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+from urllib.parse import urlsplit
+
+import httpx
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CGI_SCRIPT = os.path.join(REPO_ROOT, "api-proxy.cgi")
+
+
+def percentile(samples: List[float], p: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(name: str, samples: List[float], wall: float) -> Dict[str, float]:
+    return {
+        "mode": name,
+        "requests": len(samples),
+        "mean_ms": statistics.mean(samples) * 1000,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "rps": len(samples) / wall if wall else 0.0,
+    }
+
+
+async def bench_http(base_url: str, path: str, n: int, concurrency: int, gzip: bool) -> List[float]:
+    """Time n GET requests over a shared keep-alive client"""
+    headers = {"Accept-Encoding": "gzip" if gzip else "identity"}
+    semaphore = asyncio.Semaphore(concurrency)
+    samples: List[float] = []
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, timeout=60.0) as client:
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(path)
+                await response.aread()
+                samples.append(time.perf_counter() - start)
+                response.raise_for_status()
+
+        await client.get(path)  # warm up the connection
+        await asyncio.gather(*(one() for _ in range(n)))
+
+    return samples
+
+
+def bench_cgi(path: str, n: int, gzip: bool) -> List[float]:
+    """Time n sequential executions of the CGI script as Apache would run it"""
+    parts = urlsplit(path)
+    env = dict(os.environ)
+    env.update({
+        "GATEWAY_INTERFACE": "CGI/1.1",
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": parts.path,
+        "QUERY_STRING": parts.query,
+        "HTTP_ACCEPT_ENCODING": "gzip" if gzip else "identity",
+    })
+
+    samples: List[float] = []
+    for _ in range(n):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, CGI_SCRIPT],
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+        samples.append(time.perf_counter() - start)
+        if not result.stdout.startswith(b"Status: 2"):
+            raise RuntimeError(f"CGI request failed: {result.stdout[:200]!r}")
+    return samples
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare CGI proxy vs persistent proxy latency")
+    parser.add_argument("--api", default="http://127.0.0.1:8001", help="Direct API base URL")
+    parser.add_argument("--proxy", default="http://127.0.0.1:8002", help="Persistent proxy base URL")
+    parser.add_argument("--path", default="/metadata/latest/date", help="Path (and query) to request")
+    parser.add_argument("-n", "--requests", type=int, default=100, help="Requests per mode")
+    parser.add_argument("-c", "--concurrency", type=int, default=1, help="Concurrency for HTTP modes")
+    parser.add_argument("--gzip", action="store_true", help="Send Accept-Encoding: gzip")
+    parser.add_argument("--modes", default="direct,proxy,cgi", help="Comma-separated modes to run")
+    args = parser.parse_args()
+
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    results = []
+
+    for mode in modes:
+        start = time.perf_counter()
+        if mode == "direct":
+            samples = asyncio.run(bench_http(args.api, args.path, args.requests, args.concurrency, args.gzip))
+        elif mode == "proxy":
+            samples = asyncio.run(bench_http(args.proxy, args.path, args.requests, args.concurrency, args.gzip))
+        elif mode == "cgi":
+            samples = bench_cgi(args.path, args.requests, args.gzip)
+        else:
+            parser.error(f"Unknown mode: {mode}")
+        results.append(summarize(mode, samples, time.perf_counter() - start))
+
+    print(f"\nPath: {args.path}  (n={args.requests}, concurrency={args.concurrency}, gzip={args.gzip})")
+    print(f"{'mode':<8} {'mean':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'req/s':>9}")
+    for r in results:
+        print(
+            f"{r['mode']:<8} {r['mean_ms']:>7.1f}ms {r['p50_ms']:>7.1f}ms "
+            f"{r['p95_ms']:>7.1f}ms {r['p99_ms']:>7.1f}ms {r['rps']:>9.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -43,6 +43,14 @@ export const athletesAPI = {
    * @returns {Promise} API response with roster list
    */
   roster: (teamId, params) => api.get(`/athletes/team/${teamId}/roster`, { params }),
+
+  /**
+   * Get athlete rank timeline across all checkpoints of a season
+   * @param {number} athleteId - AthleticNet athlete handle
+   * @param {Object} params - Query parameters (season_year, division, gender)
+   * @returns {Promise} API response with {total, points}
+   */
+  timeline: (athleteId, params) => api.get(`/athletes/${athleteId}/timeline`, { params }),
 };
 
 // Team API endpoints
@@ -75,6 +83,14 @@ export const teamsAPI = {
    * @returns {Promise} API response with resume HTML
    */
   resume: (teamId, params) => api.get(`/teams/${teamId}/resume`, { params }),
+
+  /**
+   * Get team rank timeline across all checkpoints of a season
+   * @param {number} teamId - AthleticNet team handle
+   * @param {Object} params - Query parameters (season_year, division, gender)
+   * @returns {Promise} API response with {total, points}
+   */
+  timeline: (teamId, params) => api.get(`/teams/${teamId}/timeline`, { params }),
 };
 
 // Team Knockout API endpoints (Session 015)
@@ -218,6 +234,16 @@ export const snapshotAPI = {
   getMetadata: (date, params) => api.get(`/snapshots/${date}/metadata`, { params }),
 };
 
+// Batch API endpoint (several GET queries in one round trip)
+export const batchAPI = {
+  /**
+   * Execute several GET requests in one call
+   * @param {Array<Object>} requests - [{id, path, params}] sub-requests
+   * @returns {Promise} API response with {total, succeeded, failed, results}
+   */
+  run: (requests) => api.post('/batch/', { requests }),
+};
+
 // Division codes reference
 export const DIVISIONS = [
   { code: 2030, name: 'NCAA Division I', short: 'D1' },
@@ -244,6 +270,7 @@ export default {
   metadataAPI,
   healthAPI,
   snapshotAPI,
+  batchAPI,
   DIVISIONS,
   GENDERS,
 };